@@ -6,14 +6,43 @@ High-level exports:
 - Societal signals collector: :func:`collect_societal_signals`
 - Anchored similarity metric: :func:`anchored_ratio`
 - Data models: conflict case dataclasses & pydantic schemas
+
+Exports are resolved lazily on first attribute access, so ``import
+conflict_collection`` does not pull in GitPython, pydantic or the metric's
+dependencies until they are actually used.
 """
 
-from .collectors.conflict_type.collector import collect as collect_conflict_types
-from .collectors.societal.collector import collect as collect_societal_signals
-from .metrics.anchored_ratio.anchored_ratio import anchored_ratio
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .collectors.conflict_type.collector import collect as collect_conflict_types
+    from .collectors.societal.collector import collect as collect_societal_signals
+    from .metrics.anchored_ratio.anchored_ratio import anchored_ratio
+
+_LAZY_EXPORTS = {
+    "collect_conflict_types": (".collectors.conflict_type.collector", "collect"),
+    "collect_societal_signals": (".collectors.societal.collector", "collect"),
+    "anchored_ratio": (".metrics.anchored_ratio.anchored_ratio", "anchored_ratio"),
+}
+"""Public name -> (relative module, attribute)."""
 
 __all__ = [
     "collect_conflict_types",
     "collect_societal_signals",
     "anchored_ratio",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), attr)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
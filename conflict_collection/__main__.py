@@ -0,0 +1,3 @@
+from conflict_collection.cli import main
+
+raise SystemExit(main())
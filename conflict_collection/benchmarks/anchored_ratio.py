@@ -0,0 +1,138 @@
+"""Scaling benchmark for :func:`anchored_ratio`.
+
+Runs every (edit pattern, size, ``use_line_levenshtein``) scenario from
+:mod:`conflict_collection.benchmarks.synthetic_text` and reports wall time and
+peak traced memory as JSON, one object per scenario::
+
+    python -m conflict_collection.benchmarks.anchored_ratio \\
+        --sizes 1000 10000 200000 --output anchored_ratio.json
+
+Timing and memory are measured in separate runs because ``tracemalloc``
+inflates wall time.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional, Sequence
+
+from conflict_collection.benchmarks.synthetic_text import PATTERNS, make_triple
+from conflict_collection.metrics.anchored_ratio import anchored_ratio
+
+DEFAULT_SIZES = (1_000, 10_000)
+"""Base file sizes (lines) run when none are given; pass 50k-200k explicitly."""
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioResult:
+    """Measurements for one benchmark scenario."""
+
+    pattern: str
+    lines: int
+    use_line_levenshtein: bool
+    seconds: float
+    """Best wall time over the repeats."""
+    peak_bytes: int
+    """Peak memory traced by ``tracemalloc`` during one call."""
+    score: float
+    """The metric's value, to spot behavioural drift alongside timing."""
+
+
+def run_scenario(
+    pattern: str,
+    lines: int,
+    *,
+    use_line_levenshtein: bool,
+    repeat: int = 3,
+    seed: int = 0,
+) -> ScenarioResult:
+    """Time and memory-profile ``anchored_ratio`` on one synthetic triple."""
+    O, R, R_hat = make_triple(pattern, lines, seed)
+
+    best = float("inf")
+    score = 0.0
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        score = anchored_ratio(O, R, R_hat, use_line_levenshtein=use_line_levenshtein)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        anchored_ratio(O, R, R_hat, use_line_levenshtein=use_line_levenshtein)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return ScenarioResult(
+        pattern=pattern,
+        lines=lines,
+        use_line_levenshtein=use_line_levenshtein,
+        seconds=best,
+        peak_bytes=peak,
+        score=score,
+    )
+
+
+def run_suite(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    patterns: Optional[Iterable[str]] = None,
+    *,
+    repeat: int = 3,
+    seed: int = 0,
+) -> list[ScenarioResult]:
+    """Run the cross product of patterns, sizes and both Levenshtein settings."""
+    results: list[ScenarioResult] = []
+    for pattern in patterns or PATTERNS:
+        if pattern not in PATTERNS:
+            raise ValueError(
+                f"Unknown pattern {pattern!r}; choose from {sorted(PATTERNS)}"
+            )
+        for lines in sizes:
+            for use_line_levenshtein in (False, True):
+                results.append(
+                    run_scenario(
+                        pattern,
+                        lines,
+                        use_line_levenshtein=use_line_levenshtein,
+                        repeat=repeat,
+                        seed=seed,
+                    )
+                )
+    return results
+
+
+def report(results: Sequence[ScenarioResult]) -> dict:
+    """JSON-serialisable report with environment metadata."""
+    return {
+        "benchmark": "anchored_ratio",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": [asdict(result) for result in results],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--patterns", nargs="+", choices=sorted(PATTERNS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.patterns, repeat=args.repeat, seed=args.seed)
+    text = json.dumps(report(results), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""End-to-end benchmark of both collectors on synthetic repositories.
+
+Generates one repository per history depth with
+:mod:`conflict_collection.benchmarks.synthetic_repo` and reports, for the
+conflict type and the societal collector, wall time, the number of git
+subprocesses and peak traced memory as JSON::
+
+    python -m conflict_collection.benchmarks.collectors \\
+        --depths 100 1000 5000 --files 200 --conflicts modify_modify=20 \\
+        --output collectors.json
+
+Git call counts are exact and machine independent, which makes them the
+field to gate regressions on; wall time and memory need a quiet machine.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+from conflict_collection.benchmarks.git_calls import record_git_calls
+from conflict_collection.benchmarks.synthetic_repo import (
+    CONFLICT_KINDS,
+    RepoSpec,
+    SyntheticRepo,
+    generate_repo,
+)
+
+DEFAULT_DEPTHS = (100, 1_000)
+"""History depths run when none are given."""
+
+
+@dataclass(frozen=True, slots=True)
+class CollectorResult:
+    """Measurements for one collector on one synthetic repository."""
+
+    collector: str
+    """``"conflict_type"`` or ``"societal"``."""
+    history_depth: int
+    files: int
+    conflicted_paths: int
+    records: int
+    """Cases / records the collector returned."""
+    seconds: float
+    """Best wall time over the repeats."""
+    git_calls: int
+    git_calls_by_subcommand: dict[str, int]
+    peak_bytes: int
+    """Peak memory traced by ``tracemalloc`` during one run."""
+
+
+def _collectors(repo: SyntheticRepo) -> dict[str, Callable[[], object]]:
+    from conflict_collection.collectors.conflict_type import collect as conflict_types
+    from conflict_collection.collectors.societal import collect as societal
+
+    return {
+        "conflict_type": lambda: conflict_types(str(repo.path), repo.resolution_sha),
+        "societal": lambda: societal(str(repo.path)),
+    }
+
+
+def measure(
+    run: Callable[[], object], *, repeat: int = 3
+) -> tuple[int, float, dict[str, int], int, int]:
+    """``(records, best seconds, calls by subcommand, calls, peak bytes)``."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+
+    with record_git_calls() as calls:
+        records = len(run())  # type: ignore[arg-type]
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return records, best, dict(calls.by_subcommand()), len(calls), peak
+
+
+def run_scenario(
+    spec: RepoSpec,
+    *,
+    repeat: int = 3,
+    seed: int = 0,
+    directory: Optional[Path] = None,
+) -> list[CollectorResult]:
+    """Generate one repository and measure both collectors on it."""
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        repo = generate_repo(Path(tmp) / "repo", spec, seed)
+        results = []
+        for name, run in _collectors(repo).items():
+            records, seconds, by_subcommand, calls, peak = measure(run, repeat=repeat)
+            results.append(
+                CollectorResult(
+                    collector=name,
+                    history_depth=spec.history_depth,
+                    files=spec.files,
+                    conflicted_paths=len(repo.conflicted_paths),
+                    records=records,
+                    seconds=seconds,
+                    git_calls=calls,
+                    git_calls_by_subcommand=by_subcommand,
+                    peak_bytes=peak,
+                )
+            )
+        return results
+
+
+def run_suite(
+    depths: Iterable[int] = DEFAULT_DEPTHS,
+    spec: RepoSpec = RepoSpec(),
+    *,
+    repeat: int = 3,
+    seed: int = 0,
+) -> list[CollectorResult]:
+    """Run both collectors on ``spec`` at every history depth."""
+    results: list[CollectorResult] = []
+    for depth in depths:
+        results.extend(
+            run_scenario(replace(spec, history_depth=depth), repeat=repeat, seed=seed)
+        )
+    return results
+
+
+def report(results: Sequence[CollectorResult], spec: RepoSpec) -> dict:
+    """JSON-serialisable report with environment metadata."""
+    return {
+        "benchmark": "collectors",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": {**asdict(spec), "conflicts": dict(spec.conflicts)},
+        "scenarios": [asdict(result) for result in results],
+    }
+
+
+def _conflict_count(text: str) -> tuple[str, int]:
+    kind, _, count = text.partition("=")
+    if kind not in CONFLICT_KINDS or not count.isdigit():
+        raise argparse.ArgumentTypeError(
+            f"expected KIND=N with KIND in {list(CONFLICT_KINDS)}, got {text!r}"
+        )
+    return kind, int(count)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    defaults = RepoSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=list(DEFAULT_DEPTHS))
+    parser.add_argument("--authors", type=int, default=defaults.authors)
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--file-lines", type=int, default=defaults.file_lines)
+    parser.add_argument(
+        "--conflicts",
+        type=_conflict_count,
+        nargs="+",
+        metavar="KIND=N",
+        help="Conflicts per shape (default: one of each).",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    spec = RepoSpec(
+        authors=args.authors,
+        files=args.files,
+        file_lines=args.file_lines,
+        **({"conflicts": dict(args.conflicts)} if args.conflicts else {}),
+    )
+    results = run_suite(args.depths, spec, repeat=args.repeat, seed=args.seed)
+    text = json.dumps(report(results, spec), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""Record every git subprocess GitPython starts.
+
+Collector cost is dominated by process spawns, and that count is exact and
+machine independent, unlike wall time::
+
+    with record_git_calls() as calls:
+        collect_societal_signals(repo_path)
+    print(len(calls), calls.by_subcommand())
+
+All GitPython commands (``repo.git.<cmd>``, ``iter_commits``, blame, the
+persistent ``cat-file`` helpers) go through ``git.cmd.Git.execute``, which is
+patched for the duration of the ``with`` block in every thread.
+
+:class:`GitBudget` turns those counts into a test assertion of the form
+"at most ``fixed + per_file * N`` calls for N files", with a readable diff of
+the call log when it fails::
+
+    budget = GitBudget(fixed=8, per_file=6)
+    budget.check(large_calls, files=8, baseline=(small_calls, 2))
+"""
+
+import bisect
+import contextlib
+import difflib
+import itertools
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from git.cmd import Git
+
+_SHA = re.compile(r"\b[0-9a-f]{40}\b")
+
+
+@dataclass(frozen=True, slots=True)
+class GitCall:
+    """One git process started through GitPython."""
+
+    argv: tuple[str, ...]
+    seconds: float
+    """Until ``execute`` returned (process start only for streamed output)."""
+
+    @property
+    def subcommand(self) -> str:
+        """``log`` for ``git -c k=v log ...``."""
+        args = iter(self.argv[1:])
+        for arg in args:
+            if arg == "-c":
+                next(args, None)
+            elif not arg.startswith("-"):
+                return arg
+        return ""
+
+
+class GitCallLog(list[GitCall]):
+    """The calls recorded by :func:`record_git_calls`, in start order.
+
+    A call is added once ``execute`` returns, at the position its start
+    gives it, so calls still running in other threads are not listed yet.
+    """
+
+    def by_subcommand(self) -> Counter[str]:
+        return Counter(call.subcommand for call in self)
+
+    def format(self) -> str:
+        """One ``git ...`` command line per call."""
+        return "\n".join(" ".join(call.argv) for call in self)
+
+    def normalized(self) -> list[str]:
+        """Command lines with object ids replaced by ``<sha>``, for diffing."""
+        return [_SHA.sub("<sha>", " ".join(call.argv[1:])) for call in self]
+
+
+class GitBudgetExceeded(AssertionError):
+    """A code path started more git processes than its :class:`GitBudget`."""
+
+
+@dataclass(frozen=True, slots=True)
+class GitBudget:
+    """Allowed git calls for work over N files: ``fixed + per_file * N``."""
+
+    fixed: int
+    per_file: int
+
+    def limit(self, files: int) -> int:
+        return self.fixed + self.per_file * files
+
+    def check(
+        self,
+        calls: GitCallLog,
+        files: int,
+        *,
+        baseline: Optional[tuple[GitCallLog, int]] = None,
+    ) -> None:
+        """Assert ``calls`` (for ``files`` files) fit the budget.
+
+        Args:
+            calls: Calls recorded for the run under test.
+            files: Number of files that run processed.
+            baseline: ``(calls, files)`` of the same code path on fewer
+                files. The growth from it must also stay within
+                ``per_file`` per extra file, which catches a new per-file
+                call even when the fixed allowance would absorb it.
+
+        Raises:
+            GitBudgetExceeded: With per-subcommand counts and a diff of the
+                (normalised) call logs, or the full log without a baseline.
+        """
+        problems = []
+        if len(calls) > self.limit(files):
+            problems.append(
+                f"{len(calls)} git calls for {files} files exceed "
+                f"{self.fixed} + {self.per_file} x {files} = {self.limit(files)}"
+            )
+        if baseline is not None:
+            base_calls, base_files = baseline
+            extra_files = files - base_files
+            growth = len(calls) - len(base_calls)
+            if extra_files > 0 and growth > self.per_file * extra_files:
+                problems.append(
+                    f"{growth} more git calls for {extra_files} more files exceed "
+                    f"{self.per_file} per file ({growth / extra_files:.2f} per file)"
+                )
+        if not problems:
+            return
+
+        lines = problems + ["", "calls by subcommand:"]
+        before = baseline[0].by_subcommand() if baseline else Counter()
+        after = calls.by_subcommand()
+        for name in sorted(set(before) | set(after)):
+            counts = f"{before[name]} -> {after[name]}" if baseline else after[name]
+            lines.append(f"  {name}: {counts}")
+        if baseline is not None:
+            lines += ["", "call log diff (baseline -> this run):"]
+            lines += difflib.unified_diff(
+                baseline[0].normalized(), calls.normalized(), lineterm="", n=1
+            )
+        else:
+            lines += ["", "call log:", calls.format()]
+        raise GitBudgetExceeded("\n".join(lines))
+
+
+@contextlib.contextmanager
+def record_git_calls() -> Iterator[GitCallLog]:
+    """Patch ``Git.execute`` and collect a :class:`GitCall` per invocation."""
+    log = GitCallLog()
+    starts: list[int] = []  # start sequence number of each entry of ``log``
+    counter = itertools.count()
+    lock = threading.Lock()
+    original = Git.execute
+
+    def execute(self, command, *args, **kwargs):
+        argv = (command,) if isinstance(command, str) else tuple(map(str, command))
+        with lock:
+            sequence = next(counter)
+        started = time.perf_counter()
+        try:
+            return original(self, command, *args, **kwargs)
+        finally:
+            call = GitCall(argv, time.perf_counter() - started)
+            with lock:
+                index = bisect.bisect(starts, sequence)
+                starts.insert(index, sequence)
+                log.insert(index, call)
+
+    Git.execute = execute  # type: ignore[method-assign]
+    try:
+        yield log
+    finally:
+        Git.execute = original  # type: ignore[method-assign]
+
+
+__all__ = [
+    "GitBudget",
+    "GitBudgetExceeded",
+    "GitCall",
+    "GitCallLog",
+    "record_git_calls",
+]
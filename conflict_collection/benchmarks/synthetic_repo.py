@@ -0,0 +1,269 @@
+"""Seeded generator of local Git repositories stopped in a conflicted merge.
+
+:func:`generate_repo` writes a whole history with one ``git fast-import``
+process, so even deep histories take seconds, then starts ``git merge
+theirs`` on ``main`` and leaves it conflicted, which is the state both
+collectors read. The resolved merge is stored on ``refs/heads/resolution``::
+
+    spec = RepoSpec(history_depth=500, authors=8, files=200,
+                    conflicts={"modify_modify": 20, "add_add": 5})
+    repo = generate_repo(tmp_path / "repo", spec, seed=0)
+    collect_conflict_types(repo.path, repo.resolution_sha)
+
+History commits are made by random authors on ``main`` and touch a few
+random files each, including the files that will conflict, so ownership,
+recency and blame signals are not trivial.
+"""
+
+import random
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+from conflict_collection.benchmarks.synthetic_text import base_file, scattered_replaces
+
+CONFLICT_KINDS = (
+    "modify_modify",
+    "add_add",
+    "modify_delete",
+    "delete_modify",
+    "rename_rename",
+)
+"""Conflict shapes :class:`RepoSpec` can request.
+
+All but ``rename_rename`` produce one case of the same ``conflict_type``.
+``rename_rename`` (both sides rename one file to different names) produces
+a ``delete_delete`` case for the old name and an ``add_add`` case pairing the
+two new names, which Git stages with the same blob.
+"""
+
+_EPOCH = 1_600_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class RepoSpec:
+    """Shape of a synthetic repository."""
+
+    history_depth: int = 100
+    """Commits on ``main`` before the branches diverge."""
+    authors: int = 5
+    files: int = 50
+    """Files that never conflict (both sides still edit some of them)."""
+    file_lines: int = 200
+    conflicts: Mapping[str, int] = field(
+        default_factory=lambda: {kind: 1 for kind in CONFLICT_KINDS}
+    )
+    """:data:`CONFLICT_KINDS` entry -> how many of that shape."""
+    side_commits: int = 3
+    """Commits on each side after the branches diverge."""
+
+    def __post_init__(self) -> None:
+        unknown = set(self.conflicts) - set(CONFLICT_KINDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown conflict kinds {sorted(unknown)}; "
+                f"choose from {list(CONFLICT_KINDS)}"
+            )
+        if self.authors < 1 or self.file_lines < 1 or self.side_commits < 1:
+            raise ValueError("authors, file_lines and side_commits must be >= 1")
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticRepo:
+    """A generated repository, checked out on ``main`` mid-merge."""
+
+    path: Path
+    resolution_sha: str
+    """The committed resolution of the in-progress merge."""
+    conflicted_paths: tuple[str, ...]
+    """Paths Git reports as unmerged."""
+    integrator: str
+    """Configured ``user.name``; also one of the history's authors."""
+
+
+class _Stream:
+    """Builder of a ``git fast-import`` stream over in-memory trees."""
+
+    def __init__(self, rng: random.Random, authors: int) -> None:
+        self.rng = rng
+        self.authors = [f"author-{i}" for i in range(authors)]
+        self.chunks: list[bytes] = []
+        self.mark = 0
+        self.clock = _EPOCH
+
+    def _data(self, text: str) -> None:
+        raw = text.encode("utf-8")
+        self.chunks.append(b"data %d\n" % len(raw) + raw + b"\n")
+
+    def commit(
+        self,
+        branch: str,
+        message: str,
+        changes: Mapping[str, Optional[str]],
+        *,
+        parents: tuple[int, ...] = (),
+        author: Optional[str] = None,
+        deleteall: bool = False,
+    ) -> int:
+        """Append a commit; ``None`` contents delete. Returns its mark."""
+        self.mark += 1
+        self.clock += self.rng.randrange(3_600, 172_800)
+        name = author or self.rng.choice(self.authors)
+        ident = f"{name} <{name}@example.com> {self.clock} +0000"
+        self.chunks.append(
+            f"commit refs/heads/{branch}\nmark :{self.mark}\n"
+            f"author {ident}\ncommitter {ident}\n".encode()
+        )
+        self._data(message)
+        if parents:
+            self.chunks.append(f"from :{parents[0]}\n".encode())
+        for parent in parents[1:]:
+            self.chunks.append(f"merge :{parent}\n".encode())
+        if deleteall:
+            self.chunks.append(b"deleteall\n")
+        for path, content in sorted(changes.items()):
+            if content is None:
+                self.chunks.append(f"D {path}\n".encode())
+            else:
+                self.chunks.append(f"M 100644 inline {path}\n".encode())
+                self._data(content)
+        return self.mark
+
+
+def _text(lines: list[str]) -> str:
+    return "\n".join(lines) + "\n"
+
+
+def _edit(rng: random.Random, content: str) -> str:
+    return _text(scattered_replaces(rng, content.splitlines(), fraction=0.05))
+
+
+def _git(path: Path, *args: str, check: bool = True, **kwargs) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=path,
+        check=check,
+        capture_output=True,
+        text=True,
+        **kwargs,
+    )
+    return result.stdout
+
+
+def generate_repo(
+    path: Union[str, Path], spec: RepoSpec = RepoSpec(), seed: int = 0
+) -> SyntheticRepo:
+    """Create a repository at ``path`` (must not exist) for ``spec``.
+
+    Same spec and seed give the same commits, byte for byte.
+    """
+    path = Path(path)
+    rng = random.Random(f"{spec}:{seed}")
+    stream = _Stream(rng, spec.authors)
+
+    def new_file() -> str:
+        return _text(base_file(rng, spec.file_lines))
+
+    tree: dict[str, str] = {
+        f"src/file_{i:04d}.txt": new_file() for i in range(spec.files)
+    }
+    conflicting: dict[str, list[str]] = {}
+    for kind in CONFLICT_KINDS:
+        conflicting[kind] = [
+            f"conflicts/{kind}_{i:03d}.txt" for i in range(spec.conflicts.get(kind, 0))
+        ]
+        if kind != "add_add":
+            tree.update({p: new_file() for p in conflicting[kind]})
+
+    # 1. Shared history on main.
+    head = stream.commit("main", "initial import", tree)
+    editable = sorted(tree)
+    for depth in range(spec.history_depth):
+        touched = rng.sample(editable, k=min(len(editable), rng.randint(1, 3)))
+        changes = {p: _edit(rng, tree[p]) for p in touched}
+        tree.update(changes)
+        head = stream.commit("main", f"change {depth}", changes, parents=(head,))
+
+    # 2. Both sides: clean edits on disjoint plain files, then the conflicts.
+    normal = sorted(p for p in tree if p.startswith("src/"))
+    rng.shuffle(normal)
+    sides: dict[str, dict[str, Optional[str]]] = {}
+    tips: dict[str, int] = {}
+    for index, side in enumerate(("main", "theirs")):
+        own = normal[index::2]
+        side_tree: dict[str, Optional[str]] = dict(tree)
+        tip = head
+        for n in range(spec.side_commits - 1):
+            touched = rng.sample(own, k=min(len(own), rng.randint(1, 3)))
+            changes: dict[str, Optional[str]] = {}
+            for p in touched:
+                current = side_tree[p]
+                assert current is not None
+                changes[p] = _edit(rng, current)
+            side_tree.update(changes)
+            tip = stream.commit(side, f"{side} change {n}", changes, parents=(tip,))
+
+        changes = {}
+        for p in conflicting["modify_modify"]:
+            lines = (side_tree[p] or "").splitlines()
+            lines[len(lines) // 2] = f"{side} edit of line {len(lines) // 2}"
+            changes[p] = _text(lines)
+        for p in conflicting["add_add"]:
+            changes[p] = new_file()
+        deleted = "modify_delete" if side == "theirs" else "delete_modify"
+        modified = "delete_modify" if side == "theirs" else "modify_delete"
+        for p in conflicting[deleted]:
+            changes[p] = None
+        for p in conflicting[modified]:
+            changes[p] = _edit(rng, side_tree[p] or "")
+        for p in conflicting["rename_rename"]:
+            changes[p] = None
+            changes[p.replace(".txt", f".{side}.txt")] = side_tree[p]
+        side_tree.update(changes)
+        tips[side] = stream.commit(
+            side, f"{side}: conflicting edits", changes, parents=(tip,)
+        )
+        sides[side] = side_tree
+
+    # 3. The resolution: main's tree plus theirs' clean edits, conflicts settled.
+    ours, theirs = sides["main"], sides["theirs"]
+    resolved = {p: c for p, c in ours.items() if c is not None}
+    for p in normal[1::2]:
+        resolved[p] = theirs[p] or ""
+    for p in conflicting["modify_modify"] + conflicting["add_add"]:
+        resolved[p] = _text(
+            (ours[p] or "").splitlines()[:1] + (theirs[p] or "").splitlines()[1:]
+        )
+    for p in conflicting["delete_modify"]:
+        resolved[p] = theirs[p] or ""
+    integrator = stream.authors[0]
+    stream.commit(
+        "resolution",
+        "Merge branch 'theirs'",
+        resolved,
+        parents=(tips["main"], tips["theirs"]),
+        author=integrator,
+        deleteall=True,
+    )
+
+    path.mkdir(parents=True)
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.name", integrator)
+    _git(path, "config", "user.email", f"{integrator}@example.com")
+    _git(path, "config", "core.autocrlf", "false")
+    _git(path, "fast-import", "--quiet", input=b"".join(stream.chunks).decode())
+    _git(path, "reset", "-q", "--hard", "main")
+    _git(path, "merge", "-q", "--no-ff", "--no-commit", "theirs", check=False)
+
+    return SyntheticRepo(
+        path=path,
+        resolution_sha=_git(path, "rev-parse", "resolution").strip(),
+        conflicted_paths=tuple(
+            _git(path, "diff", "--name-only", "--diff-filter=U").split()
+        ),
+        integrator=integrator,
+    )
+
+
+__all__ = ["CONFLICT_KINDS", "RepoSpec", "SyntheticRepo", "generate_repo"]
@@ -0,0 +1,159 @@
+"""Seeded generators of base files and edit patterns for metric benchmarks.
+
+Every generator takes an explicit :class:`random.Random` so a scenario is
+fully determined by its seed. Texts are lists of lines; join with ``"\\n"``
+to feed the metric.
+"""
+
+import random
+import string
+from typing import Callable
+
+_IDENTIFIERS = [
+    "value",
+    "result",
+    "config",
+    "items",
+    "index",
+    "buffer",
+    "handler",
+    "request",
+    "response",
+    "state",
+]
+_BOILERPLATE = ["}", "{", "return result;", "break;", "else {", "/* ... */", "end"]
+
+
+def code_line(rng: random.Random, width: int = 40) -> str:
+    """One synthetic, mostly unique line of code-like text of about ``width`` chars."""
+    name = rng.choice(_IDENTIFIERS)
+    suffix = "".join(rng.choices(string.ascii_lowercase + string.digits, k=8))
+    body = f"{name}_{suffix} = compute({name}, {rng.randrange(10**6)})"
+    if len(body) < width:
+        body += " # " + "".join(
+            rng.choices(string.ascii_lowercase, k=width - len(body))
+        )
+    return body
+
+
+def base_file(rng: random.Random, n_lines: int, *, width: int = 40) -> list[str]:
+    """A base file of ``n_lines`` unique-ish lines."""
+    return [code_line(rng, width) for _ in range(n_lines)]
+
+
+def repetitive_base_file(
+    rng: random.Random, n_lines: int, *, repeat_fraction: float = 0.2
+) -> list[str]:
+    """A base file where ``repeat_fraction`` of lines come from a tiny boilerplate pool.
+
+    Repeated lines are the classic slow path for ``SequenceMatcher`` with
+    ``autojunk=False``.
+    """
+    return [
+        rng.choice(_BOILERPLATE) if rng.random() < repeat_fraction else code_line(rng)
+        for _ in range(n_lines)
+    ]
+
+
+def _sample_lines(rng: random.Random, n: int, fraction: float) -> list[int]:
+    """About ``fraction`` of ``range(n)``, at least one index if ``n > 0``."""
+    if not n:
+        return []
+    return rng.sample(range(n), k=min(n, max(1, int(n * fraction))))
+
+
+def scattered_replaces(
+    rng: random.Random, lines: list[str], *, fraction: float = 0.01
+) -> list[str]:
+    """Replace about ``fraction`` of lines at random positions."""
+    out = list(lines)
+    for i in _sample_lines(rng, len(out), fraction):
+        out[i] = code_line(rng)
+    return out
+
+
+def block_move(
+    rng: random.Random, lines: list[str], *, block_fraction: float = 0.1
+) -> list[str]:
+    """Cut one contiguous block (``block_fraction`` of the file) and paste it elsewhere."""
+    size = max(1, int(len(lines) * block_fraction))
+    start = rng.randrange(0, max(1, len(lines) - size))
+    block = lines[start : start + size]
+    rest = lines[:start] + lines[start + size :]
+    at = rng.randrange(0, len(rest) + 1)
+    return rest[:at] + block + rest[at:]
+
+
+def mass_insertions(
+    rng: random.Random, lines: list[str], *, fraction: float = 0.5, runs: int = 20
+) -> list[str]:
+    """Insert ``fraction * len(lines)`` new lines spread over ``runs`` slots."""
+    total = max(runs, int(len(lines) * fraction))
+    slots = sorted(rng.randrange(0, len(lines) + 1) for _ in range(runs))
+    out: list[str] = []
+    previous = 0
+    for slot in slots:
+        out.extend(lines[previous:slot])
+        out.extend(code_line(rng) for _ in range(total // runs))
+        previous = slot
+    out.extend(lines[previous:])
+    return out
+
+
+def long_line_edits(
+    rng: random.Random, lines: list[str], *, fraction: float = 0.01
+) -> list[str]:
+    """Mutate a few characters inside about ``fraction`` of the lines.
+
+    Paired with a long-line base file this stresses per-line Levenshtein.
+    """
+    out = list(lines)
+    for i in _sample_lines(rng, len(out), fraction):
+        chars = list(out[i])
+        if not chars:
+            continue
+        for _ in range(max(1, len(chars) // 50)):
+            chars[rng.randrange(len(chars))] = rng.choice(string.ascii_letters)
+        out[i] = "".join(chars)
+    return out
+
+
+EditPattern = Callable[[random.Random, list[str]], list[str]]
+
+PATTERNS: dict[str, tuple[Callable[[random.Random, int], list[str]], EditPattern]] = {
+    "scattered_replaces": (base_file, scattered_replaces),
+    "block_move": (base_file, block_move),
+    "mass_insertions": (base_file, mass_insertions),
+    "long_lines": (
+        lambda rng, n: base_file(rng, n, width=400),
+        long_line_edits,
+    ),
+    "repetitive_lines": (repetitive_base_file, scattered_replaces),
+}
+"""Scenario name -> (base generator, edit generator)."""
+
+
+def make_triple(pattern: str, n_lines: int, seed: int = 0) -> tuple[str, str, str]:
+    """Build ``(O, R, R_hat)`` for a named pattern.
+
+    ``R`` applies the edit pattern to ``O``; ``R_hat`` applies it once more on
+    top of ``R``, so the two share ``R``'s edits and disagree on the rest.
+    """
+    make_base, edit = PATTERNS[pattern]
+    base = make_base(random.Random(f"{pattern}:{n_lines}:{seed}"), n_lines)
+    R = edit(random.Random(f"{pattern}:{seed}:R"), base)
+    R_hat = edit(random.Random(f"{pattern}:{seed}:R_hat"), R)
+    return "\n".join(base), "\n".join(R), "\n".join(R_hat)
+
+
+__all__ = [
+    "PATTERNS",
+    "base_file",
+    "block_move",
+    "code_line",
+    "long_line_edits",
+    "make_triple",
+    "mass_insertions",
+    "repetitive_base_file",
+    "scattered_replaces",
+]
@@ -0,0 +1,238 @@
+"""Command-line entry point: ``python -m conflict_collection <command>``."""
+
+import argparse
+import json
+import sys
+from contextlib import nullcontext
+from dataclasses import asdict
+from typing import Optional, Sequence
+
+
+def _progress(args: argparse.Namespace):
+    """``on_merge`` callback printing each merge's status unless ``--quiet``."""
+
+    def progress(merge, status: str) -> None:
+        if not args.quiet:
+            print(f"{merge.sha[:12]} {status}", file=sys.stderr, flush=True)
+
+    return progress
+
+
+def _fingerprints(args: argparse.Namespace):
+    """Context manager of the ``--fingerprints`` store (``None`` if unset)."""
+    if not args.fingerprints:
+        return nullcontext()
+    from conflict_collection.index.fingerprints import SQLiteFingerprintStore
+
+    return SQLiteFingerprintStore(args.fingerprints)
+
+
+def _mining_options(args: argparse.Namespace) -> dict:
+    """Keyword arguments of the options every mining command shares."""
+    return dict(
+        societal=not args.no_societal,
+        compression=args.compression,
+        max_shard_bytes=args.max_shard_mb * 1024 * 1024,
+        memory_budget=(
+            None if args.memory_budget_mb is None else args.memory_budget_mb << 20
+        ),
+        file_timeout=args.file_timeout,
+        on_merge=_progress(args),
+    )
+
+
+def _build(args: argparse.Namespace) -> int:
+    from conflict_collection.mining.builder import build_corpus
+
+    with _fingerprints(args) as fingerprints:
+        stats = build_corpus(
+            args.repo,
+            args.revs,
+            args.output,
+            limit=args.limit,
+            fingerprints=fingerprints,
+            incremental=args.incremental,
+            **_mining_options(args),
+        )
+    print(json.dumps(asdict(stats), indent=2))
+    return 1 if stats.failed else 0
+
+
+def _quota(text: str) -> tuple[str, int]:
+    conflict_type, sep, count = text.partition("=")
+    if not sep or not count.isdigit():
+        raise argparse.ArgumentTypeError(f"expected TYPE=N, got {text!r}")
+    return conflict_type, int(count)
+
+
+def _sample(args: argparse.Namespace) -> int:
+    from conflict_collection.mining.sampler import sample_corpus
+
+    with _fingerprints(args) as fingerprints:
+        stats = sample_corpus(
+            args.repo,
+            args.revs,
+            args.output,
+            dict(args.quota),
+            seed=args.seed,
+            fingerprints=fingerprints,
+            **_mining_options(args),
+        )
+    print(json.dumps(asdict(stats), indent=2))
+    return 1 if stats.failed else 0
+
+
+def _shard(args: argparse.Namespace) -> int:
+    from conflict_collection.mining.distributed import mine_shards
+
+    with _fingerprints(args) as fingerprints:
+        stats = mine_shards(
+            args.repo,
+            args.revs,
+            args.output,
+            args.shards,
+            node=args.node,
+            lease_seconds=args.lease_seconds,
+            fingerprints=fingerprints,
+            **_mining_options(args),
+        )
+    print(json.dumps(asdict(stats), indent=2))
+    return 1 if stats.failed else 0
+
+
+def _combine(args: argparse.Namespace) -> int:
+    from conflict_collection.mining.distributed import combine_shards
+
+    stats = combine_shards(
+        args.shared,
+        args.output,
+        compression=args.compression,
+        max_shard_bytes=args.max_shard_mb * 1024 * 1024,
+    )
+    print(json.dumps(asdict(stats), indent=2))
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="conflict_collection")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Options shared by the commands that write shards / mine merges.
+    writing = argparse.ArgumentParser(add_help=False)
+    writing.add_argument("--compression", choices=["gzip", "zstd"])
+    writing.add_argument("--max-shard-mb", type=int, default=256)
+
+    mining = argparse.ArgumentParser(add_help=False, parents=[writing])
+    mining.add_argument(
+        "--no-societal", action="store_true", help="Skip social signals."
+    )
+    mining.add_argument(
+        "--memory-budget-mb",
+        type=int,
+        help="Spill case bodies of a merge to disk beyond this many MiB.",
+    )
+    mining.add_argument(
+        "--fingerprints",
+        metavar="DB",
+        help="SQLite fingerprint store shared across builds (e.g. of forks).",
+    )
+    mining.add_argument(
+        "--file-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Bound social-signal git work per conflicted file; slower files "
+        "are recorded as partial.",
+    )
+    mining.add_argument("-q", "--quiet", action="store_true")
+
+    build = commands.add_parser(
+        "build",
+        parents=[mining],
+        help="Mine conflicting merges into sharded JSONL (resumable).",
+        description=(
+            "Replay every merge in REVS, collect conflict cases and social "
+            "signals, and write them under OUTPUT. Rerunning with the same "
+            "OUTPUT skips merges recorded in OUTPUT/checkpoint.jsonl."
+        ),
+    )
+    build.add_argument("repo", help="Path to the Git repository.")
+    build.add_argument(
+        "revs", nargs="+", help="Revision range, e.g. main or v1.0..main."
+    )
+    build.add_argument("-o", "--output", required=True, help="Output directory.")
+    build.add_argument("--limit", type=int, help="Mine at most N pending merges.")
+    build.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only enumerate merges added since REVS was last fully mined.",
+    )
+    build.set_defaults(func=_build)
+
+    sample = commands.add_parser(
+        "sample",
+        parents=[mining],
+        help="Mine merges until each conflict type has its quota (resumable).",
+        description=(
+            "Classify the merges in REVS by conflict type from index stages "
+            "alone and mine only those that fill a quota not yet met, into "
+            "OUTPUT (same layout as build). Stops once every quota is met."
+        ),
+    )
+    sample.add_argument("repo", help="Path to the Git repository.")
+    sample.add_argument(
+        "revs", nargs="+", help="Revision range, e.g. main or v1.0..main."
+    )
+    sample.add_argument("-o", "--output", required=True, help="Output directory.")
+    sample.add_argument(
+        "--quota",
+        type=_quota,
+        action="append",
+        required=True,
+        metavar="TYPE=N",
+        help="Cases wanted of a conflict type, e.g. delete_modify=200; repeatable.",
+    )
+    sample.add_argument(
+        "--seed", type=int, help="Visit merges in a seeded random order."
+    )
+    sample.set_defaults(func=_sample)
+
+    shard = commands.add_parser(
+        "shard",
+        parents=[mining],
+        help="Mine shards of a range into a shared directory (run on each node).",
+        description=(
+            "Split the merges in REVS into SHARDS by sha and mine shards not "
+            "yet done or leased by another node into SHARED. Run the same "
+            "command on every node; then run combine."
+        ),
+    )
+    shard.add_argument("repo", help="Path to this node's clone.")
+    shard.add_argument(
+        "revs", nargs="+", help="Revision range, e.g. main or v1.0..main."
+    )
+    shard.add_argument("-o", "--output", required=True, help="Shared output directory.")
+    shard.add_argument("--shards", type=int, required=True)
+    shard.add_argument("--node", help="Node name (default: host name).")
+    shard.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=300.0,
+        help="Take over leases not refreshed for this long.",
+    )
+    shard.set_defaults(func=_shard)
+
+    combine = commands.add_parser(
+        "combine",
+        parents=[writing],
+        help="Combine the finished shards of a shared directory into one corpus.",
+    )
+    combine.add_argument("shared", help="Shared directory written by shard.")
+    combine.add_argument("-o", "--output", required=True, help="Output directory.")
+    combine.set_defaults(func=_combine)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,22 @@
+"""Repository handle helpers shared by the collectors."""
+
+import os
+from typing import Union
+
+from git import Repo
+
+RepoLike = Union[str, "os.PathLike[str]", Repo]
+"""A repository path or an already-open GitPython handle."""
+
+
+def open_repo(repo: RepoLike) -> Repo:
+    """Return ``repo`` unchanged if it is a handle, else open the path.
+
+    Passing a long-lived handle lets callers that invoke the collectors many
+    times (e.g. one per replayed merge) avoid re-discovering the repository
+    on every call. A handle must not be used by two threads at once.
+    """
+    return repo if isinstance(repo, Repo) else Repo(repo)
+
+
+__all__ = ["RepoLike", "open_repo"]
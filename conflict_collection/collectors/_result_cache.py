@@ -0,0 +1,103 @@
+"""Whole-merge result caching shared by the collectors.
+
+A cached result is stored under :func:`merge_result_fingerprint` of the
+merge's resolved shas and options, together with those key parts; a payload
+whose recorded key differs (a colliding or foreign entry) is a miss.
+
+Large results can instead be stored one result per entry
+(:meth:`ResultKey.save_iter`); the head entry is written last and holds
+only the count, so readers stream the results and a half-written entry is
+still a miss.
+"""
+
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Optional
+
+from git import GitCommandError, Repo
+
+from conflict_collection.index.fingerprints import merge_result_fingerprint
+
+if TYPE_CHECKING:
+    from conflict_collection.index.fingerprints import FingerprintStore
+
+_FORMAT = 1
+"""Bumped whenever the stored representation of results changes."""
+
+
+class ResultKey:
+    """Key of one collector call: the merge's shas plus its options."""
+
+    __slots__ = ("parts", "fingerprint")
+
+    def __init__(
+        self,
+        collector: str,
+        head_sha: str,
+        merge_sha: str,
+        resolution_sha: Optional[str],
+        options: Mapping[str, Any],
+    ) -> None:
+        options = {**options, "format": _FORMAT}
+        self.parts = [collector, head_sha, merge_sha, resolution_sha, options]
+        self.fingerprint = merge_result_fingerprint(
+            collector, head_sha, merge_sha, resolution_sha, options
+        )
+
+    def load(self, cache: "FingerprintStore") -> Optional[list[dict[str, Any]]]:
+        """The cached results, or ``None`` on a miss."""
+        payload = cache.get(self.fingerprint)
+        if payload is None or payload.get("key") != self.parts:
+            return None
+        return payload["results"]
+
+    def save(self, cache: "FingerprintStore", results: list[dict[str, Any]]) -> None:
+        cache.put(self.fingerprint, {"key": self.parts, "results": results})
+
+    def load_iter(
+        self, cache: "FingerprintStore"
+    ) -> Optional[Iterator[dict[str, Any]]]:
+        """Like :meth:`load`, reading entries of :meth:`save_iter` lazily.
+
+        The iterator raises ``KeyError`` if a result entry has gone missing.
+        """
+        payload = cache.get(self.fingerprint)
+        if payload is None or payload.get("key") != self.parts:
+            return None
+        if "results" in payload:
+            return iter(payload["results"])
+        return self._items(cache, payload["count"])
+
+    def save_iter(
+        self, cache: "FingerprintStore", results: Iterable[dict[str, Any]]
+    ) -> None:
+        """Store each result under its own entry, then the head."""
+        count = 0
+        for result in results:
+            cache.put(self._item_key(count), result)
+            count += 1
+        cache.put(self.fingerprint, {"key": self.parts, "count": count})
+
+    def _item_key(self, index: int) -> str:
+        return f"{self.fingerprint}/{index}"
+
+    def _items(self, cache: "FingerprintStore", count: int) -> Iterator[dict[str, Any]]:
+        for index in range(count):
+            item = cache.get(self._item_key(index))
+            if item is None:
+                raise KeyError(self._item_key(index))
+            yield item
+
+
+def resolve_merge(repo: Repo, *revs: str) -> Optional[list[str]]:
+    """Full shas of ``HEAD``, ``MERGE_HEAD`` and ``revs`` in one ``rev-parse``.
+
+    ``None`` when no merge is in progress (or a rev does not resolve); such
+    calls are not cached.
+    """
+    try:
+        shas = repo.git.rev_parse("HEAD", "MERGE_HEAD", *revs).split()
+    except GitCommandError:
+        return None
+    return shas if len(shas) == 2 + len(revs) else None
+
+
+__all__ = ["ResultKey", "resolve_merge"]
@@ -1,8 +1,13 @@
 from collections import defaultdict
 from pathlib import Path
+from typing import Iterable, TypeVar
 
 from git import Blob, GitCommandError, Repo, StageType
 
+from conflict_collection.index.fingerprints import conflict_fingerprint
+
+V = TypeVar("V")
+
 
 def list_tracked_files(repo: Repo) -> list[str]:
     """Files at HEAD (ignores unstaged/untracked)."""
@@ -64,18 +69,51 @@ def group_conflict_families(repo: Repo):
             rows.append((tpl[0], tpl[1], Path(path)))  # (stage, Blob, Path)
 
     # 2. group by "conflict family"
-    groups: dict[str, dict[int, tuple[Blob, Path]]] = defaultdict(dict)
-    for stage, blob, path in rows:
-        family_key = None
+    return group_stage_rows(
+        (stage, blob.hexsha, path, (blob, path)) for stage, blob, path in rows
+    )
 
-        family_key = f"{blob.hexsha}:{path}"  # default key for stage 1
+
+def group_stage_rows(
+    rows: Iterable[tuple[int, str, Path, V]],
+) -> dict[str, dict[int, V]]:
+    """Group ``(stage, blob sha, path, value)`` rows into conflict families.
+
+    The grouping rule of :func:`group_conflict_families`, for unmerged
+    entries from any source (e.g. ``git merge-tree`` output): a stage 2/3
+    row joins the family of an earlier row with the same blob or path.
+    """
+    groups: dict[str, dict[int, V]] = defaultdict(dict)
+    for stage, sha, path, value in rows:
+        family_key = f"{sha}:{path}"  # default key for stage 1
 
         if stage != 1:
             # Check if stage 1 row exists
             for key in groups:
-                if key.startswith(blob.hexsha) or key.endswith(str(path)):
+                if key.startswith(sha) or key.endswith(str(path)):
                     family_key = key
 
-        groups[family_key][stage] = (blob, path)
+        groups[family_key][stage] = value
 
     return groups
+
+
+CONFLICT_TYPE_BY_STAGES: dict[frozenset[int], str] = {
+    frozenset({1}): "delete_delete",
+    frozenset({2}): "added_by_us",
+    frozenset({3}): "added_by_them",
+    frozenset({1, 2}): "modify_delete",
+    frozenset({1, 3}): "delete_modify",
+    frozenset({2, 3}): "add_add",
+    frozenset({1, 2, 3}): "modify_modify",
+}
+"""Conflict type of a family by the index stages it has."""
+
+
+def family_fingerprint(slot: dict[int, tuple[Blob, Path]]) -> str:
+    """Fingerprint of a conflict family from its stage 1/2/3 blob shas.
+
+    Costs no git call: the shas come straight from the unmerged index.
+    """
+    shas = {stage: blob.hexsha for stage, (blob, _) in slot.items()}
+    return conflict_fingerprint(shas.get(1), shas.get(2), shas.get(3))
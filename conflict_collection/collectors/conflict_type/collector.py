@@ -1,9 +1,12 @@
-from typing import Optional
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Iterator, Optional, Union, overload
 
 from conflict_parser import MergeMetadata
-from git import Repo
 
+from conflict_collection.collectors._repo import RepoLike, open_repo
+from conflict_collection.collectors._result_cache import ResultKey, resolve_merge
 from conflict_collection.collectors.conflict_type._git_ops import (
+    family_fingerprint,
     group_conflict_families,
     read_blob,
     read_worktree_file,
@@ -19,10 +22,64 @@ from conflict_collection.schema.typed_five_tuple import (
     ModifyModifyConflictCase,
 )
 
+if TYPE_CHECKING:
+    from conflict_collection.index.fingerprints import FingerprintStore
+    from conflict_collection.io.spill import CaseSpool
 
+
+@overload
+def collect(
+    repo_path: RepoLike,
+    resolution_sha: str,
+    merge_config: Optional[MergeMetadata] = None,
+    memory_budget: None = None,
+    seen: Optional["FingerprintStore"] = None,
+    cache: Optional["FingerprintStore"] = None,
+) -> list[ConflictCase]: ...
+
+
+@overload
+def collect(
+    repo_path: RepoLike,
+    resolution_sha: str,
+    merge_config: Optional[MergeMetadata] = None,
+    *,
+    memory_budget: int,
+    seen: Optional["FingerprintStore"] = None,
+    cache: Optional["FingerprintStore"] = None,
+) -> "CaseSpool": ...
+
+
+@overload
+def collect(
+    repo_path: RepoLike,
+    resolution_sha: str,
+    merge_config: Optional[MergeMetadata],
+    memory_budget: int,
+    seen: Optional["FingerprintStore"] = None,
+    cache: Optional["FingerprintStore"] = None,
+) -> "CaseSpool": ...
+
+
+@overload
 def collect(
-    repo_path: str, resolution_sha: str, merge_config: Optional[MergeMetadata] = None
-) -> list[ConflictCase]:
+    repo_path: RepoLike,
+    resolution_sha: str,
+    merge_config: Optional[MergeMetadata] = None,
+    memory_budget: Optional[int] = None,
+    seen: Optional["FingerprintStore"] = None,
+    cache: Optional["FingerprintStore"] = None,
+) -> Union[list[ConflictCase], "CaseSpool"]: ...
+
+
+def collect(
+    repo_path: RepoLike,
+    resolution_sha: str,
+    merge_config: Optional[MergeMetadata] = None,
+    memory_budget: Optional[int] = None,
+    seen: Optional["FingerprintStore"] = None,
+    cache: Optional["FingerprintStore"] = None,
+) -> Union[list[ConflictCase], "CaseSpool"]:
     """Collect typed merge conflict cases.
 
     Reads the raw unmerged index (``git ls-files -u``) and groups index stages
@@ -34,27 +91,83 @@ def collect(
     contents no longer contain conflict markers (auto-resolved edge cases).
 
     Args:
-        repo_path: Filesystem path to a Git repository currently in a merge-conflict state.
+        repo_path: Path to (or open ``git.Repo`` handle of) a Git repository currently in a merge-conflict state.
         resolution_sha: Commit SHA representing the resolved state (used to retrieve final blob content).
         merge_config: Optional merge metadata (used to validate marker size / style).
+        memory_budget: Optional cap, in bytes of decoded bodies, on what the
+            result keeps in memory. Cases beyond it are spilled to a temporary
+            file and decoded again on access (see :class:`CaseSpool`).
+        seen: Optional fingerprint store shared across merges / repositories.
+            Families whose stage blob shas were already collected are skipped
+            before any blob is read, and new ones are added to the store.
+            Skip-only: repeats are left out of the result, not restored from
+            the store, which records only where each was first seen. Use
+            ``cache`` to get a merge's stored cases back.
+        cache: Optional store of whole results, keyed by the full shas of
+            ``HEAD``, ``MERGE_HEAD`` and ``resolution_sha`` plus
+            ``merge_config``. A repeat call on the same merge is answered
+            with one ``rev-parse`` and one store read; otherwise the result
+            is added to it. Calls outside a merge are not cached. With
+            ``memory_budget`` the result is stored and restored one case at
+            a time, so neither direction holds it all in memory.
 
     Returns:
-        List of typed ``ConflictCase`` instances.
+        List of typed ``ConflictCase`` instances, or a list-like
+        :class:`~conflict_collection.io.spill.CaseSpool` when
+        ``memory_budget`` is set. The spool may hold a temporary file;
+        close it (or use it as a context manager) once consumed.
 
     Raises:
-        ValueError: If expected blobs/paths are missing for a detected conflict shape.
+        ValueError: If expected blobs/paths are missing for a detected conflict
+            shape, or if both ``seen`` and ``cache`` are given.
     """
-    repo = Repo(repo_path)
+    repo = open_repo(repo_path)
+
+    key = None
+    if cache is not None:
+        if seen is not None:
+            # With ``seen`` the result depends on the store's state, not
+            # only on the merge, so it cannot be cached under the merge.
+            raise ValueError("seen and cache cannot be combined")
+        shas = resolve_merge(repo, resolution_sha)
+        if shas is not None:
+            key = ResultKey(
+                "conflict_type",
+                *shas,
+                {
+                    "merge_config": (
+                        None if merge_config is None else asdict(merge_config)
+                    )
+                },
+            )
+            cached = key.load_iter(cache)
+            if cached is not None:
+                restored = _restore(cached, memory_budget)
+                if restored is not None:
+                    return restored
 
     # 1. group by "conflict family", or loosely speaking "same file"
     groups = group_conflict_families(repo)
 
-    cases: list[ConflictCase] = []
+    cases: Union[list[ConflictCase], "CaseSpool"]
+    if memory_budget is None:
+        cases = []
+    else:
+        from conflict_collection.io.spill import CaseSpool
+
+        cases = CaseSpool(memory_budget)
 
     # 3. build ConflictCase objects
     for slot in groups.values():
         found_stages = frozenset(slot.keys())
 
+        fingerprint = None
+        if seen is not None:
+            fingerprint = family_fingerprint(slot)
+            if fingerprint in seen:
+                continue
+        n_cases = len(cases)
+
         o_blob, o_path = slot.get(1, (None, None))
         a_blob, a_path = slot.get(2, (None, None))
         b_blob, b_path = slot.get(3, (None, None))
@@ -196,7 +309,6 @@ def collect(
                     resolved_body=resolved_body,
                 )
             )
-            continue
 
         elif found_stages == {2, 3}:
             if a_blob is None or a_path is None or b_blob is None or b_path is None:
@@ -226,7 +338,6 @@ def collect(
                     resolved_body=resolved_body,
                 )
             )
-            continue
 
         else:
             if (
@@ -270,4 +381,38 @@ def collect(
                 )
             )
 
+        if fingerprint is not None and seen is not None and len(cases) > n_cases:
+            path = a_path or b_path or o_path
+            seen.put(fingerprint, {"path": str(path), "resolution_sha": resolution_sha})
+
+    if key is not None:
+        from conflict_collection.io.jsonl import conflict_case_to_dict
+
+        if memory_budget is None:
+            key.save(cache, [conflict_case_to_dict(case) for case in cases])
+        else:
+            key.save_iter(cache, (conflict_case_to_dict(case) for case in cases))
+    return cases
+
+
+def _restore(
+    cached: Iterator[dict], memory_budget: Optional[int]
+) -> Union[list[ConflictCase], "CaseSpool", None]:
+    """Decode cached cases one at a time; ``None`` if an entry is missing."""
+    from conflict_collection.io.jsonl import conflict_case_from_dict
+
+    cases: Union[list[ConflictCase], "CaseSpool"]
+    if memory_budget is None:
+        cases = []
+    else:
+        from conflict_collection.io.spill import CaseSpool
+
+        cases = CaseSpool(memory_budget)
+    try:
+        for data in cached:
+            cases.append(conflict_case_from_dict(data))
+    except KeyError:
+        if not isinstance(cases, list):
+            cases.close()
+        return None
     return cases
@@ -1,7 +1,21 @@
 from conflict_collection.collectors.societal.collector import (
     collect,
 )
+from conflict_collection.collectors.societal.cost import (
+    CostModel,
+    FileCost,
+    PathCommitIndex,
+)
+from conflict_collection.collectors.societal.history import (
+    MergeQuery,
+    collect_history,
+)
 
 __all__ = [
     "collect",
+    "collect_history",
+    "MergeQuery",
+    "CostModel",
+    "FileCost",
+    "PathCommitIndex",
 ]
@@ -7,6 +7,30 @@ from typing import Iterable, List, Optional, Tuple
 from git import Commit, GitCommandError, Repo
 
 
+class GitTimeout(Exception):
+    """A git call was killed after exceeding its time budget."""
+
+
+def _timed(method, *args, timeout: Optional[float] = None) -> str:
+    """Run ``repo.git.<method>(*args)``, killed after ``timeout`` seconds.
+
+    Raises:
+        GitTimeout: If the process was killed (other failures propagate as
+            ``GitCommandError``).
+    """
+    if timeout is None:
+        return method(*args)
+    try:
+        return method(*args, kill_after_timeout=timeout)
+    except GitCommandError as e:
+        if "did not complete in" in str(e.stderr):
+            raise GitTimeout(
+                f"git {e.command[1] if len(e.command) > 1 else ''} "
+                f"exceeded {timeout:.3g}s"
+            ) from e
+        raise
+
+
 def conflicted_files(repo: Repo) -> List[str]:
     """Return a list of paths that are currently in a merge conflict state.
 
@@ -61,19 +85,30 @@ def commit_epoch(repo: Repo, sha: str) -> int:
     return int(c.committed_date)
 
 
-def last_commit_for_path(repo: Repo, rev: str, path: str) -> Optional[Commit]:
+def last_commit_for_path(
+    repo: Repo, rev: str, path: str, *, timeout: Optional[float] = None
+) -> Optional[Commit]:
     """Return the most recent commit (at or before ``rev``) that touched ``path``.
 
     Args:
         repo: Repository handle.
         rev: Revision (single commit / ref) to start walking backwards from.
         path: File path to filter history by.
+        timeout: Kill the walk after this many seconds.
 
     Returns:
         The most recent ``Commit`` object touching ``path`` reachable from
         ``rev`` or ``None`` if not found / lookup fails.
+
+    Raises:
+        GitTimeout: If ``timeout`` ran out.
     """
     try:
+        if timeout is not None:
+            sha = _timed(
+                repo.git.rev_list, "--max-count=1", rev, "--", path, timeout=timeout
+            ).strip()
+            return repo.commit(sha) if sha else None
         commits: Iterable[Commit] = repo.iter_commits(rev, paths=path, max_count=1)
         return next(iter(commits), None)
     except GitCommandError:
@@ -100,7 +135,9 @@ def commit_author_str(commit: Commit) -> Optional[str]:
     return email or None
 
 
-def count_commits_by_author(repo: Repo, path: str, author: str) -> int:
+def count_commits_by_author(
+    repo: Repo, path: str, author: str, *, timeout: Optional[float] = None
+) -> int:
     """Count prior commits on ``path`` authored by ``author``.
 
     Mirrors shell pattern: ``git log --pretty='%an' --author="$AUTHOR" -- <path> | wc -l``.
@@ -109,13 +146,24 @@ def count_commits_by_author(repo: Repo, path: str, author: str) -> int:
         repo: Repository handle.
         path: File path to inspect.
         author: Author name to match; if ``None`` returns 0.
+        timeout: Kill the ``git log`` after this many seconds.
 
     Returns:
         Count of matching commits (0 on errors).
+
+    Raises:
+        GitTimeout: If ``timeout`` ran out.
     """
     # Mirrors: git log --pretty='%an' --author="$author" -- "$f" | wc -l
     try:
-        out = repo.git.log("--pretty=%an", f"--author={author}", "--", path)
+        out = _timed(
+            repo.git.log,
+            "--pretty=%an",
+            f"--author={author}",
+            "--",
+            path,
+            timeout=timeout,
+        )
         return len([ln for ln in out.splitlines() if ln.strip()])
     except GitCommandError:
         return 0
@@ -159,6 +207,7 @@ def count_commits_by_author_since_bases(
     include_merges: bool = True,
     first_parent: bool = False,
     ancestry_path: bool = False,
+    timeout: Optional[float] = None,
 ) -> int:
     """Count commits by a given author that modified `path`, reachable from
     `tip` but from none of the given merge-bases.
@@ -189,9 +238,13 @@ def count_commits_by_author_since_bases(
             (`--first-parent`) to emphasize the branch's mainline.
         ancestry_path: If `True`, restrict to commits that lie on some ancestry
             path from any base to `tip` (`--ancestry-path`).
+        timeout: Kill the `git log` after this many seconds.
 
     Returns:
         Integer count of matching commits.
+
+    Raises:
+        GitTimeout: If `timeout` ran out.
     """
 
     if not author:
@@ -212,12 +265,14 @@ def count_commits_by_author_since_bases(
 
     # %aN respects --use-mailmap; fallback to %an otherwise
     fmt = "%aN" if use_mailmap else "%an"
-    out = repo.git.log(
+    out = _timed(
+        repo.git.log,
         *rev_args,
         *revs,
         f"--pretty={fmt}",
         "--",
         path,
+        timeout=timeout,
     )
     names = [ln.strip() for ln in out.splitlines() if ln.strip()]
 
@@ -255,7 +310,9 @@ def integrator_name(repo: Repo) -> Optional[str]:
         return None
 
 
-def blame_aggregate(repo: Repo, rev: str, path: str) -> List[Tuple[str, int]]:
+def blame_aggregate(
+    repo: Repo, rev: str, path: str, *, timeout: Optional[float] = None
+) -> List[Tuple[str, int]]:
     """
     Aggregate blame information by author for a given revision of a path.
 
@@ -270,12 +327,18 @@ def blame_aggregate(repo: Repo, rev: str, path: str) -> List[Tuple[str, int]]:
         repo: Repository handle.
         rev: Revision (commit SHA / ref) to blame.
         path: File path to blame.
+        timeout: Kill the blame after this many seconds.
 
     Returns:
         A list of ``(author, line_count)`` pairs. Order is not guaranteed.
+
+    Raises:
+        GitTimeout: If ``timeout`` ran out.
     """
     try:
-        txt = repo.git.blame("-w", "--line-porcelain", rev, "--", path)
+        txt = _timed(
+            repo.git.blame, "-w", "--line-porcelain", rev, "--", path, timeout=timeout
+        )
     except GitCommandError:
         return []
 
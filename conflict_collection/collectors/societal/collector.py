@@ -1,11 +1,18 @@
 """Orchestrates collection of ownership & recency metrics for conflicted files."""
 
 import logging
-from typing import Iterable, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, TypeVar
 
 from git import Repo
 
+from conflict_collection.collectors._repo import RepoLike, open_repo
+from conflict_collection.collectors._result_cache import ResultKey, resolve_merge
 from conflict_collection.collectors.societal._git_ops import (
+    GitTimeout,
     age_days,
     blame_aggregate,
     commit_author_str,
@@ -18,16 +25,169 @@ from conflict_collection.collectors.societal._git_ops import (
     merge_bases,
     rev_parse,
 )
-from conflict_collection.schema.social_signals import (
-    BlameEntry,
-    IntegratorPriors,
-    SocialSignalsRecord,
+from conflict_collection.collectors.societal.cost import (
+    CostModel,
+    FileCost,
+    PathCommitIndex,
+    estimate_costs,
 )
+from conflict_collection.index.fingerprints import social_fingerprint
+from conflict_collection.schema.social_signals import SocialSignalsRecord
+
+if TYPE_CHECKING:
+    from conflict_collection.index.fingerprints import FingerprintStore
+
+T = TypeVar("T")
+
+
+class _FileBudget:
+    """Time budgets for one file's git calls; records what ran out."""
+
+    def __init__(
+        self, call_timeout: Optional[float], file_timeout: Optional[float]
+    ) -> None:
+        self.call_timeout = call_timeout
+        self.deadline = (
+            None if file_timeout is None else time.monotonic() + file_timeout
+        )
+        self.partial: dict[str, str] = {}
+
+    def run(
+        self, fields: tuple[str, ...], call: Callable[..., T], *args
+    ) -> Optional[T]:
+        """``call(*args, timeout=...)``, or ``None`` with ``fields`` marked."""
+        timeout = self.call_timeout
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                self.partial.update(dict.fromkeys(fields, "file time budget exhausted"))
+                return None
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        try:
+            return call(*args, timeout=timeout)
+        except GitTimeout as e:
+            self.partial.update(dict.fromkeys(fields, str(e)))
+            return None
+
+
+@dataclass(frozen=True, slots=True)
+class _MergeContext:
+    """Per-merge values shared by every file's collection."""
+
+    head_sha: str
+    merge_sha: str
+    base_shas: list[str]
+    ref_ts: int
+    integrator: Optional[str]
+
+
+def _collect_file(
+    repo: Repo, f: str, merge: _MergeContext, budget: _FileBudget
+) -> Optional[SocialSignalsRecord]:
+    """One file's record, or ``None`` if it has no history on a side."""
+    ours_last = budget.run(
+        ("ours_author", "age_days_ours", "owner_commits_ours"),
+        last_commit_for_path,
+        repo,
+        merge.head_sha,
+        f,
+    )
+    theirs_last = budget.run(
+        ("theirs_author", "age_days_theirs", "owner_commits_theirs"),
+        last_commit_for_path,
+        repo,
+        merge.merge_sha,
+        f,
+    )
+    if ours_last is None and "ours_author" not in budget.partial:
+        logging.error(
+            f"Last commit for {f} not found on {repo} "
+            f"starting from commit hash {merge.head_sha}. "
+            "Skipping file."
+        )
+        return None
+    if theirs_last is None and "theirs_author" not in budget.partial:
+        logging.error(
+            f"Last commit for {f} not found on {repo} "
+            f"starting from commit hash {merge.merge_sha}. "
+            "Skipping file."
+        )
+        return None
+
+    ours_author = commit_author_str(ours_last) if ours_last else None
+    theirs_author = commit_author_str(theirs_last) if theirs_last else None
+
+    owner_commits_ours = owner_commits_theirs = None
+    if ours_last is not None:
+        owner_commits_ours = budget.run(
+            ("owner_commits_ours",),
+            count_commits_by_author_since_bases,
+            repo,
+            f,
+            ours_author,
+            merge.base_shas,
+            merge.head_sha,
+        )
+    if theirs_last is not None:
+        owner_commits_theirs = budget.run(
+            ("owner_commits_theirs",),
+            count_commits_by_author_since_bases,
+            repo,
+            f,
+            theirs_author,
+            merge.base_shas,
+            merge.merge_sha,
+        )
+
+    age_days_ours = age_days(merge.ref_ts, ours_last) if ours_last else None
+    age_days_theirs = age_days(merge.ref_ts, theirs_last) if theirs_last else None
+
+    integrator_prev = (
+        budget.run(
+            ("resolver_prev_commits",),
+            count_commits_by_author,
+            repo,
+            f,
+            merge.integrator,
+        )
+        if merge.integrator
+        else 0
+    )
+
+    blame_pairs = budget.run(("blame_table",), blame_aggregate, repo, merge.head_sha, f)
+
+    # Every value below comes straight from git with the right type, so
+    # skip pydantic validation (it dominates history-wide runs).
+    return SocialSignalsRecord.construct_trusted(
+        file=f,
+        ours_author=ours_author,
+        theirs_author=theirs_author,
+        owner_commits_ours=owner_commits_ours,
+        owner_commits_theirs=owner_commits_theirs,
+        age_days_ours=age_days_ours,
+        age_days_theirs=age_days_theirs,
+        resolver_prev_commits=integrator_prev,
+        blame_pairs=(
+            None
+            if blame_pairs is None
+            else sorted(blame_pairs, key=lambda p: p[1], reverse=True)
+        ),
+        partial=budget.partial or None,
+    )
 
 
 def collect(
-    repo_path: str = ".",
+    repo_path: RepoLike = ".",
     files: Optional[Iterable[str]] = None,
+    store: Optional["FingerprintStore"] = None,
+    *,
+    call_timeout: Optional[float] = None,
+    file_timeout: Optional[float] = None,
+    workers: int = 1,
+    cost_model: Optional[CostModel] = None,
+    path_index: Optional[PathCommitIndex] = None,
+    on_cost: Optional[Callable[[FileCost], None]] = None,
+    cache: Optional["FingerprintStore"] = None,
 ) -> dict[str, SocialSignalsRecord]:
     """Collect ownership & social signal metrics for conflicted files.
 
@@ -39,78 +199,157 @@ def collect(
     bases, integrator prior activity, and an aggregated blame table.
 
     Args:
-        repo_path: Filesystem path to the repository (defaults to current directory).
+        repo_path: Path to (or open ``git.Repo`` handle of) the repository (defaults to current directory).
         files: Optional iterable of repo-relative file paths; if omitted, only conflicted files are used.
+        store: Optional fingerprint store shared across merges / repositories.
+            Records already stored for the same (HEAD, MERGE_HEAD, path,
+            integrator) are reused without any per-file git work; new
+            records are added to it.
+        call_timeout: Seconds after which one per-file ``git log`` /
+            ``rev-list`` / ``blame`` is killed.
+        file_timeout: Seconds all per-file git calls of one file may take
+            together; later calls are skipped once it runs out.
+
+            With either budget set, a file whose calls time out is still
+            returned, as a partially collected record: the affected fields
+            are ``None`` and ``record.partial`` maps each to the reason.
+            Partial records are not added to ``store``.
+        workers: Threads collecting files concurrently, each with its own
+            repository handle. With more than one, files are started in
+            order of decreasing estimated cost (see
+            :mod:`~conflict_collection.collectors.societal.cost`).
+        cost_model: Model for those estimates (default :class:`CostModel`).
+        path_index: Per-path commit counts reused across calls; without
+            it, one ``git log`` over this merge's files supplies them.
+        on_cost: Called on the calling thread with each collected file's
+            estimated and measured :class:`FileCost`. Setting it turns on
+            estimation even with one worker.
+        cache: Optional store of whole results, keyed by the full shas of
+            ``HEAD`` and ``MERGE_HEAD``, ``files`` and the integrator. A
+            repeat call is answered without any per-file git work; otherwise
+            the result is added to it unless a record is partial.
 
     Returns:
-        Mapping of file path to :class:`SocialSignalsRecord`.
+        Mapping of file path to :class:`SocialSignalsRecord`, in input order.
     """
-    repo = Repo(repo_path)
+    repo = open_repo(repo_path)
+    files = list(files) if files else None
+
+    key = None
+    if cache is not None:
+        shas = resolve_merge(repo)
+        if shas is not None:
+            integrator = integrator_name(repo)
+            key = ResultKey(
+                "societal", *shas, None, {"files": files, "integrator": integrator}
+            )
+            cached = key.load(cache)
+            if cached is not None:
+                return {
+                    data["file"]: SocialSignalsRecord.model_validate(data)
+                    for data in cached
+                }
 
-    file_list = list(files) if files else conflicted_files(repo)
+    file_list = files or conflicted_files(repo)
     if not file_list:
         return {}
 
-    head_sha = rev_parse(repo, "HEAD")
-    merge_sha = rev_parse(repo, "MERGE_HEAD")
-    base_shas = merge_bases(repo, head_sha, merge_sha)
-    epoch_head = commit_epoch(repo, head_sha)
-    epoch_merge = commit_epoch(repo, merge_sha)
-    ref_ts = max(epoch_head, epoch_merge)
-
-    integrator = integrator_name(repo)
+    if key is not None:
+        head_sha, merge_sha = shas
+    else:
+        head_sha = rev_parse(repo, "HEAD")
+        merge_sha = rev_parse(repo, "MERGE_HEAD")
+        integrator = integrator_name(repo)
 
     results: dict[str, SocialSignalsRecord] = {}
     """Mapping from file path to SocialSignalsRecord"""
 
-    for f in file_list:
-        ours_last = last_commit_for_path(repo, head_sha, f)
-        theirs_last = last_commit_for_path(repo, merge_sha, f)
-        if ours_last is None:
-            logging.error(
-                f"Last commit for {f} not found on {repo} "
-                f"starting from commit hash {head_sha}. "
-                "Skipping file."
-            )
-            continue
-        if theirs_last is None:
-            logging.error(
-                f"Last commit for {f} not found on {repo} "
-                f"starting from commit hash {merge_sha}. "
-                "Skipping file."
-            )
-            continue
+    pending = file_list
+    if store is not None:
+        pending = []
+        for f in file_list:
+            cached = store.get(social_fingerprint(head_sha, merge_sha, f, integrator))
+            if cached is None:
+                pending.append(f)
+            else:
+                results[f] = SocialSignalsRecord.model_validate(cached)
+        if not pending:
+            return _finish(results, file_list, cache, key)
 
-        ours_author = commit_author_str(ours_last)
-        theirs_author = commit_author_str(theirs_last)
+    merge = _MergeContext(
+        head_sha=head_sha,
+        merge_sha=merge_sha,
+        base_shas=merge_bases(repo, head_sha, merge_sha),
+        ref_ts=max(commit_epoch(repo, head_sha), commit_epoch(repo, merge_sha)),
+        integrator=integrator,
+    )
 
-        owner_commits_ours = count_commits_by_author_since_bases(
-            repo, f, ours_author, base_shas, head_sha
-        )
-        owner_commits_theirs = count_commits_by_author_since_bases(
-            repo, f, theirs_author, base_shas, merge_sha
+    estimates = None
+    if workers > 1 or on_cost is not None:
+        estimates = estimate_costs(
+            repo,
+            pending,
+            head_sha,
+            merge_sha,
+            model=cost_model or CostModel(),
+            index=path_index,
         )
+        # Longest first: the expensive files must not be the last to start.
+        pending = sorted(pending, key=lambda f: estimates[f][2], reverse=True)
 
-        age_days_ours = age_days(ref_ts, ours_last)
-        age_days_theirs = age_days(ref_ts, theirs_last)
+    def timed(
+        f: str, handle: Repo
+    ) -> tuple[str, Optional[SocialSignalsRecord], _FileBudget, float]:
+        budget = _FileBudget(call_timeout, file_timeout)
+        started = time.perf_counter()
+        record = _collect_file(handle, f, merge, budget)
+        return f, record, budget, time.perf_counter() - started
 
-        integrator_prev = (
-            count_commits_by_author(repo, f, integrator) if integrator else 0
-        )
+    if workers > 1:
+        local = threading.local()
+        handles: list[Repo] = []
 
-        blame_pairs = blame_aggregate(repo, head_sha, f)
-        blame_table = [BlameEntry(author=a, lines=n) for a, n in blame_pairs]
-
-        results[f] = SocialSignalsRecord(
-            file=f,
-            ours_author=ours_author,
-            theirs_author=theirs_author,
-            owner_commits_ours=owner_commits_ours,
-            owner_commits_theirs=owner_commits_theirs,
-            age_days_ours=age_days_ours,
-            age_days_theirs=age_days_theirs,
-            integrator_priors=IntegratorPriors(resolver_prev_commits=integrator_prev),
-            blame_table=sorted(blame_table, key=lambda b: b.lines, reverse=True),
-        )
+        def run(f: str):
+            handle = getattr(local, "repo", None)
+            if handle is None:
+                # GitPython handles must not be shared between threads.
+                handle = local.repo = Repo(repo.working_tree_dir)
+                handles.append(handle)
+            return timed(f, handle)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(run, pending))
+        finally:
+            for handle in handles:
+                handle.close()
+    else:
+        outcomes = (timed(f, repo) for f in pending)
+
+    for f, record, budget, seconds in outcomes:
+        if record is None:
+            continue
+        results[f] = record
+        if store is not None and not budget.partial:
+            store.put(
+                social_fingerprint(head_sha, merge_sha, f, integrator),
+                record.model_dump(mode="json"),
+            )
+        if on_cost is not None and estimates is not None:
+            size, commits, estimated = estimates[f]
+            on_cost(FileCost(f, size, commits, estimated, seconds))
+
+    return _finish(results, file_list, cache, key)
 
-    return results
+
+def _finish(
+    results: dict[str, SocialSignalsRecord],
+    file_list: list[str],
+    cache: Optional["FingerprintStore"],
+    key: Optional[ResultKey],
+) -> dict[str, SocialSignalsRecord]:
+    # Keep the input order despite store hits and cost ordering.
+    ordered = {f: results[f] for f in file_list if f in results}
+    if key is not None and not any(r.partial for r in ordered.values()):
+        key.save(cache, [r.model_dump(mode="json") for r in ordered.values()])
+    return ordered
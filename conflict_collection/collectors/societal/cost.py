@@ -0,0 +1,155 @@
+"""Per-file cost estimates for scheduling societal work longest-first.
+
+Collecting one file's signals costs a few ``git log`` walks plus a blame, so
+its time grows with the file's size and with how many commits touched it,
+and varies by orders of magnitude between files. With several workers, a
+huge file that starts last dominates the merge's wall time. The collector
+therefore estimates every file's cost up front from cheap pre-signals and
+starts the most expensive files first (LPT scheduling):
+
+* blob size at ``HEAD`` (or ``MERGE_HEAD``), read through GitPython's
+  persistent ``git cat-file --batch-check`` process, so no extra spawn;
+* commits touching the path, from a :class:`PathCommitIndex` built once per
+  repository and reused across merges, or else one ``git log`` limited to
+  the files of this merge.
+
+Each file's estimated and measured cost is reported as a :class:`FileCost`,
+and :meth:`CostModel.fit` recalibrates the model from those reports.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional, Sequence
+
+from git import Repo
+
+
+@dataclass(frozen=True, slots=True)
+class FileCost:
+    """Estimated and measured cost of collecting one file."""
+
+    path: str
+    blob_bytes: int
+    commits: int
+    estimated: float
+    """Model estimate, in seconds."""
+    actual: float
+    """Measured wall time of the file's collection, in seconds."""
+
+
+@dataclass(frozen=True, slots=True)
+class CostModel:
+    """Linear cost model: ``fixed + per_kib * KiB + per_commit * commits``.
+
+    The defaults only need to rank files correctly; use :meth:`fit` on
+    reported costs for absolute estimates on a given machine.
+    """
+
+    fixed: float = 0.02
+    per_kib: float = 0.0005
+    per_commit: float = 0.001
+
+    def estimate(self, blob_bytes: int, commits: int) -> float:
+        """Estimated seconds for one file."""
+        return self.fixed + self.per_kib * blob_bytes / 1024 + self.per_commit * commits
+
+    @classmethod
+    def fit(cls, costs: Iterable[FileCost]) -> "CostModel":
+        """Least-squares fit to measured costs; negative coefficients become 0.
+
+        Raises:
+            ValueError: With fewer than three observations.
+        """
+        rows = [(1.0, c.blob_bytes / 1024, float(c.commits), c.actual) for c in costs]
+        if len(rows) < 3:
+            raise ValueError(f"need at least 3 observations, got {len(rows)}")
+        # Normal equations (X^T X) b = X^T y, solved by Gauss-Jordan with a
+        # tiny ridge so constant features (e.g. every file equally sized)
+        # don't make the system singular.
+        n = 3
+        a = [
+            [
+                sum(r[i] * r[j] for r in rows) + (1e-9 if i == j else 0.0)
+                for j in range(n)
+            ]
+            + [sum(r[i] * r[3] for r in rows)]
+            for i in range(n)
+        ]
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+            a[col], a[pivot] = a[pivot], a[col]
+            for r in range(n):
+                if r != col and a[col][col]:
+                    factor = a[r][col] / a[col][col]
+                    a[r] = [x - factor * y for x, y in zip(a[r], a[col])]
+        fixed, per_kib, per_commit = (
+            max(0.0, a[i][n] / a[i][i]) if a[i][i] else 0.0 for i in range(n)
+        )
+        return cls(fixed=fixed, per_kib=per_kib, per_commit=per_commit)
+
+
+class PathCommitIndex:
+    """Commits touching each path, counted in one ``git log`` walk.
+
+    Built once per repository (e.g. at the tip being mined) and shared by
+    every merge's collection; counts for older merges are overestimates,
+    which is fine for ranking. Read-only once built, so it can be shared
+    between threads.
+    """
+
+    def __init__(self, counts: Mapping[str, int]) -> None:
+        self._counts = dict(counts)
+
+    @classmethod
+    def build(cls, repo: Repo, rev: str = "HEAD") -> "PathCommitIndex":
+        return cls(_count_touches(repo, rev))
+
+    def get(self, path: str) -> int:
+        return self._counts.get(path, 0)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+def _count_touches(repo: Repo, rev: str, paths: Sequence[str] = ()) -> Counter[str]:
+    out = repo.git.log("--format=", "--name-only", "--no-renames", rev, "--", *paths)
+    return Counter(line for line in out.splitlines() if line)
+
+
+def blob_size(repo: Repo, revs: Sequence[str], path: str) -> int:
+    """Size of ``path`` at the first of ``revs`` that has it (0 if none)."""
+    for rev in revs:
+        try:
+            return int(repo.git.get_object_header(f"{rev}:{path}")[2])
+        except ValueError:
+            continue
+    return 0
+
+
+def estimate_costs(
+    repo: Repo,
+    paths: Sequence[str],
+    head_sha: str,
+    merge_sha: str,
+    *,
+    model: CostModel,
+    index: Optional[PathCommitIndex] = None,
+) -> dict[str, tuple[int, int, float]]:
+    """``path -> (blob_bytes, commits, estimated seconds)``."""
+    if index is None:
+        index = PathCommitIndex(_count_touches(repo, head_sha, paths))
+    estimates = {}
+    for path in paths:
+        size = blob_size(repo, (head_sha, merge_sha), path)
+        commits = index.get(path)
+        estimates[path] = (size, commits, model.estimate(size, commits))
+    return estimates
+
+
+__all__ = [
+    "CostModel",
+    "FileCost",
+    "PathCommitIndex",
+    "blob_size",
+    "estimate_costs",
+]
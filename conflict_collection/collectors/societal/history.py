@@ -0,0 +1,282 @@
+"""Social signals for many merges from a single history traversal.
+
+:func:`~conflict_collection.collectors.societal.collect` answers one merge at
+a time with several ``git log`` walks per file. Across a whole history those
+walks overlap almost entirely. :func:`collect_history` instead streams the
+commit graph once::
+
+    git log --topo-order --reverse -c --name-only <all ours/theirs commits>
+
+and, in that parents-first order, gives every commit touching a requested
+path a bit and every commit the set of such bits among its ancestors (a
+Python int, shared until a commit adds its own bit). Each signal then
+becomes a few bitwise operations:
+
+* last commit touching ``f`` from ``H``: newest touch of ``f`` in ``anc(H)``
+* owner commits on our side: ``anc(H) & ~anc(M) & touches(f) & by(author)``
+  (commits reachable from ``H`` but from no merge base are exactly those not
+  reachable from ``M``)
+* integrator priors: ``anc(H) & touches(f) & by(integrator)``, where
+  ``by(integrator)`` comes from one ``git log --author`` over the same tips,
+  so the pattern matches exactly as in :func:`collect`
+
+Results equal :func:`collect`'s except where a merge in the walked history
+resolved a path by keeping one side's version although the other side had
+changed it (or both sides made the same change). Git's default history
+simplification hides that other side from ``git log -- path``; this walk
+counts it.
+"""
+
+import codecs
+import enum
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Literal, Optional, Sequence, Union
+
+from git import GitCommandError, Repo
+
+from conflict_collection.collectors._repo import RepoLike, open_repo
+from conflict_collection.collectors.societal._git_ops import (
+    blame_aggregate,
+    integrator_name,
+)
+from conflict_collection.schema.social_signals import SocialSignalsRecord
+
+
+class _Default(enum.Enum):
+    USER_NAME = enum.auto()
+    """Use the repository's configured ``user.name``."""
+
+
+_HEADER_FIELDS = 6
+_FORMAT = "%x01%H%x00%P%x00%ct%x00%an%x00%ae%x00%aN"
+_READ_SIZE = 1 << 20
+
+
+@dataclass(frozen=True, slots=True)
+class MergeQuery:
+    """One merge to describe: its two sides and the files of interest."""
+
+    ours: str
+    """First parent (``HEAD`` during the merge)."""
+    theirs: str
+    """Second parent (``MERGE_HEAD`` during the merge)."""
+    files: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class _Touch:
+    """A commit that touches at least one requested path."""
+
+    committed: int
+    author: Optional[str]
+    """Identity as :func:`commit_author_str` reports it."""
+
+
+def _author_str(name: str, email: str) -> Optional[str]:
+    name, email = name.strip(), email.strip()
+    if name and name.lower() != "not committed yet":
+        return name
+    return email or None
+
+
+def _newest(candidates: int, order: Sequence[int]) -> int:
+    """Bit of the newest commit in ``candidates``; ``order`` is newest-first."""
+    for bit in order:
+        if candidates >> bit & 1:
+            return bit
+    raise AssertionError("candidates must be non-empty")
+
+
+def _log_records(repo: Repo, tips: Sequence[str]) -> Iterator[str]:
+    """``\\x01``-separated commit records of the history walk, streamed.
+
+    The output covers every commit reachable from ``tips`` with its paths,
+    so it is decoded block by block instead of read into one string.
+    """
+    proc = repo.git.log(
+        "--topo-order",
+        "--reverse",
+        "-c",
+        "--name-only",
+        "--no-renames",
+        "-z",
+        f"--format={_FORMAT}",
+        *tips,
+        "--",
+        as_process=True,
+    )
+    decoder = codecs.getincrementaldecoder("utf-8")("surrogateescape")
+    pending = ""
+    while block := proc.stdout.read(_READ_SIZE):
+        records = (pending + decoder.decode(block)).split("\x01")
+        pending = records.pop()
+        yield from (record for record in records if record)
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+    proc.wait()
+
+
+def _authored_by(repo: Repo, author: str, tips: Sequence[str]) -> set[str]:
+    """Commits reachable from ``tips`` that ``git log --author`` selects.
+
+    An invalid pattern selects nothing, as the per-file count of
+    :func:`collect` then reports 0.
+    """
+    try:
+        return set(
+            repo.git.log("--format=%H", f"--author={author}", *tips, "--").split()
+        )
+    except GitCommandError:
+        return set()
+
+
+def collect_history(
+    repo_path: RepoLike,
+    queries: Iterable[MergeQuery],
+    *,
+    blame: bool = True,
+    integrator: Union[Optional[str], Literal[_Default.USER_NAME]] = (
+        _Default.USER_NAME
+    ),
+) -> list[dict[str, SocialSignalsRecord]]:
+    """Social signals for many merges, walking the history once.
+
+    Args:
+        repo_path: Path to (or open ``git.Repo`` handle of) the repository.
+            No merge needs to be in progress.
+        queries: Merges to describe. ``ours`` / ``theirs`` may be any
+            revision names.
+        blame: Fill ``blame_table`` (one ``git blame`` per file and merge,
+            as :func:`collect` does). With ``False`` tables are left empty
+            and no per-file git call is made at all.
+        integrator: Identity for ``integrator_priors``: a ``git log
+            --author`` pattern, matched by git itself (a case-sensitive
+            basic regex search over the mailmapped ``Name <email>``), or
+            ``None`` for no priors. Defaults to the repository's configured
+            ``user.name``, like :func:`collect`.
+
+    Returns:
+        One ``{path: record}`` mapping per query, in query order. Files
+        with no commit on either side are skipped with an error log, as in
+        :func:`collect`.
+    """
+    repo = open_repo(repo_path)
+    queries = list(queries)
+    if not queries:
+        return []
+
+    names = sorted({q.ours for q in queries} | {q.theirs for q in queries})
+    # ``^{commit}`` peels annotated tags to the commits the walk reports.
+    peeled = repo.git.rev_parse(*(f"{name}^{{commit}}" for name in names))
+    resolved = dict(zip(names, peeled.split()))
+    tracked = {f for q in queries for f in q.files}
+    tips = set(resolved.values())
+    who = integrator_name(repo) if integrator is _Default.USER_NAME else integrator
+
+    entries = []
+    remaining_children: dict[str, int] = {}
+    for chunk in _log_records(repo, sorted(tips)):
+        fields = chunk.split("\0")
+        sha, parents, committed, an, ae, amap = fields[:_HEADER_FIELDS]
+        # Keep only the requested paths: the walk covers the whole history.
+        touched = {p.lstrip("\n") for p in fields[_HEADER_FIELDS:]} & tracked
+        parent_list = parents.split()
+        entries.append((sha, parent_list, int(committed), an, ae, amap, touched))
+        for parent in parent_list:
+            remaining_children[parent] = remaining_children.get(parent, 0) + 1
+
+    touches: list[_Touch] = []
+    path_bits: dict[str, int] = {f: 0 for f in tracked}
+    author_bits: dict[str, int] = {}
+    integrator_bits = 0
+    authored = _authored_by(repo, who, sorted(tips)) if who else set()
+
+    ancestors: dict[str, int] = {}
+    tip_ancestors: dict[str, int] = {}
+    tip_committed: dict[str, int] = {}
+    for sha, parent_list, committed, an, ae, amap, touched in entries:
+        bits = 0
+        for parent in parent_list:
+            bits |= ancestors.get(parent, 0)
+            remaining_children[parent] -= 1
+            if remaining_children[parent] == 0:
+                ancestors.pop(parent, None)
+
+        if touched:
+            bit = len(touches)
+            mask = 1 << bit
+            touches.append(_Touch(committed, _author_str(an, ae)))
+            for f in touched:
+                path_bits[f] |= mask
+            # Owner counts match %aN (mailmap-resolved), as the collector does.
+            key = amap.strip()
+            author_bits[key] = author_bits.get(key, 0) | mask
+            if sha in authored:
+                integrator_bits |= mask
+            bits |= mask
+
+        if remaining_children.get(sha, 0):
+            ancestors[sha] = bits
+        if sha in tips:
+            tip_ancestors[sha] = bits
+            tip_committed[sha] = committed
+
+    # Newest-first touches per path; ties go to the later commit in topo order.
+    newest_first: dict[str, list[int]] = {}
+    for f, mask in path_bits.items():
+        bits = [b for b in range(mask.bit_length()) if mask >> b & 1]
+        newest_first[f] = sorted(bits, key=lambda b: (touches[b].committed, b))[::-1]
+
+    results: list[dict[str, SocialSignalsRecord]] = []
+    for query in queries:
+        head_sha, merge_sha = resolved[query.ours], resolved[query.theirs]
+        anc_head, anc_merge = tip_ancestors[head_sha], tip_ancestors[merge_sha]
+        ref_ts = max(tip_committed[head_sha], tip_committed[merge_sha])
+        records: dict[str, SocialSignalsRecord] = {}
+        for f in query.files:
+            ours_cand = anc_head & path_bits[f]
+            theirs_cand = anc_merge & path_bits[f]
+            if not ours_cand or not theirs_cand:
+                side = head_sha if not ours_cand else merge_sha
+                logging.error(
+                    f"Last commit for {f} not found on {repo} "
+                    f"starting from commit hash {side}. "
+                    "Skipping file."
+                )
+                continue
+            ours = touches[_newest(ours_cand, newest_first[f])]
+            theirs = touches[_newest(theirs_cand, newest_first[f])]
+
+            blame_pairs = blame_aggregate(repo, head_sha, f) if blame else []
+            records[f] = SocialSignalsRecord.construct_trusted(
+                file=f,
+                ours_author=ours.author,
+                theirs_author=theirs.author,
+                owner_commits_ours=(
+                    anc_head
+                    & ~anc_merge
+                    & path_bits[f]
+                    & author_bits.get(ours.author, 0)
+                ).bit_count(),
+                owner_commits_theirs=(
+                    anc_merge
+                    & ~anc_head
+                    & path_bits[f]
+                    & author_bits.get(theirs.author, 0)
+                ).bit_count(),
+                age_days_ours=max(0, (ref_ts - ours.committed) // 86400),
+                age_days_theirs=max(0, (ref_ts - theirs.committed) // 86400),
+                resolver_prev_commits=(
+                    (anc_head & path_bits[f] & integrator_bits).bit_count()
+                    if who
+                    else 0
+                ),
+                blame_pairs=sorted(blame_pairs, key=lambda p: p[1], reverse=True),
+            )
+        results.append(records)
+    return results
+
+
+__all__ = ["MergeQuery", "collect_history"]
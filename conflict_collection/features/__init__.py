@@ -0,0 +1,21 @@
+from conflict_collection.features.matrix import (
+    DEFAULT_WINDOWS,
+    SOCIAL_COLUMNS,
+    AuthorVocabulary,
+    FeatureMatrix,
+    merge_features,
+    social_features,
+    time_feature_columns,
+)
+from conflict_collection.features.timeline import PathTimeline
+
+__all__ = [
+    "AuthorVocabulary",
+    "DEFAULT_WINDOWS",
+    "FeatureMatrix",
+    "PathTimeline",
+    "SOCIAL_COLUMNS",
+    "merge_features",
+    "social_features",
+    "time_feature_columns",
+]
@@ -0,0 +1,11 @@
+"""The optional NumPy dependency of the feature extraction stage."""
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on environment
+    raise ImportError(
+        "feature extraction requires the 'numpy' package: "
+        "pip install conflict_collection[features]"
+    ) from e
+
+__all__ = ["np"]
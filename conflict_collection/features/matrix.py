@@ -0,0 +1,324 @@
+"""Dense feature matrices of conflicted files for model training.
+
+:func:`social_features` turns collected :class:`SocialSignalsRecord` rows
+into a matrix by reading the columns of a :class:`SocialSignalsTable`
+directly, so whole corpora convert without a Python loop per record.
+:func:`merge_features` adds time features of an in-progress merge: commit
+counts in sliding windows, ages and inter-commit gaps per side, from one
+:class:`~conflict_collection.features.timeline.PathTimeline` walk per side
+instead of extra per-file git calls.
+
+Blame tables are encoded against an :class:`AuthorVocabulary` as a second
+matrix of lines per author, so matrices of different merges share columns.
+Missing values are ``NaN``.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional, Sequence, Union
+
+from conflict_collection.collectors._repo import RepoLike, open_repo
+from conflict_collection.collectors.societal._git_ops import (
+    commit_epoch,
+    conflicted_files,
+    rev_parse,
+)
+from conflict_collection.features._numpy import np
+from conflict_collection.features.timeline import PathTimeline
+from conflict_collection.schema.social_signals import (
+    SocialSignalsRecord,
+    SocialSignalsTable,
+)
+
+DEFAULT_WINDOWS = (7, 30, 90, 365)
+"""Sliding window lengths, in days, of the windowed commit counts."""
+
+SOCIAL_COLUMNS = (
+    "owner_commits_ours",
+    "owner_commits_theirs",
+    "age_days_ours",
+    "age_days_theirs",
+    "resolver_prev_commits",
+    "blame_total_lines",
+    "blame_authors",
+    "blame_top_share",
+    "blame_other_lines",
+)
+"""Columns of :func:`social_features`, in order."""
+
+_BLAME_COLUMNS = slice(SOCIAL_COLUMNS.index("blame_total_lines"), None)
+
+Records = Union[SocialSignalsTable, Iterable[SocialSignalsRecord]]
+
+
+def _table(records: Records) -> SocialSignalsTable:
+    if isinstance(records, SocialSignalsTable):
+        return records
+    return SocialSignalsTable.from_records(records)
+
+
+class AuthorVocabulary:
+    """Author -> blame matrix column, fixed across merges.
+
+    Args:
+        authors: Authors in column order; duplicates are ignored.
+    """
+
+    def __init__(self, authors: Iterable[str]) -> None:
+        self.authors: list[str] = list(dict.fromkeys(authors))
+        self.index = {author: i for i, author in enumerate(self.authors)}
+
+    @classmethod
+    def fit(
+        cls, records: Records, *, max_size: Optional[int] = None, min_lines: int = 1
+    ) -> "AuthorVocabulary":
+        """Authors by total blamed lines, most first (ties by name).
+
+        Args:
+            records: Records (or a table) to count blame lines in.
+            max_size: Keep at most this many authors.
+            min_lines: Drop authors with fewer blamed lines in total.
+        """
+        table = _table(records)
+        ids: dict[str, int] = {}
+        inverse = np.fromiter(
+            (ids.setdefault(author, len(ids)) for author in table.blame_authors),
+            dtype=np.int64,
+            count=len(table.blame_authors),
+        )
+        totals = np.bincount(
+            inverse,
+            weights=np.frombuffer(table.blame_lines, dtype=np.int64),
+            minlength=len(ids),
+        )
+        names = np.asarray(list(ids), dtype=str)
+        order = np.lexsort((names, -totals))
+        order = order[totals[order] >= min_lines][:max_size]
+        return cls(names[order].tolist())
+
+    def __len__(self) -> int:
+        return len(self.authors)
+
+    def __contains__(self, author: object) -> bool:
+        return author in self.index
+
+    def encode(self, authors: Sequence[str]):
+        """Column of each author, ``-1`` for authors not in the vocabulary."""
+        get = self.index.get
+        return np.fromiter(
+            (get(author, -1) for author in authors), dtype=np.int64, count=len(authors)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FeatureMatrix:
+    """Features of conflicted files: one row per file."""
+
+    files: list[str]
+    columns: list[str]
+    values: "np.ndarray"
+    """``float64``, shape ``(len(files), len(columns))``; ``NaN`` if missing."""
+    authors: list[str]
+    """Vocabulary of the blame matrix columns."""
+    blame: "np.ndarray"
+    """Blamed lines per author, shape ``(len(files), len(authors))``; a row
+    is ``NaN`` where the blame table was not collected."""
+
+    def column(self, name: str):
+        """One feature column."""
+        return self.values[:, self.columns.index(name)]
+
+    def join(self, other: "FeatureMatrix") -> "FeatureMatrix":
+        """Columns of both; rows must be the same files.
+
+        The blame matrix is taken from whichever side has authors.
+        """
+        if self.files != other.files:
+            raise ValueError("feature matrices describe different files")
+        blame, authors = (
+            (self.blame, self.authors) if self.authors else (other.blame, other.authors)
+        )
+        return FeatureMatrix(
+            files=self.files,
+            columns=self.columns + other.columns,
+            values=np.hstack((self.values, other.values)),
+            authors=authors,
+            blame=blame,
+        )
+
+
+def social_features(
+    records: Records, *, vocabulary: Optional[AuthorVocabulary] = None
+) -> FeatureMatrix:
+    """Feature matrix of collected social signals (see :data:`SOCIAL_COLUMNS`).
+
+    Args:
+        records: Records, or a :class:`SocialSignalsTable` of them.
+        vocabulary: Blame matrix columns; fitted on ``records`` if omitted.
+            Lines of authors outside it are summed in ``blame_other_lines``.
+    """
+    table = _table(records)
+    if vocabulary is None:
+        vocabulary = AuthorVocabulary.fit(table)
+    n = len(table)
+    nulls = [(i, names) for i, names in enumerate(table.nulls) if names]
+
+    def ints(name: str):
+        column = np.frombuffer(getattr(table, name), dtype=np.int64).astype(float)
+        for i, names in nulls:
+            if name in names:
+                column[i] = np.nan
+        return column
+
+    def optional(values: Sequence[Optional[int]]):
+        return np.array(values, dtype=float).reshape(n)
+
+    offsets = np.frombuffer(table.blame_offsets, dtype=np.int64)
+    lines = np.frombuffer(table.blame_lines, dtype=np.int64)
+    sizes = np.diff(offsets)
+    rows = np.repeat(np.arange(n), sizes)
+    codes = vocabulary.encode(table.blame_authors)
+    known = codes >= 0
+
+    width = len(vocabulary)
+    blame = np.bincount(
+        rows[known] * width + codes[known], weights=lines[known], minlength=n * width
+    ).reshape(n, width)
+    totals = np.bincount(rows, weights=lines, minlength=n)
+    other = np.bincount(rows[~known], weights=lines[~known], minlength=n)
+    top = np.zeros(n)
+    blamed = sizes > 0
+    if blamed.any():
+        # Empty tables are skipped, so each reduced span is exactly one table.
+        top[blamed] = np.maximum.reduceat(lines, offsets[:-1][blamed])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        top_share = np.where(totals > 0, top / totals, np.nan)
+
+    values = np.column_stack(
+        (
+            ints("owner_commits_ours"),
+            ints("owner_commits_theirs"),
+            optional(table.age_days_ours),
+            optional(table.age_days_theirs),
+            ints("resolver_prev_commits"),
+            totals,
+            sizes.astype(float),
+            top_share,
+            other,
+        )
+    ).reshape(n, len(SOCIAL_COLUMNS))
+    unblamed = [i for i, names in nulls if "blame_table" in names]
+    if unblamed:
+        blame[unblamed] = np.nan
+        values[unblamed, _BLAME_COLUMNS] = np.nan
+    return FeatureMatrix(
+        files=list(table.file),
+        columns=list(SOCIAL_COLUMNS),
+        values=values,
+        authors=list(vocabulary.authors),
+        blame=blame,
+    )
+
+
+def time_feature_columns(windows: Sequence[int] = DEFAULT_WINDOWS) -> list[str]:
+    """Columns of the time features :func:`merge_features` computes."""
+    return [
+        f"{name}_{side}"
+        for side in ("ours", "theirs")
+        for name in (
+            "commits",
+            *(f"commits_{w}d" for w in windows),
+            "commit_age_days",
+            "mean_gap_days",
+            "last_gap_days",
+        )
+    ]
+
+
+def merge_features(
+    repo_path: RepoLike = ".",
+    files: Optional[Iterable[str]] = None,
+    *,
+    records: Optional[Union[Records, Mapping[str, SocialSignalsRecord]]] = None,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    vocabulary: Optional[AuthorVocabulary] = None,
+) -> FeatureMatrix:
+    """Feature matrix of the files of an in-progress merge.
+
+    Per side (``HEAD`` and ``MERGE_HEAD``), each file's commit timestamps are
+    loaded in one ``git log`` walk over all files, then vectorized into:
+    total commits, commits within each of ``windows`` days before the merge,
+    days since the newest commit, and mean / most recent inter-commit gap in
+    days. Times are relative to the newer of the two side commits, as in the
+    societal collector.
+
+    Args:
+        repo_path: Path to (or open ``git.Repo`` handle of) the repository.
+        files: Repo-relative paths; defaults to the conflicted files.
+        records: Social signals of those files (e.g. the societal
+            collector's result); their :func:`social_features` columns and
+            blame matrix are appended. Rows follow ``files``; with a
+            mapping, files missing from it get ``NaN`` social and blame rows
+            (e.g. files the collector skipped).
+        windows: Window lengths in days.
+        vocabulary: Passed to :func:`social_features`.
+    """
+    repo = open_repo(repo_path)
+    file_list = list(files) if files is not None else conflicted_files(repo)
+    head_sha = rev_parse(repo, "HEAD")
+    merge_sha = rev_parse(repo, "MERGE_HEAD")
+    ref_ts = max(commit_epoch(repo, head_sha), commit_epoch(repo, merge_sha))
+
+    blocks = []
+    for sha in (head_sha, merge_sha):
+        timeline = PathTimeline.load(repo, sha, file_list)
+        blocks.extend(
+            (
+                timeline.counts[:, None].astype(float),
+                timeline.window_counts(ref_ts, windows).astype(float),
+                timeline.age_days(ref_ts)[:, None],
+                timeline.mean_gap_days()[:, None],
+                timeline.last_gap_days()[:, None],
+            )
+        )
+    columns = time_feature_columns(windows)
+    matrix = FeatureMatrix(
+        files=file_list,
+        columns=columns,
+        values=np.hstack(blocks).reshape(len(file_list), len(columns)),
+        authors=[],
+        blame=np.zeros((len(file_list), 0)),
+    )
+    if records is None:
+        return matrix
+
+    if not isinstance(records, Mapping):
+        return matrix.join(social_features(records, vocabulary=vocabulary))
+
+    present = [i for i, f in enumerate(file_list) if f in records]
+    social = social_features(
+        [records[file_list[i]] for i in present], vocabulary=vocabulary
+    )
+    values = np.full((len(file_list), len(social.columns)), np.nan)
+    values[present] = social.values
+    blame = np.full((len(file_list), len(social.authors)), np.nan)
+    blame[present] = social.blame
+    return matrix.join(
+        FeatureMatrix(
+            files=file_list,
+            columns=social.columns,
+            values=values,
+            authors=social.authors,
+            blame=blame,
+        )
+    )
+
+
+__all__ = [
+    "AuthorVocabulary",
+    "DEFAULT_WINDOWS",
+    "FeatureMatrix",
+    "SOCIAL_COLUMNS",
+    "merge_features",
+    "social_features",
+    "time_feature_columns",
+]
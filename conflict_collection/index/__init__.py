@@ -0,0 +1,91 @@
+"""Fingerprint stores and near-duplicate / nearest-resolution indexes.
+
+Exports are resolved lazily, like the top-level package, so the collectors
+can use :mod:`~conflict_collection.index.fingerprints` without loading the
+MinHash and nearest-neighbour indexes (and the metric's dependencies).
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .fingerprints import (
+        FingerprintStore,
+        MemoryFingerprintStore,
+        SQLiteFingerprintStore,
+        conflict_fingerprint,
+        merge_result_fingerprint,
+        social_fingerprint,
+    )
+    from .minhash import (
+        LSHIndex,
+        MinHasher,
+        case_shingles,
+        case_similarity,
+        dedupe_cases,
+        estimated_jaccard,
+    )
+    from .nearest import Neighbor, ResolutionIndex, SearchResult, brute_force_top_k
+
+_LAZY_EXPORTS = {
+    **{
+        name: ".fingerprints"
+        for name in (
+            "FingerprintStore",
+            "MemoryFingerprintStore",
+            "SQLiteFingerprintStore",
+            "conflict_fingerprint",
+            "merge_result_fingerprint",
+            "social_fingerprint",
+        )
+    },
+    **{
+        name: ".minhash"
+        for name in (
+            "LSHIndex",
+            "MinHasher",
+            "case_shingles",
+            "case_similarity",
+            "dedupe_cases",
+            "estimated_jaccard",
+        )
+    },
+    **{
+        name: ".nearest"
+        for name in ("Neighbor", "ResolutionIndex", "SearchResult", "brute_force_top_k")
+    },
+}
+"""Public name -> relative module defining it."""
+
+__all__ = [
+    "FingerprintStore",
+    "MemoryFingerprintStore",
+    "SQLiteFingerprintStore",
+    "conflict_fingerprint",
+    "merge_result_fingerprint",
+    "social_fingerprint",
+    "LSHIndex",
+    "MinHasher",
+    "case_shingles",
+    "case_similarity",
+    "dedupe_cases",
+    "estimated_jaccard",
+    "Neighbor",
+    "ResolutionIndex",
+    "SearchResult",
+    "brute_force_top_k",
+]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
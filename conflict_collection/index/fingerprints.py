@@ -0,0 +1,176 @@
+"""Exact fingerprints of conflicts and stores for skipping repeated work.
+
+Forks and mirrors reproduce the same conflict (identical base / ours /
+theirs blobs) many times. The collectors accept a :class:`FingerprintStore`
+to recognise such repeats before doing any expensive git work:
+
+* The conflict type collector skips a family whose
+  :func:`conflict_fingerprint` (stage blob shas) is already in the store.
+  Skipped families are omitted from the result; the store does not keep
+  their cases.
+* The societal collector reuses a stored record keyed by
+  :func:`social_fingerprint`. Social signals depend on history rather than
+  on blobs, so that key uses the commits being merged. Forks and mirrors
+  share commit shas and still hit.
+
+Both collectors also accept a store as a whole-merge result ``cache``,
+keyed by :func:`merge_result_fingerprint`: a repeat call on the same merge
+with the same options is answered by a single store read.
+
+Stores map a key to a small JSON object and are safe to share between
+threads. Use :class:`MemoryFingerprintStore` within one process and
+:class:`SQLiteFingerprintStore` across runs or processes.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Mapping, Optional, Protocol, Union
+
+
+def conflict_fingerprint(
+    base_sha: Optional[str], ours_sha: Optional[str], theirs_sha: Optional[str]
+) -> str:
+    """Key of a conflict by its stage 1/2/3 blob shas (``None`` = stage absent).
+
+    Paths are deliberately excluded: a renamed copy of the same conflict is
+    still the same conflict.
+    """
+    payload = "\0".join(
+        ("conflict", base_sha or "-", ours_sha or "-", theirs_sha or "-")
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def social_fingerprint(
+    head_sha: str, merge_sha: str, path: str, integrator: Optional[str]
+) -> str:
+    """Key of a :class:`SocialSignalsRecord`, which is fully determined by these."""
+    payload = "\0".join(("social", head_sha, merge_sha, path, integrator or ""))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def merge_result_fingerprint(
+    collector: str,
+    head_sha: str,
+    merge_sha: str,
+    resolution_sha: Optional[str],
+    options: Mapping[str, Any],
+) -> str:
+    """Key of one collector's whole result for a merge.
+
+    Args:
+        collector: Collector name; results of different collectors never
+            share a key.
+        head_sha: Full sha of ``HEAD`` during the merge.
+        merge_sha: Full sha of ``MERGE_HEAD``.
+        resolution_sha: Full sha of the resolution, if the collector reads it.
+        options: JSON-compatible options that change the result.
+    """
+    payload = json.dumps(
+        ["result", collector, head_sha, merge_sha, resolution_sha, dict(options)],
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class FingerprintStore(Protocol):
+    """Key -> JSON object mapping used by the collectors."""
+
+    def get(self, key: str) -> Optional[dict[str, Any]]: ...
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None: ...
+
+    def __contains__(self, key: object) -> bool: ...
+
+
+class MemoryFingerprintStore:
+    """In-process :class:`FingerprintStore`."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self._data.get(key)
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = dict(value)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteFingerprintStore:
+    """Persistent :class:`FingerprintStore` in a SQLite file.
+
+    One connection is shared by all threads behind a lock. Every
+    :meth:`put` is committed immediately, so several processes can share
+    the file (SQLite serialises the writers).
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=60
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM fingerprints WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        payload = json.dumps(dict(value), ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (key, value) VALUES (?, ?)",
+                (key, payload),
+            )
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM fingerprints WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = [
+    "FingerprintStore",
+    "MemoryFingerprintStore",
+    "SQLiteFingerprintStore",
+    "conflict_fingerprint",
+    "merge_result_fingerprint",
+    "social_fingerprint",
+]
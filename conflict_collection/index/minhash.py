@@ -0,0 +1,294 @@
+"""MinHash sketches and LSH banding for near-duplicate conflict detection.
+
+Corpora built from forks and mirrors contain the same conflict many times with
+tiny differences. Comparing every pair with :func:`anchored_ratio` is
+quadratic; instead each case is reduced to a fixed-size MinHash signature over
+shingled lines of its base / ours / theirs / conflict body, and an LSH index
+retrieves only the cases sharing at least one signature band. The exact
+(and expensive) comparison then runs on those candidate pairs only.
+
+Typical usage::
+
+    unique = list(dedupe_cases(cases, threshold=0.9))
+"""
+
+import hashlib
+import random
+from collections import OrderedDict
+from typing import Hashable, Iterable, Iterator, Optional, Sequence
+
+from conflict_collection.metrics.anchored_ratio import anchored_ratio
+from conflict_collection.schema.typed_five_tuple import ConflictCase
+
+SHINGLE_FIELDS = ("base_content", "ours_content", "theirs_content", "conflict_body")
+"""Case fields contributing shingles to a signature."""
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = _MERSENNE_PRIME - 1
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def line_shingles(text: Optional[str], k: int = 3, *, tag: str = "") -> set[int]:
+    """Hash every window of ``k`` consecutive non-blank lines of ``text``.
+
+    Texts shorter than ``k`` lines yield a single shingle of all their lines.
+    ``tag`` is mixed into each hash so identical lines in different fields
+    (e.g. ours vs theirs) do not collide.
+
+    Args:
+        text: Text to shingle; ``None`` yields no shingles.
+        k: Window size in lines.
+        tag: Namespace prefix for the shingles.
+
+    Returns:
+        Set of 64-bit shingle hashes.
+    """
+    if k <= 0:
+        raise ValueError(f"k must be positive, got {k}")
+    if text is None:
+        return set()
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return set()
+    prefix = tag.encode("utf-8") + b"\x00"
+    windows = max(1, len(lines) - k + 1)
+    return {
+        _hash64(prefix + "\n".join(lines[i : i + k]).encode("utf-8", "surrogatepass"))
+        for i in range(windows)
+    }
+
+
+def case_shingles(case: ConflictCase, k: int = 3) -> set[int]:
+    """Field-tagged line shingles of a conflict case (see :data:`SHINGLE_FIELDS`)."""
+    shingles: set[int] = set()
+    for field in SHINGLE_FIELDS:
+        shingles |= line_shingles(getattr(case, field), k, tag=field)
+    return shingles
+
+
+class MinHasher:
+    """Seeded family of ``num_perm`` universal hash functions for MinHash.
+
+    Signatures from hashers with equal ``num_perm`` and ``seed`` are
+    comparable across processes and runs.
+
+    Args:
+        num_perm: Signature length (number of hash permutations).
+        seed: Seed for drawing the permutation coefficients.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1) -> None:
+        if num_perm <= 0:
+            raise ValueError(f"num_perm must be positive, got {num_perm}")
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.seed = seed
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Iterable[int]) -> tuple[int, ...]:
+        """MinHash signature of a shingle set (all-max for the empty set)."""
+        values = [h % _MERSENNE_PRIME for h in set(shingles)]
+        if not values:
+            return (_MAX_HASH,) * self.num_perm
+        prime = _MERSENNE_PRIME
+        return tuple(min((a * v + b) % prime for v in values) for a, b in self._params)
+
+
+def estimated_jaccard(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """Estimate Jaccard similarity of two shingle sets from their signatures."""
+    if len(sig_a) != len(sig_b):
+        raise ValueError("Signatures must have the same length")
+    if not sig_a:
+        return 1.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class LSHIndex:
+    """Banded locality-sensitive hashing index over MinHash signatures.
+
+    A signature of length ``num_perm`` is cut into ``bands`` bands of
+    ``num_perm // bands`` rows; two entries become candidates when any band
+    matches exactly. The pairs likely to be retrieved have Jaccard similarity
+    above roughly ``(1 / bands) ** (bands / num_perm)``.
+
+    Args:
+        num_perm: Expected signature length.
+        bands: Number of bands; must divide ``num_perm``.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32) -> None:
+        if bands <= 0 or num_perm % bands != 0:
+            raise ValueError(
+                f"bands ({bands}) must be a positive divisor of num_perm ({num_perm})"
+            )
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: list[dict[tuple[int, ...], set[Hashable]]] = [
+            {} for _ in range(bands)
+        ]
+        self._signatures: dict[Hashable, tuple[int, ...]] = {}
+
+    def _band_keys(self, signature: Sequence[int]) -> Iterator[tuple[int, ...]]:
+        if len(signature) != self.num_perm:
+            raise ValueError(
+                f"Expected a signature of length {self.num_perm}, got {len(signature)}"
+            )
+        for band in range(self.bands):
+            yield tuple(signature[band * self.rows : (band + 1) * self.rows])
+
+    def add(self, key: Hashable, signature: Sequence[int]) -> None:
+        """Index ``signature`` under ``key`` (replacing any previous entry)."""
+        if key in self._signatures:
+            self.remove(key)
+        signature = tuple(signature)
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, set()).add(key)
+        self._signatures[key] = signature
+
+    def remove(self, key: Hashable) -> None:
+        """Drop ``key`` from the index. Raises ``KeyError`` if absent."""
+        signature = self._signatures.pop(key)
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            members = bucket[band_key]
+            members.discard(key)
+            if not members:
+                del bucket[band_key]
+
+    def candidates(self, signature: Sequence[int]) -> set[Hashable]:
+        """Keys sharing at least one band with ``signature``."""
+        found: set[Hashable] = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            found |= bucket.get(band_key, set())
+        return found
+
+    def signature_of(self, key: Hashable) -> tuple[int, ...]:
+        """Signature stored under ``key``."""
+        return self._signatures[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+def case_similarity(
+    x: ConflictCase, y: ConflictCase, *, use_line_levenshtein: bool = False
+) -> float:
+    """Exact similarity of two conflict cases in [0,1].
+
+    Cases of different ``conflict_type`` score 0. Otherwise the score is the
+    minimum of three anchored ratios: the bases against each other, and each
+    side's edit (ours, theirs) anchored on ``x``'s base. Missing contents
+    count as empty texts.
+    """
+    if x.conflict_type != y.conflict_type:
+        return 0.0
+    base = x.base_content or ""
+    scores = (
+        anchored_ratio(
+            "",
+            base,
+            y.base_content or "",
+            use_line_levenshtein=use_line_levenshtein,
+        ),
+        anchored_ratio(
+            base,
+            x.ours_content or "",
+            y.ours_content or "",
+            use_line_levenshtein=use_line_levenshtein,
+        ),
+        anchored_ratio(
+            base,
+            x.theirs_content or "",
+            y.theirs_content or "",
+            use_line_levenshtein=use_line_levenshtein,
+        ),
+    )
+    return min(scores)
+
+
+def dedupe_cases(
+    cases: Iterable[ConflictCase],
+    *,
+    threshold: float = 0.9,
+    num_perm: int = 128,
+    bands: int = 32,
+    shingle_size: int = 3,
+    max_resident: int = 10_000,
+    use_line_levenshtein: bool = False,
+    seed: int = 1,
+) -> Iterator[ConflictCase]:
+    """Lazily drop near-duplicate cases from a stream.
+
+    Each incoming case is sketched and looked up in an LSH index of the
+    representatives kept so far; :func:`case_similarity` runs only against
+    those candidates. A case scoring at least ``threshold`` against any
+    candidate is dropped, otherwise it is yielded and becomes a
+    representative.
+
+    Memory is bounded by ``max_resident``: once exceeded, the least recently
+    matched representative is evicted, so duplicates far apart in the stream
+    may both be kept.
+
+    Args:
+        cases: Stream of conflict cases.
+        threshold: Minimum :func:`case_similarity` for a duplicate.
+        num_perm: MinHash signature length.
+        bands: LSH bands (must divide ``num_perm``).
+        shingle_size: Lines per shingle.
+        max_resident: Maximum representatives held in memory.
+        use_line_levenshtein: Passed through to :func:`case_similarity`.
+        seed: MinHash permutation seed.
+
+    Yields:
+        Cases that are not near-duplicates of a resident representative.
+    """
+    if max_resident <= 0:
+        raise ValueError(f"max_resident must be positive, got {max_resident}")
+
+    hasher = MinHasher(num_perm=num_perm, seed=seed)
+    index = LSHIndex(num_perm=num_perm, bands=bands)
+    resident: "OrderedDict[int, ConflictCase]" = OrderedDict()
+
+    for position, case in enumerate(cases):
+        signature = hasher.signature(case_shingles(case, shingle_size))
+
+        duplicate_of = None
+        for key in sorted(index.candidates(signature)):
+            similarity = case_similarity(
+                resident[key], case, use_line_levenshtein=use_line_levenshtein
+            )
+            if similarity >= threshold:
+                duplicate_of = key
+                break
+
+        if duplicate_of is not None:
+            resident.move_to_end(duplicate_of)
+            continue
+
+        resident[position] = case
+        index.add(position, signature)
+        if len(resident) > max_resident:
+            evicted, _ = resident.popitem(last=False)
+            index.remove(evicted)
+        yield case
+
+
+__all__ = [
+    "LSHIndex",
+    "MinHasher",
+    "SHINGLE_FIELDS",
+    "case_shingles",
+    "case_similarity",
+    "dedupe_cases",
+    "estimated_jaccard",
+    "line_shingles",
+]
@@ -0,0 +1,298 @@
+"""Exact top-k nearest-resolution search under :func:`anchored_ratio`.
+
+For retrieval-augmented resolution we need the stored resolutions ``R_i``
+maximising ``anchored_ratio(O, R_i, R_hat)`` for a query base ``O`` and a
+candidate ``R_hat``. Scoring every stored resolution is too slow, so
+:class:`ResolutionIndex` first computes a cheap upper bound on each score and
+runs the full metric only while a bound can still beat the current k-th best.
+Results are identical to a brute-force scan (ties broken by insertion order).
+
+Upper bound
+-----------
+Write the metric as ``N / D``. Everything about ``R_hat`` is known exactly
+from its opcodes against ``O``: ``T`` lines it changed or inserted, ``d`` base
+lines it deleted/compressed (``D_hat = d + T`` is its own denominator share),
+and the multiset ``K`` of base lines it kept. For a stored ``R`` only line
+multisets are used:
+
+* ``D >= max(D_hat + m, nov(R), gone(R))``, where ``m`` counts base lines
+  changed by ``R`` but kept by ``R_hat`` and ``nov`` / ``gone`` are lines
+  ``R`` must have added / removed relative to ``O``.
+* ``N <= d + ov_c + min(m, ov_k)``: mutual deletes need ``R_hat`` deletes;
+  aligned pairs either use one of ``R_hat``'s changed lines (``ov_c`` is the
+  multiset overlap of ``R`` with those) or one of its kept lines inside ``R``'s
+  changes (at most ``m``, and at most ``ov_k``, the overlap of ``R`` with
+  ``K``). With Levenshtein credit overlaps are replaced by plain line counts.
+
+The ratio is non-decreasing in ``m`` up to ``ov_k``, so the bound takes
+``m = min(ov_k, |K|)``. Pruning is strongest with
+``use_line_levenshtein=False``.
+"""
+
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from typing import Hashable, Optional, Sequence
+
+from conflict_collection.metrics.anchored_ratio import (
+    OpcodeCache,
+    PreparedText,
+    TextLike,
+    anchored_ratio,
+    prepare,
+)
+from conflict_collection.metrics.anchored_ratio.anchored_ratio import (
+    _opcodes_and_insertions,
+)
+
+_BOUND_SLACK = 1e-9
+"""Tolerance keeping float rounding in the exact score from defeating a bound."""
+
+
+@dataclass(frozen=True, slots=True)
+class Neighbor:
+    """One search hit."""
+
+    key: Hashable
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """Hits of a :meth:`ResolutionIndex.search` plus pruning statistics."""
+
+    neighbors: list[Neighbor]
+    evaluated: int
+    """Stored resolutions scored with the full metric."""
+    pruned: int
+    """Stored resolutions skipped because their bound could not reach the top-k."""
+
+
+class _Query:
+    """Per-query quantities derived from the candidate's opcodes against the base."""
+
+    def __init__(self, base: PreparedText, candidate: PreparedText, cache: OpcodeCache):
+        # Goes through the cache so exact scoring reuses these opcodes.
+        opcodes, _ = _opcodes_and_insertions(base, candidate, cache)
+
+        lines = candidate.lines
+        self.changed: Counter[str] = Counter()
+        self.kept: Counter[str] = Counter()
+        self.deleted = 0
+        for tag, b_start, b_end, t_start, t_end in opcodes:
+            if tag == "equal":
+                self.kept.update(base.lines[b_start:b_end])
+                continue
+            self.changed.update(lines[t_start:t_end])
+            if tag == "delete":
+                self.deleted += b_end - b_start
+            elif tag == "replace":
+                base_len = b_end - b_start
+                target_len = t_end - t_start
+                for i in range(base_len):
+                    piece = ((i + 1) * target_len) // base_len - (
+                        i * target_len
+                    ) // base_len
+                    if piece == 0:
+                        self.deleted += 1
+
+        self.base_counts = Counter(base.lines)
+        self.base_len = len(base.lines)
+        self.changed_total = sum(self.changed.values())
+        self.kept_total = sum(self.kept.values())
+        self.own_denominator = self.deleted + self.changed_total
+
+
+class ResolutionIndex:
+    """In-memory index of resolutions for exact top-k anchored search.
+
+    Besides the prepared texts, the index keeps each resolution's line
+    multiset and an inverted index from line to ``(entry, count)`` postings,
+    so multiset overlaps with a query touch only entries sharing lines with it.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list[Hashable] = []
+        self._texts: list[PreparedText] = []
+        self._positions: dict[Hashable, int] = {}
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+
+    def add(self, key: Hashable, resolution: TextLike) -> None:
+        """Store ``resolution`` under a new, unique ``key``."""
+        if key in self._positions:
+            raise ValueError(f"Key already indexed: {key!r}")
+        prepared = prepare(resolution)
+        position = len(self._keys)
+        self._keys.append(key)
+        self._texts.append(prepared)
+        self._positions[key] = position
+        for line, count in Counter(prepared.lines).items():
+            self._postings.setdefault(line, []).append((position, count))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def _overlaps(self, counts: Counter[str]) -> list[int]:
+        """Per-entry multiset overlap ``sum(min(counts[l], entry[l]))``."""
+        overlap = [0] * len(self._keys)
+        for line, wanted in counts.items():
+            for position, count in self._postings.get(line, ()):
+                overlap[position] += min(wanted, count)
+        return overlap
+
+    def upper_bounds(
+        self,
+        base: TextLike,
+        candidate: TextLike,
+        *,
+        use_line_levenshtein: bool = True,
+        cache: Optional[OpcodeCache] = None,
+    ) -> list[float]:
+        """Upper bound of ``anchored_ratio(base, R_i, candidate)`` per entry, in insertion order."""
+        if cache is None:
+            cache = OpcodeCache(maxsize=2)
+        query = _Query(prepare(base), prepare(candidate), cache)
+        return self._upper_bounds(query, use_line_levenshtein)
+
+    def _upper_bounds(self, query: _Query, use_line_levenshtein: bool) -> list[float]:
+        common = self._overlaps(query.base_counts)
+        if not use_line_levenshtein:
+            changed_overlap = self._overlaps(query.changed)
+            kept_overlap = self._overlaps(query.kept)
+
+        bounds: list[float] = []
+        for position, text in enumerate(self._texts):
+            length = len(text.lines)
+            added = length - common[position]
+            removed = query.base_len - common[position]
+            if use_line_levenshtein:
+                ov_c = min(query.changed_total, length)
+                ov_k = length
+            else:
+                ov_c = changed_overlap[position]
+                ov_k = kept_overlap[position]
+            m = min(ov_k, query.kept_total)
+
+            denominator = max(query.own_denominator + m, added, removed)
+            if denominator == 0:
+                bounds.append(1.0)
+                continue
+            numerator = query.deleted + ov_c + m
+            bounds.append(min(1.0, numerator / denominator))
+        return bounds
+
+    def search(
+        self,
+        base: TextLike,
+        candidate: TextLike,
+        k: int,
+        *,
+        use_line_levenshtein: bool = True,
+        cache: Optional[OpcodeCache] = None,
+    ) -> SearchResult:
+        """Exact top-``k`` entries by ``anchored_ratio(base, R_i, candidate)``.
+
+        Entries are visited in decreasing bound order and scored exactly until
+        the next bound cannot reach the k-th best score.
+
+        Args:
+            base: Common base ``O`` of the query.
+            candidate: Candidate resolution ``R_hat``.
+            k: Number of neighbours to return.
+            use_line_levenshtein: Passed through to :func:`anchored_ratio`.
+            cache: Optional opcode cache; a small private one is used otherwise
+                so base-vs-candidate opcodes are computed once per query.
+
+        Returns:
+            A :class:`SearchResult` with neighbours sorted by descending score,
+            ties broken by insertion order.
+        """
+        if k <= 0 or not self._keys:
+            return SearchResult(neighbors=[], evaluated=0, pruned=len(self._keys))
+
+        base_prepared = prepare(base)
+        candidate_prepared = prepare(candidate)
+        if cache is None:
+            cache = OpcodeCache(maxsize=2)
+        query = _Query(base_prepared, candidate_prepared, cache)
+        bounds = self._upper_bounds(query, use_line_levenshtein)
+
+        frontier = [(-bound, position) for position, bound in enumerate(bounds)]
+        heapq.heapify(frontier)
+
+        # Min-heap of the best k so far; the root is the current k-th best.
+        # (score, -position) orders later insertions as worse on equal scores.
+        best: list[tuple[float, int]] = []
+        evaluated = 0
+        while frontier:
+            negative_bound, position = frontier[0]
+            if len(best) == k and -negative_bound + _BOUND_SLACK < best[0][0]:
+                break
+            heapq.heappop(frontier)
+            score = anchored_ratio(
+                base_prepared,
+                self._texts[position],
+                candidate_prepared,
+                use_line_levenshtein=use_line_levenshtein,
+                cache=cache,
+            )
+            evaluated += 1
+            item = (score, -position)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+        ranked = sorted(best, key=lambda item: (-item[0], -item[1]))
+        return SearchResult(
+            neighbors=[Neighbor(self._keys[-neg], score) for score, neg in ranked],
+            evaluated=evaluated,
+            pruned=len(self._keys) - evaluated,
+        )
+
+    def top_k(
+        self,
+        base: TextLike,
+        candidate: TextLike,
+        k: int,
+        *,
+        use_line_levenshtein: bool = True,
+        cache: Optional[OpcodeCache] = None,
+    ) -> list[Neighbor]:
+        """Shorthand for ``search(...).neighbors``."""
+        return self.search(
+            base,
+            candidate,
+            k,
+            use_line_levenshtein=use_line_levenshtein,
+            cache=cache,
+        ).neighbors
+
+
+def brute_force_top_k(
+    base: TextLike,
+    resolutions: Sequence[tuple[Hashable, TextLike]],
+    candidate: TextLike,
+    k: int,
+    *,
+    use_line_levenshtein: bool = True,
+) -> list[Neighbor]:
+    """Reference linear scan with the same ordering as :meth:`ResolutionIndex.search`."""
+    scored = [
+        (
+            anchored_ratio(
+                base, text, candidate, use_line_levenshtein=use_line_levenshtein
+            ),
+            i,
+            key,
+        )
+        for i, (key, text) in enumerate(resolutions)
+    ]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [Neighbor(key, score) for score, _, key in scored[: max(k, 0)]]
+
+
+__all__ = ["Neighbor", "ResolutionIndex", "SearchResult", "brute_force_top_k"]
@@ -0,0 +1,34 @@
+from conflict_collection.io.corpus import CorpusStats, CorpusStore, blob_sha
+from conflict_collection.io.jsonl import (
+    ConflictCaseWriter,
+    JSONLShardWriter,
+    SocialSignalsWriter,
+    conflict_case_from_dict,
+    conflict_case_to_dict,
+    iter_conflict_cases,
+    iter_jsonl,
+    iter_social_signals,
+    shard_paths,
+    social_signals_from_dict,
+    social_signals_to_dict,
+)
+from conflict_collection.io.spill import CaseSpool, case_body_bytes
+
+__all__ = [
+    "CorpusStats",
+    "CorpusStore",
+    "blob_sha",
+    "CaseSpool",
+    "case_body_bytes",
+    "ConflictCaseWriter",
+    "JSONLShardWriter",
+    "SocialSignalsWriter",
+    "conflict_case_from_dict",
+    "conflict_case_to_dict",
+    "iter_conflict_cases",
+    "iter_jsonl",
+    "iter_social_signals",
+    "shard_paths",
+    "social_signals_from_dict",
+    "social_signals_to_dict",
+]
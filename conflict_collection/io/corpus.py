@@ -0,0 +1,249 @@
+"""Content-deduplicated corpus of conflict cases in a single SQLite file.
+
+The same base blob appears in hundreds of cases and some bodies are literally
+another field (``ModifyDeleteConflictCase.conflict_body is ours_content``), so
+inline JSON storage scales with case count. :class:`CorpusStore` instead keeps
+each distinct text once in a ``blobs`` table, keyed by its Git blob SHA-1, and
+case rows reference those keys. Cases are rebuilt lazily on access, so disk
+and I/O scale with unique content.
+
+Tables::
+
+    blobs(sha PRIMARY KEY, size, compressed, data)
+    cases(id PRIMARY KEY, conflict_type, *_path, *_sha, meta)
+"""
+
+import hashlib
+import json
+import sqlite3
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Optional, Union
+
+from conflict_collection.io.jsonl import CASE_TYPES
+from conflict_collection.schema.typed_five_tuple import ConflictCase
+
+_CONTENT_FIELDS = {
+    "base_content": "base_sha",
+    "ours_content": "ours_sha",
+    "theirs_content": "theirs_sha",
+    "conflict_body": "conflict_sha",
+    "resolved_body": "resolved_sha",
+}
+_PATH_FIELDS = (
+    "base_path",
+    "ours_path",
+    "theirs_path",
+    "conflict_path",
+    "resolved_path",
+)
+_CASE_COLUMNS = ("conflict_type", *_PATH_FIELDS, *_CONTENT_FIELDS.values(), "meta")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS blobs (
+    sha TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    compressed INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    {", ".join(f"{column} TEXT" for column in _CASE_COLUMNS)}
+);
+"""
+
+
+def blob_sha(content: str) -> str:
+    """Git blob SHA-1 of ``content`` encoded as UTF-8 (``git hash-object``)."""
+    data = content.encode("utf-8", "surrogatepass")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CorpusStats:
+    """Sizes of a corpus store."""
+
+    cases: int
+    blobs: int
+    content_bytes: int
+    """UTF-8 size of all distinct contents."""
+    stored_bytes: int
+    """Bytes actually stored for those contents (after compression)."""
+
+
+class CorpusStore:
+    """SQLite-backed conflict case corpus with contents stored once by SHA.
+
+    Args:
+        path: Database file (created if missing).
+        compress: zlib-compress new blobs when that makes them smaller.
+        blob_cache_size: Decoded blobs kept in an in-memory LRU, which pays
+            off when consecutive cases share a base.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        compress: bool = True,
+        blob_cache_size: int = 256,
+    ) -> None:
+        self.path = Path(path)
+        self.compress = compress
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(_SCHEMA)
+        self._blob_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._blob_cache_size = blob_cache_size
+
+    # ----------------------------
+    # Blobs
+    # ----------------------------
+
+    def _put_blob(self, content: Optional[str]) -> Optional[str]:
+        if content is None:
+            return None
+        sha = blob_sha(content)
+        exists = self._conn.execute(
+            "SELECT 1 FROM blobs WHERE sha = ?", (sha,)
+        ).fetchone()
+        if exists is None:
+            raw = content.encode("utf-8", "surrogatepass")
+            packed = zlib.compress(raw) if self.compress else raw
+            compressed = self.compress and len(packed) < len(raw)
+            self._conn.execute(
+                "INSERT INTO blobs (sha, size, compressed, data) VALUES (?, ?, ?, ?)",
+                (sha, len(raw), int(compressed), packed if compressed else raw),
+            )
+        return sha
+
+    def get_content(self, sha: str) -> str:
+        """Decoded content stored under ``sha``. Raises ``KeyError`` if absent."""
+        cached = self._blob_cache.get(sha)
+        if cached is not None:
+            self._blob_cache.move_to_end(sha)
+            return cached
+        row = self._conn.execute(
+            "SELECT compressed, data FROM blobs WHERE sha = ?", (sha,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(sha)
+        compressed, data = row
+        content = (zlib.decompress(data) if compressed else data).decode(
+            "utf-8", "surrogatepass"
+        )
+        if self._blob_cache_size > 0:
+            self._blob_cache[sha] = content
+            while len(self._blob_cache) > self._blob_cache_size:
+                self._blob_cache.popitem(last=False)
+        return content
+
+    # ----------------------------
+    # Cases
+    # ----------------------------
+
+    def _insert_case(
+        self, case: ConflictCase, meta: Optional[Mapping[str, Any]]
+    ) -> int:
+        values: list[Optional[str]] = [case.conflict_type]
+        values.extend(getattr(case, field) for field in _PATH_FIELDS)
+        values.extend(self._put_blob(getattr(case, field)) for field in _CONTENT_FIELDS)
+        values.append(json.dumps(dict(meta)) if meta else None)
+        cursor = self._conn.execute(
+            f"INSERT INTO cases ({', '.join(_CASE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _CASE_COLUMNS)})",
+            values,
+        )
+        assert cursor.lastrowid is not None
+        return cursor.lastrowid
+
+    def add(self, case: ConflictCase, meta: Optional[Mapping[str, Any]] = None) -> int:
+        """Store one case (and any new contents); returns its id."""
+        with self._conn:
+            return self._insert_case(case, meta)
+
+    def add_many(
+        self,
+        cases: Iterable[ConflictCase],
+        meta: Optional[Mapping[str, Any]] = None,
+    ) -> list[int]:
+        """Store many cases in one transaction, all tagged with ``meta``."""
+        with self._conn:
+            return [self._insert_case(case, meta) for case in cases]
+
+    def _row_to_case(self, row: tuple) -> ConflictCase:
+        data = dict(zip(_CASE_COLUMNS, row))
+        cls = CASE_TYPES[data["conflict_type"]]
+        kwargs: dict[str, Any] = {field: data[field] for field in _PATH_FIELDS}
+        for field, column in _CONTENT_FIELDS.items():
+            sha = data[column]
+            kwargs[field] = None if sha is None else self.get_content(sha)
+        return cls(**kwargs)
+
+    def get(self, case_id: int) -> ConflictCase:
+        """Load one case by id. Raises ``KeyError`` if absent."""
+        row = self._conn.execute(
+            f"SELECT {', '.join(_CASE_COLUMNS)} FROM cases WHERE id = ?", (case_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(case_id)
+        return self._row_to_case(row)
+
+    def meta(self, case_id: int) -> dict[str, Any]:
+        """Metadata stored with a case (empty if none)."""
+        row = self._conn.execute(
+            "SELECT meta FROM cases WHERE id = ?", (case_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(case_id)
+        return json.loads(row[0]) if row[0] else {}
+
+    def ids(self) -> list[int]:
+        """All case ids in insertion order."""
+        return [
+            row[0] for row in self._conn.execute("SELECT id FROM cases ORDER BY id")
+        ]
+
+    def __iter__(self) -> Iterator[ConflictCase]:
+        """Lazily load every case in insertion order."""
+        last_id = 0
+        while True:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(_CASE_COLUMNS)} FROM cases "
+                "WHERE id > ? ORDER BY id LIMIT 256",
+                (last_id,),
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_case(row[1:])
+            last_id = rows[-1][0]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    def stats(self) -> CorpusStats:
+        """Case / blob counts and logical vs stored content size."""
+        blobs, content_bytes, stored_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) "
+            "FROM blobs"
+        ).fetchone()
+        return CorpusStats(
+            cases=len(self),
+            blobs=blobs,
+            content_bytes=content_bytes,
+            stored_bytes=stored_bytes,
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ["CorpusStats", "CorpusStore", "blob_sha"]
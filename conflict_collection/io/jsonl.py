@@ -0,0 +1,324 @@
+"""Streaming, sharded JSONL storage for collector output.
+
+Writers append one JSON object per line to shards named
+``<prefix>-<index>.jsonl[.gz|.zst]`` inside a directory, rotating to a new
+shard once the current one has received ``max_shard_bytes`` of (uncompressed)
+payload. Existing shards are never reopened or overwritten: a new writer on
+the same directory continues numbering after the last shard, so output is
+append-only across runs.
+
+Readers are generators, decoding one line at a time, so corpora larger than
+memory can be scanned record by record.
+
+``zstd`` framing requires the optional ``zstandard`` package
+(``pip install conflict_collection[zstd]``).
+"""
+
+import gzip
+import io
+import json
+import re
+from dataclasses import fields
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Literal, Mapping, Optional, Union
+
+from conflict_collection.schema.social_signals import SocialSignalsRecord
+from conflict_collection.schema.typed_five_tuple import (
+    AddAddConflictCase,
+    AddedByThemConflictCase,
+    AddedByUsConflictCase,
+    ConflictCase,
+    DeleteDeleteConflictCase,
+    DeleteModifyConflictCase,
+    ModifyDeleteConflictCase,
+    ModifyModifyConflictCase,
+)
+
+Compression = Optional[Literal["gzip", "zstd"]]
+PathLike = Union[str, Path]
+
+_SUFFIXES = {None: ".jsonl", "gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+CASE_TYPES: dict[str, type] = {
+    "modify_modify": ModifyModifyConflictCase,
+    "added_by_us": AddedByUsConflictCase,
+    "added_by_them": AddedByThemConflictCase,
+    "delete_modify": DeleteModifyConflictCase,
+    "modify_delete": ModifyDeleteConflictCase,
+    "delete_delete": DeleteDeleteConflictCase,
+    "add_add": AddAddConflictCase,
+}
+"""``conflict_type`` discriminator -> dataclass."""
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package: "
+            "pip install conflict_collection[zstd]"
+        ) from e
+    return zstandard
+
+
+# ----------------------------
+# Record <-> dict
+# ----------------------------
+
+
+def conflict_case_to_dict(case: ConflictCase) -> dict[str, Any]:
+    """Shallow field dict of a conflict case (bodies are shared, not copied)."""
+    return {f.name: getattr(case, f.name) for f in fields(case)}
+
+
+def conflict_case_from_dict(data: Mapping[str, Any]) -> ConflictCase:
+    """Rebuild a typed conflict case, dispatching on ``conflict_type``.
+
+    Keys that are not fields of the target dataclass (e.g. merge metadata
+    stored alongside the case) are ignored.
+
+    Raises:
+        ValueError: If ``conflict_type`` is missing or unknown.
+    """
+    conflict_type = data.get("conflict_type")
+    cls = CASE_TYPES.get(conflict_type)  # type: ignore[arg-type]
+    if cls is None:
+        raise ValueError(f"Unknown conflict_type: {conflict_type!r}")
+    return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+def social_signals_to_dict(record: SocialSignalsRecord) -> dict[str, Any]:
+    """JSON-compatible dict of a social signals record."""
+    return record.model_dump(mode="json")
+
+
+def social_signals_from_dict(data: Mapping[str, Any]) -> SocialSignalsRecord:
+    """Validate a dict back into a :class:`SocialSignalsRecord` (extra keys ignored)."""
+    return SocialSignalsRecord.model_validate(data)
+
+
+# ----------------------------
+# Low-level streams
+# ----------------------------
+
+
+def _open_binary_writer(path: Path, compression: Compression) -> IO[bytes]:
+    # "xb": refuse to clobber an existing shard.
+    if compression is None:
+        return open(path, "xb")
+    if compression == "gzip":
+        return gzip.GzipFile(filename=path, mode="xb")
+    if compression == "zstd":
+        zstandard = _require_zstandard()
+        return zstandard.ZstdCompressor().stream_writer(open(path, "xb"))
+    raise ValueError(f"Unsupported compression: {compression!r}")
+
+
+def open_jsonl(path: PathLike) -> IO[str]:
+    """Open a (possibly compressed) JSONL file for text reading, by suffix."""
+    path = Path(path)
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.name.endswith(".zst"):
+        zstandard = _require_zstandard()
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _indexed_shards(directory: Path, prefix: str) -> list[tuple[int, Path]]:
+    pattern = re.compile(rf"^{re.escape(prefix)}-(\d+)\.jsonl(\.gz|\.zst)?$")
+    found = []
+    for path in directory.iterdir() if directory.is_dir() else ():
+        match = pattern.match(path.name)
+        if match:
+            found.append((int(match.group(1)), path))
+    return sorted(found)
+
+
+def shard_paths(directory: PathLike, prefix: str = "part") -> list[Path]:
+    """Shards written under ``directory`` with ``prefix``, in write order."""
+    return [path for _, path in _indexed_shards(Path(directory), prefix)]
+
+
+def _resolve_paths(
+    paths: Union[PathLike, Iterable[PathLike]], prefix: str
+) -> Iterable[PathLike]:
+    if isinstance(paths, (str, Path)):
+        path = Path(paths)
+        return shard_paths(path, prefix) if path.is_dir() else [path]
+    return paths
+
+
+def iter_jsonl(
+    paths: Union[PathLike, Iterable[PathLike]], *, prefix: str = "part"
+) -> Iterator[dict[str, Any]]:
+    """Lazily decode JSON objects from files, or from a directory's shards.
+
+    Args:
+        paths: A JSONL file, an iterable of files, or a shard directory.
+        prefix: Shard prefix to match when ``paths`` is a directory.
+    """
+    for path in _resolve_paths(paths, prefix):
+        with open_jsonl(path) as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# ----------------------------
+# Writers
+# ----------------------------
+
+
+class JSONLShardWriter:
+    """Append-only writer of JSON objects into size-rotated shards.
+
+    Args:
+        directory: Output directory (created if missing).
+        prefix: Shard file name prefix.
+        compression: ``None``, ``"gzip"`` or ``"zstd"``.
+        max_shard_bytes: Uncompressed payload after which the next record
+            starts a new shard. A shard always holds at least one record.
+    """
+
+    def __init__(
+        self,
+        directory: PathLike,
+        prefix: str = "part",
+        *,
+        compression: Compression = None,
+        max_shard_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        if compression not in _SUFFIXES:
+            raise ValueError(f"Unsupported compression: {compression!r}")
+        if max_shard_bytes <= 0:
+            raise ValueError(f"max_shard_bytes must be positive, got {max_shard_bytes}")
+        if compression == "zstd":
+            _require_zstandard()
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.compression = compression
+        self.max_shard_bytes = max_shard_bytes
+        self.paths: list[Path] = []
+        """Shards created by this writer, in order."""
+        self.records_written = 0
+
+        existing = _indexed_shards(self.directory, prefix)
+        self._next_index = existing[-1][0] + 1 if existing else 0
+        self._stream: Optional[IO[bytes]] = None
+        self._shard_bytes = 0
+
+    def _rotate(self) -> None:
+        self._close_stream()
+        path = self.directory / (
+            f"{self.prefix}-{self._next_index:05d}{_SUFFIXES[self.compression]}"
+        )
+        self._next_index += 1
+        self._stream = _open_binary_writer(path, self.compression)
+        self._shard_bytes = 0
+        self.paths.append(path)
+
+    def _close_stream(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def write_dict(self, record: Mapping[str, Any]) -> None:
+        """Append one JSON object."""
+        payload = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._stream is None or self._shard_bytes >= self.max_shard_bytes:
+            self._rotate()
+        assert self._stream is not None
+        self._stream.write(payload)
+        self._shard_bytes += len(payload)
+        self.records_written += 1
+
+    def flush(self) -> None:
+        """Push buffered records of the current shard to the OS.
+
+        Compressed shards stay readable up to this point, but only a
+        :meth:`close` writes the end-of-stream marker.
+        """
+        if self._stream is not None:
+            self._stream.flush()
+
+    def close(self) -> None:
+        """Flush and close the current shard."""
+        self._close_stream()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ConflictCaseWriter(JSONLShardWriter):
+    """Shard writer for typed conflict cases.
+
+    ``extra`` keys (e.g. the merge commit) are stored next to the case
+    fields and ignored by :func:`iter_conflict_cases`; use :func:`iter_jsonl`
+    to read them back.
+    """
+
+    def write(
+        self, case: ConflictCase, extra: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        record = conflict_case_to_dict(case)
+        if extra:
+            record.update(extra)
+        self.write_dict(record)
+
+
+class SocialSignalsWriter(JSONLShardWriter):
+    """Shard writer for :class:`SocialSignalsRecord` (see :class:`ConflictCaseWriter`)."""
+
+    def write(
+        self, record: SocialSignalsRecord, extra: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        data = social_signals_to_dict(record)
+        if extra:
+            data.update(extra)
+        self.write_dict(data)
+
+
+# ----------------------------
+# Typed readers
+# ----------------------------
+
+
+def iter_conflict_cases(
+    paths: Union[PathLike, Iterable[PathLike]], *, prefix: str = "part"
+) -> Iterator[ConflictCase]:
+    """Lazily read conflict cases from JSONL files or a shard directory."""
+    for data in iter_jsonl(paths, prefix=prefix):
+        yield conflict_case_from_dict(data)
+
+
+def iter_social_signals(
+    paths: Union[PathLike, Iterable[PathLike]], *, prefix: str = "part"
+) -> Iterator[SocialSignalsRecord]:
+    """Lazily read social signals records from JSONL files or a shard directory."""
+    for data in iter_jsonl(paths, prefix=prefix):
+        yield social_signals_from_dict(data)
+
+
+__all__ = [
+    "CASE_TYPES",
+    "ConflictCaseWriter",
+    "JSONLShardWriter",
+    "SocialSignalsWriter",
+    "conflict_case_from_dict",
+    "conflict_case_to_dict",
+    "iter_conflict_cases",
+    "iter_jsonl",
+    "iter_social_signals",
+    "open_jsonl",
+    "shard_paths",
+    "social_signals_from_dict",
+    "social_signals_to_dict",
+]
@@ -0,0 +1,118 @@
+"""Memory-bounded case sequences that spill to a temporary file.
+
+:class:`CaseSpool` behaves like a read-only list of conflict cases. Cases are
+kept in memory until their bodies add up to ``memory_budget`` bytes; later
+cases are serialized to an anonymous temporary file and replaced by an
+``(offset, length)`` handle that is decoded again on access. Iterating a
+spool therefore holds at most one spilled case in memory at a time.
+"""
+
+import json
+import tempfile
+import threading
+from typing import IO, Iterator, Optional, Sequence, Union, overload
+
+from conflict_collection.io.jsonl import conflict_case_from_dict, conflict_case_to_dict
+from conflict_collection.schema.typed_five_tuple import ConflictCase
+
+_BODY_FIELDS = (
+    "base_content",
+    "ours_content",
+    "theirs_content",
+    "conflict_body",
+    "resolved_body",
+)
+
+
+def case_body_bytes(case: ConflictCase) -> int:
+    """Approximate in-memory size of a case: total length of its bodies."""
+    return sum(len(getattr(case, name) or "") for name in _BODY_FIELDS)
+
+
+class CaseSpool(Sequence[ConflictCase]):
+    """Append-only, list-like sequence of cases with a memory budget.
+
+    Args:
+        memory_budget: Body bytes kept resident; ``0`` spills every case.
+        directory: Where to create the temporary spill file (default:
+            the system temp dir). The file has no name and disappears when
+            the spool is closed or garbage-collected.
+    """
+
+    def __init__(self, memory_budget: int, directory: Optional[str] = None) -> None:
+        if memory_budget < 0:
+            raise ValueError(f"memory_budget must be >= 0, got {memory_budget}")
+        self.memory_budget = memory_budget
+        self.resident_bytes = 0
+        self.spilled = 0
+        """Number of cases stored on disk."""
+        self._directory = directory
+        self._entries: list[Union[ConflictCase, tuple[int, int]]] = []
+        self._file: Optional[IO[bytes]] = None
+        self._lock = threading.Lock()
+
+    def append(self, case: ConflictCase) -> None:
+        size = case_body_bytes(case)
+        if self.resident_bytes + size <= self.memory_budget:
+            self._entries.append(case)
+            self.resident_bytes += size
+            return
+
+        payload = json.dumps(conflict_case_to_dict(case), ensure_ascii=False).encode(
+            "utf-8", "surrogatepass"
+        )
+        with self._lock:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(dir=self._directory)
+            self._file.seek(0, 2)
+            offset = self._file.tell()
+            self._file.write(payload)
+        self._entries.append((offset, len(payload)))
+        self.spilled += 1
+
+    def _load(self, entry: Union[ConflictCase, tuple[int, int]]) -> ConflictCase:
+        if not isinstance(entry, tuple):
+            return entry
+        offset, length = entry
+        with self._lock:
+            if self._file is None:
+                raise ValueError("CaseSpool is closed")
+            self._file.seek(offset)
+            payload = self._file.read(length)
+        return conflict_case_from_dict(
+            json.loads(payload.decode("utf-8", "surrogatepass"))
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> ConflictCase: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ConflictCase]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._load(entry) for entry in self._entries[index]]
+        return self._load(self._entries[index])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[ConflictCase]:
+        for entry in self._entries:
+            yield self._load(entry)
+
+    def close(self) -> None:
+        """Delete the spill file. Resident cases stay readable."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ["CaseSpool", "case_body_bytes"]
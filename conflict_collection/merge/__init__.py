@@ -0,0 +1,13 @@
+from conflict_collection.merge.merge3 import (
+    ConflictStyle,
+    MergedText,
+    MergeLevel,
+    merge3,
+)
+
+__all__ = [
+    "ConflictStyle",
+    "MergeLevel",
+    "MergedText",
+    "merge3",
+]
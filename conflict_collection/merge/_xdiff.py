@@ -0,0 +1,515 @@
+"""Line diffs that make the same choices as git's xdiff.
+
+A three-way merge is only reproducible if both of its two-way diffs pick the
+same edit script git picks, and among equally short scripts the choice is
+arbitrary. This module therefore reimplements the parts of xdiff that decide
+it: Myers' divide-and-conquer search with xdiff's pre-filtering of lines and
+cost cut-offs, the histogram algorithm (which ``git merge`` uses), and the
+final sliding of change groups.
+
+Lines are compared as interned integers; see :func:`intern_lines`.
+"""
+
+from collections import Counter
+from typing import Literal, Sequence
+
+Algorithm = Literal["myers", "histogram"]
+
+Hunk = tuple[int, int, int, int]
+"""``(start1, start2, count1, count2)``: lines replaced in file 1 and file 2."""
+
+_MAX_EQLIMIT = 1024
+_SIMSCAN_WINDOW = 100
+_KPDIS_RUN = 4
+_MAX_COST_MIN = 256
+_HEUR_MIN_COST = 256
+_SNAKE_CNT = 20
+_K_HEUR = 4
+_MAX_CHAIN_LENGTH = 64
+
+
+def split_lines(text: str) -> list[str]:
+    """Split after every ``\\n``; a final unterminated line is kept as is."""
+    lines = text.split("\n")
+    last = lines.pop()
+    lines = [line + "\n" for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def intern_lines(ids: dict[str, int], lines: Sequence[str]) -> list[int]:
+    """Map lines to integers; equal lines share one id through ``ids``."""
+    return [ids.setdefault(line, len(ids)) for line in lines]
+
+
+def diff(a: Sequence[int], b: Sequence[int], algorithm: Algorithm) -> list[Hunk]:
+    """Hunks turning ``a`` into ``b``, in order, after group sliding."""
+    rchg1 = [0] * (len(a) + 1)
+    rchg2 = [0] * (len(b) + 1)
+    # Both flag lists end in a 0 sentinel; index -1 wraps around onto it.
+    if algorithm == "histogram":
+        _histogram(a, b, rchg1, rchg2)
+    elif algorithm == "myers":
+        _myers(a, b, rchg1, rchg2)
+    else:
+        raise ValueError(f"Unknown diff algorithm: {algorithm!r}")
+    _compact(a, rchg1, rchg2)
+    _compact(b, rchg2, rchg1)
+    return _script(rchg1, rchg2, len(a), len(b))
+
+
+# --- Myers -----------------------------------------------------------------
+
+
+def _bogosqrt(n: int) -> int:
+    i = 1
+    while n > 0:
+        n >>= 2
+        i <<= 1
+    return i
+
+
+def _myers(a: Sequence[int], b: Sequence[int], rchg1: list, rchg2: list) -> None:
+    n1, n2 = len(a), len(b)
+
+    # Common prefix and suffix never enter the search.
+    start, lim = 0, min(n1, n2)
+    while start < lim and a[start] == b[start]:
+        start += 1
+    tail = 0
+    while tail < lim - start and a[n1 - 1 - tail] == b[n2 - 1 - tail]:
+        tail += 1
+    end1, end2 = n1 - tail - 1, n2 - tail - 1
+
+    # Lines without a counterpart are changed outright; lines with very many
+    # counterparts are dropped too when they sit among such lines. Only the
+    # rest ("reff") is searched.
+    count1, count2 = Counter(a), Counter(b)
+    dis1 = _discards(a, count2, start, end1, n1)
+    dis2 = _discards(b, count1, start, end2, n2)
+    index1 = _keep(dis1, start, end1, rchg1)
+    index2 = _keep(dis2, start, end2, rchg2)
+    ha1 = [a[i] for i in index1]
+    ha2 = [b[i] for i in index2]
+
+    ndiags = len(ha1) + len(ha2) + 3
+    mxcost = max(_bogosqrt(ndiags), _MAX_COST_MIN)
+    kvdf = [0] * ndiags
+    kvdb = [0] * ndiags
+    base = len(ha2) + 1  # diagonal d lives at kv[d + base]
+
+    stack = [(0, len(ha1), 0, len(ha2), False)]
+    while stack:
+        off1, lim1, off2, lim2, need_min = stack.pop()
+        while off1 < lim1 and off2 < lim2 and ha1[off1] == ha2[off2]:
+            off1 += 1
+            off2 += 1
+        while off1 < lim1 and off2 < lim2 and ha1[lim1 - 1] == ha2[lim2 - 1]:
+            lim1 -= 1
+            lim2 -= 1
+        if off1 == lim1:
+            for k in range(off2, lim2):
+                rchg2[index2[k]] = 1
+        elif off2 == lim2:
+            for k in range(off1, lim1):
+                rchg1[index1[k]] = 1
+        else:
+            s1, s2, min_lo, min_hi = _split(
+                ha1, off1, lim1, ha2, off2, lim2, kvdf, kvdb, base, need_min, mxcost
+            )
+            stack.append((s1, lim1, s2, lim2, min_hi))
+            stack.append((off1, s1, off2, s2, min_lo))
+
+
+def _discards(
+    lines: Sequence[int], other: Counter, start: int, end: int, n: int
+) -> list[int]:
+    """0: no match in the other file, 1: keep, 2: many matches."""
+    mlim = min(_bogosqrt(n), _MAX_EQLIMIT)
+    dis = [0] * (n + 1)
+    for i in range(start, end + 1):
+        matches = other[lines[i]]
+        dis[i] = 0 if matches == 0 else 2 if matches >= mlim else 1
+    return dis
+
+
+def _keep(dis: list[int], start: int, end: int, rchg: list) -> list[int]:
+    kept = []
+    for i in range(start, end + 1):
+        if dis[i] == 1 or (dis[i] == 2 and not _drop_multimatch(dis, i, start, end)):
+            kept.append(i)
+        else:
+            rchg[i] = 1
+    return kept
+
+
+def _drop_multimatch(dis: list[int], i: int, s: int, e: int) -> bool:
+    s = max(s, i - _SIMSCAN_WINDOW)
+    e = min(e, i + _SIMSCAN_WINDOW)
+    runs = []
+    for step, bound in ((-1, s), (1, e)):
+        unmatched, multi = 0, 1
+        j = i + step
+        while (j >= bound) if step < 0 else (j <= bound):
+            if dis[j] == 0:
+                unmatched += 1
+            elif dis[j] == 2:
+                multi += 1
+            else:
+                break
+            j += step
+        if not unmatched:
+            return False
+        runs.append((unmatched, multi))
+    unmatched = runs[0][0] + runs[1][0]
+    multi = runs[0][1] + runs[1][1]
+    return multi * _KPDIS_RUN < multi + unmatched
+
+
+def _split(ha1, off1, lim1, ha2, off2, lim2, kvdf, kvdb, base, need_min, mxcost):
+    """Middle snake of the box, or a heuristic cut once the search gets long."""
+    dmin, dmax = off1 - lim2, lim1 - off2
+    fmid, bmid = off1 - off2, lim1 - lim2
+    odd = (fmid - bmid) & 1
+    fmin = fmax = fmid
+    bmin = bmax = bmid
+    kvdf[fmid + base] = off1
+    kvdb[bmid + base] = lim1
+    line_max = lim1 + lim2 + 1
+
+    ec = 0
+    while True:
+        ec += 1
+        got_snake = False
+
+        if fmin > dmin:
+            fmin -= 1
+            kvdf[fmin - 1 + base] = -1
+        else:
+            fmin += 1
+        if fmax < dmax:
+            fmax += 1
+            kvdf[fmax + 1 + base] = -1
+        else:
+            fmax -= 1
+        for d in range(fmax, fmin - 1, -2):
+            if kvdf[d - 1 + base] >= kvdf[d + 1 + base]:
+                i1 = kvdf[d - 1 + base] + 1
+            else:
+                i1 = kvdf[d + 1 + base]
+            prev1 = i1
+            i2 = i1 - d
+            while i1 < lim1 and i2 < lim2 and ha1[i1] == ha2[i2]:
+                i1 += 1
+                i2 += 1
+            if i1 - prev1 > _SNAKE_CNT:
+                got_snake = True
+            kvdf[d + base] = i1
+            if odd and bmin <= d <= bmax and kvdb[d + base] <= i1:
+                return i1, i2, True, True
+
+        if bmin > dmin:
+            bmin -= 1
+            kvdb[bmin - 1 + base] = line_max
+        else:
+            bmin += 1
+        if bmax < dmax:
+            bmax += 1
+            kvdb[bmax + 1 + base] = line_max
+        else:
+            bmax -= 1
+        for d in range(bmax, bmin - 1, -2):
+            if kvdb[d - 1 + base] < kvdb[d + 1 + base]:
+                i1 = kvdb[d - 1 + base]
+            else:
+                i1 = kvdb[d + 1 + base] - 1
+            prev1 = i1
+            i2 = i1 - d
+            while i1 > off1 and i2 > off2 and ha1[i1 - 1] == ha2[i2 - 1]:
+                i1 -= 1
+                i2 -= 1
+            if prev1 - i1 > _SNAKE_CNT:
+                got_snake = True
+            kvdb[d + base] = i1
+            if not odd and fmin <= d <= fmax and i1 <= kvdf[d + base]:
+                return i1, i2, True, True
+
+        if need_min:
+            continue
+
+        # Long search with a good snake: take a diagonal that got far.
+        if got_snake and ec > _HEUR_MIN_COST:
+            best = 0
+            for d in range(fmax, fmin - 1, -2):
+                i1 = kvdf[d + base]
+                i2 = i1 - d
+                v = (i1 - off1) + (i2 - off2) - abs(d - fmid)
+                if (
+                    v > _K_HEUR * ec
+                    and v > best
+                    and off1 + _SNAKE_CNT <= i1 < lim1
+                    and off2 + _SNAKE_CNT <= i2 < lim2
+                    and all(
+                        ha1[i1 - k] == ha2[i2 - k] for k in range(1, _SNAKE_CNT + 1)
+                    )
+                ):
+                    best, cut = v, (i1, i2)
+            if best > 0:
+                return cut[0], cut[1], True, False
+
+            best = 0
+            for d in range(bmax, bmin - 1, -2):
+                i1 = kvdb[d + base]
+                i2 = i1 - d
+                v = (lim1 - i1) + (lim2 - i2) - abs(d - bmid)
+                if (
+                    v > _K_HEUR * ec
+                    and v > best
+                    and off1 < i1 <= lim1 - _SNAKE_CNT
+                    and off2 < i2 <= lim2 - _SNAKE_CNT
+                    and all(ha1[i1 + k] == ha2[i2 + k] for k in range(_SNAKE_CNT))
+                ):
+                    best, cut = v, (i1, i2)
+            if best > 0:
+                return cut[0], cut[1], False, True
+
+        # Too expensive: cut at the furthest-reaching path.
+        if ec >= mxcost:
+            fbest = fbest1 = -1
+            for d in range(fmax, fmin - 1, -2):
+                i1 = min(kvdf[d + base], lim1)
+                i2 = i1 - d
+                if lim2 < i2:
+                    i1, i2 = lim2 + d, lim2
+                if fbest < i1 + i2:
+                    fbest, fbest1 = i1 + i2, i1
+            bbest = bbest1 = line_max * 2
+            for d in range(bmax, bmin - 1, -2):
+                i1 = max(off1, kvdb[d + base])
+                i2 = i1 - d
+                if i2 < off2:
+                    i1, i2 = off2 + d, off2
+                if i1 + i2 < bbest:
+                    bbest, bbest1 = i1 + i2, i1
+            if (lim1 + lim2) - bbest < fbest - (off1 + off2):
+                return fbest1, fbest - fbest1, True, False
+            return bbest1, bbest - bbest1, False, True
+
+
+# --- histogram -------------------------------------------------------------
+
+
+class _Occurrences:
+    __slots__ = ("ptr", "cnt")
+
+    def __init__(self, ptr: int) -> None:
+        self.ptr = ptr
+        self.cnt = 1
+
+
+def _histogram(a: Sequence[int], b: Sequence[int], rchg1: list, rchg2: list) -> None:
+    # Ranges are 1-based (line, count) pairs, as in xdiff.
+    stack = [(1, len(a), 1, len(b))]
+    while stack:
+        line1, count1, line2, count2 = stack.pop()
+        if count1 <= 0 and count2 <= 0:
+            continue
+        if not count1 or not count2:
+            rchg1[line1 - 1 : line1 - 1 + count1] = [1] * count1
+            rchg2[line2 - 1 : line2 - 1 + count2] = [1] * count2
+            continue
+        fallback, lcs = _find_lcs(a, b, line1, count1, line2, count2)
+        if fallback:
+            sub1 = [0] * (count1 + 1)
+            sub2 = [0] * (count2 + 1)
+            _myers(
+                a[line1 - 1 : line1 - 1 + count1],
+                b[line2 - 1 : line2 - 1 + count2],
+                sub1,
+                sub2,
+            )
+            rchg1[line1 - 1 : line1 - 1 + count1] = sub1[:count1]
+            rchg2[line2 - 1 : line2 - 1 + count2] = sub2[:count2]
+            continue
+        begin1, end1, begin2, end2 = lcs
+        if begin1 == 0 and begin2 == 0:
+            rchg1[line1 - 1 : line1 - 1 + count1] = [1] * count1
+            rchg2[line2 - 1 : line2 - 1 + count2] = [1] * count2
+            continue
+        stack.append((line1, begin1 - line1, line2, begin2 - line2))
+        stack.append(
+            (end1 + 1, line1 + count1 - 1 - end1, end2 + 1, line2 + count2 - 1 - end2)
+        )
+
+
+def _find_lcs(a, b, line1, count1, line2, count2):
+    """Longest common run of the rarest lines: ``(fallback, (b1, e1, b2, e2))``.
+
+    ``fallback`` is set when every common line occurs too often for the
+    histogram to be useful; the range is then diffed with Myers instead.
+    """
+    last1 = line1 + count1 - 1
+    last2 = line2 + count2 - 1
+    records: dict[int, _Occurrences] = {}
+    next_ptr = [0] * count1
+    line_map: list = [None] * count1
+    for ptr in range(last1, line1 - 1, -1):
+        rec = records.get(a[ptr - 1])
+        if rec is None:
+            rec = records[a[ptr - 1]] = _Occurrences(ptr)
+        else:
+            next_ptr[ptr - line1] = rec.ptr
+            rec.ptr = ptr
+            rec.cnt += 1
+        line_map[ptr - line1] = rec
+
+    limit = _MAX_CHAIN_LENGTH + 1
+    has_common = False
+    begin1 = end1 = begin2 = end2 = 0
+    b_ptr = line2
+    while b_ptr <= last2:
+        b_next = b_ptr + 1
+        rec = records.get(b[b_ptr - 1])
+        if rec is not None:
+            has_common = True
+        if rec is not None and rec.cnt <= limit:
+            as_ = rec.ptr
+            while True:
+                np = next_ptr[as_ - line1]
+                bs = b_ptr
+                ae, be = as_, bs
+                rc = rec.cnt
+                while line1 < as_ and line2 < bs and a[as_ - 2] == b[bs - 2]:
+                    as_ -= 1
+                    bs -= 1
+                    if rc > 1:
+                        rc = min(rc, line_map[as_ - line1].cnt)
+                while ae < last1 and be < last2 and a[ae] == b[be]:
+                    ae += 1
+                    be += 1
+                    if rc > 1:
+                        rc = min(rc, line_map[ae - line1].cnt)
+                if b_next <= be:
+                    b_next = be + 1
+                if end1 - begin1 < ae - as_ or rc < limit:
+                    begin1, end1, begin2, end2 = as_, ae, bs, be
+                    limit = rc
+                if np == 0:
+                    break
+                while np and np <= ae:
+                    np = next_ptr[np - line1]
+                if np == 0:
+                    break
+                as_ = np
+        b_ptr = b_next
+
+    fallback = has_common and limit > _MAX_CHAIN_LENGTH
+    return fallback, (begin1, end1, begin2, end2)
+
+
+# --- post-processing -------------------------------------------------------
+
+
+def _compact(lines: Sequence[int], rchg: list, other: list) -> None:
+    """Slide each change group down as far as it goes, then back up to the
+    last position aligned with a change in the other file, if any."""
+    n = len(lines)
+    n_other = len(other) - 1
+
+    def slide_up(g):
+        if g[0] > 0 and lines[g[0] - 1] == lines[g[1] - 1]:
+            g[0] -= 1
+            g[1] -= 1
+            rchg[g[0]] = 1
+            rchg[g[1]] = 0
+            while rchg[g[0] - 1]:
+                g[0] -= 1
+            return True
+        return False
+
+    def slide_down(g):
+        if g[1] < n and lines[g[0]] == lines[g[1]]:
+            rchg[g[0]] = 0
+            rchg[g[1]] = 1
+            g[0] += 1
+            g[1] += 1
+            while rchg[g[1]]:
+                g[1] += 1
+            return True
+        return False
+
+    def next_group(flags, size, g):
+        if g[1] == size:
+            return False
+        g[0] = g[1] + 1
+        g[1] = g[0]
+        while flags[g[1]]:
+            g[1] += 1
+        return True
+
+    def previous_group(flags, g):
+        if g[0] == 0:
+            return False
+        g[1] = g[0] - 1
+        g[0] = g[1]
+        while flags[g[0] - 1]:
+            g[0] -= 1
+        return True
+
+    g = [0, 0]
+    while rchg[g[1]]:
+        g[1] += 1
+    go = [0, 0]
+    while other[go[1]]:
+        go[1] += 1
+
+    while True:
+        if g[1] != g[0]:
+            while True:
+                size = g[1] - g[0]
+                matched_end = -1
+                while slide_up(g):
+                    previous_group(other, go)
+                earliest_end = g[1]
+                if go[1] > go[0]:
+                    matched_end = g[1]
+                while slide_down(g):
+                    next_group(other, n_other, go)
+                    if go[1] > go[0]:
+                        matched_end = g[1]
+                if size == g[1] - g[0]:
+                    break
+            if g[1] != earliest_end and matched_end != -1:
+                while go[1] == go[0]:
+                    slide_up(g)
+                    previous_group(other, go)
+        if not next_group(rchg, n, g):
+            break
+        next_group(other, n_other, go)
+
+
+def _script(rchg1: list, rchg2: list, n1: int, n2: int) -> list[Hunk]:
+    hunks = []
+    i1 = i2 = 0
+    while i1 < n1 or i2 < n2:
+        if rchg1[i1] or rchg2[i2]:
+            s1, s2 = i1, i2
+            while rchg1[i1]:
+                i1 += 1
+            while rchg2[i2]:
+                i2 += 1
+            hunks.append((s1, s2, i1 - s1, i2 - s2))
+        else:
+            i1 += 1
+            i2 += 1
+    return hunks
+
+
+__all__ = [
+    "Algorithm",
+    "Hunk",
+    "diff",
+    "intern_lines",
+    "split_lines",
+]
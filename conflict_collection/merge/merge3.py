@@ -0,0 +1,351 @@
+"""In-memory three-way merge producing git's conflict markup.
+
+Given the base, ours and theirs contents of a file, :func:`merge3` returns
+the text git leaves in the work tree, markers included, without a checkout.
+It mirrors ``xdl_merge``: both sides are diffed against the base, changes
+that touch or overlap become conflicts, and depending on ``level`` and the
+conflict style those conflicts are then narrowed down.
+
+The defaults reproduce ``git merge`` (the ``ort`` strategy diffs with the
+histogram algorithm at the ``zealous`` level). ``git merge-file`` uses
+``algorithm="myers"`` and ``level="zealous_alnum"`` instead.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Literal, Optional, Sequence
+
+from conflict_parser import MergeMetadata
+
+from conflict_collection.merge._xdiff import (
+    Algorithm,
+    Hunk,
+    diff,
+    intern_lines,
+    split_lines,
+)
+
+ConflictStyle = Literal["merge", "diff3", "zdiff3"]
+MergeLevel = Literal["minimal", "eager", "zealous", "zealous_alnum"]
+
+_LEVELS = ("minimal", "eager", "zealous", "zealous_alnum")
+_ALNUM = re.compile(r"[A-Za-z0-9]")
+
+_CONFLICT, _OURS, _THEIRS, _IDENTICAL = 0, 1, 2, 4
+
+
+@dataclass(frozen=True, slots=True)
+class MergedText:
+    """Merged text and how many conflict hunks it contains."""
+
+    text: str
+    conflicts: int
+
+
+class _Region:
+    """One merged change; ``mode`` says whose version it takes."""
+
+    __slots__ = ("mode", "i0", "chg0", "i1", "chg1", "i2", "chg2")
+
+    def __init__(self, mode, i0, chg0, i1, chg1, i2, chg2) -> None:
+        self.mode = mode
+        self.i0, self.chg0 = i0, chg0
+        self.i1, self.chg1 = i1, chg1
+        self.i2, self.chg2 = i2, chg2
+
+
+def merge3(
+    base: str,
+    ours: str,
+    theirs: str,
+    *,
+    metadata: Optional[MergeMetadata] = None,
+    style: Optional[ConflictStyle] = None,
+    labels: tuple[Optional[str], Optional[str], Optional[str]] = (
+        "ours",
+        "base",
+        "theirs",
+    ),
+    algorithm: Algorithm = "histogram",
+    level: MergeLevel = "zealous",
+) -> MergedText:
+    """Merge ``ours`` and ``theirs`` against ``base`` like git does.
+
+    Args:
+        base: Common ancestor content (``""`` for add/add conflicts).
+        ours: Content on the current branch (stage 2).
+        theirs: Content on the merged branch (stage 3).
+        metadata: Marker size and conflict style, as recorded for a case.
+        style: ``"merge"``, ``"diff3"`` or ``"zdiff3"``; overrides
+            ``metadata.conflict_style``.
+        labels: Text after the ``<<<<<<<``, ``|||||||`` and ``>>>>>>>``
+            markers, in that order; ``None`` writes a bare marker. ``git
+            merge`` uses ``HEAD``, the merge base and the merged branch.
+        algorithm: ``"histogram"`` (``git merge``) or ``"myers"``
+            (``git merge-file``).
+        level: How far conflicts are simplified: ``"eager"`` resolves
+            identical changes, ``"zealous"`` also trims lines both sides
+            agree on, ``"zealous_alnum"`` also joins conflicts separated
+            only by lines without letters or digits. ``diff3`` output stops
+            at ``"eager"``.
+
+    Returns:
+        A :class:`MergedText` with the merged text and the number of
+        conflict hunks in it.
+
+    Raises:
+        ValueError: For an unknown style, level or algorithm.
+    """
+    metadata = metadata or MergeMetadata()
+    style = style or metadata.conflict_style
+    if style not in ("merge", "diff3", "zdiff3"):
+        raise ValueError(f"Unknown conflict style: {style!r}")
+    if level not in _LEVELS:
+        raise ValueError(f"Unknown merge level: {level!r}")
+
+    o, a, b = split_lines(base), split_lines(ours), split_lines(theirs)
+    ids: dict[str, int] = {}
+    ho, ha, hb = intern_lines(ids, o), intern_lines(ids, a), intern_lines(ids, b)
+
+    ours_hunks = diff(ho, ha, algorithm)
+    if not ours_hunks:
+        return MergedText(theirs, 0)
+    theirs_hunks = diff(ho, hb, algorithm)
+    if not theirs_hunks:
+        return MergedText(ours, 0)
+
+    rank = _LEVELS.index(level)
+    if style == "diff3":
+        # diff3 shows the base, which only makes sense for unrefined conflicts.
+        rank = min(rank, _LEVELS.index("eager"))
+    regions = _combine(ours_hunks, theirs_hunks, ha, hb, len(o), len(a), len(b), rank)
+    if style == "zdiff3":
+        _trim_conflicts(regions, ha, hb)
+    elif rank >= _LEVELS.index("zealous"):
+        regions = _refine_conflicts(regions, ha, hb, algorithm)
+        _join_conflicts(regions, a, join_without_alnum=level == "zealous_alnum")
+
+    text = _render(regions, o, a, b, style, labels, metadata.marker_size)
+    return MergedText(text, sum(r.mode == _CONFLICT for r in regions))
+
+
+def _combine(
+    ours: list[Hunk],
+    theirs: list[Hunk],
+    ha: Sequence[int],
+    hb: Sequence[int],
+    n0: int,
+    n1: int,
+    n2: int,
+    rank: int,
+) -> list[_Region]:
+    """Walk both change lists over the base; touching changes conflict."""
+    regions: list[_Region] = []
+
+    def append(mode, i0, chg0, i1, chg1, i2, chg2):
+        last = regions[-1] if regions else None
+        if last and (i1 <= last.i1 + last.chg1 or i2 <= last.i2 + last.chg2):
+            if mode != last.mode:
+                last.mode = _CONFLICT
+            last.chg0 = i0 + chg0 - last.i0
+            last.chg1 = i1 + chg1 - last.i1
+            last.chg2 = i2 + chg2 - last.i2
+        else:
+            regions.append(_Region(mode, i0, chg0, i1, chg1, i2, chg2))
+
+    x, y = 0, 0
+    while x < len(ours) and y < len(theirs):
+        o1, a1, co1, ca1 = ours[x]
+        o2, b2, co2, cb2 = theirs[y]
+        if o1 + co1 < o2:
+            append(_OURS, o1, co1, a1, ca1, b2 - o2 + o1, co1)
+            x += 1
+            continue
+        if o2 + co2 < o1:
+            append(_THEIRS, o2, co2, a1 - o1 + o2, co2, b2, cb2)
+            y += 1
+            continue
+        if (
+            rank == 0
+            or o1 != o2
+            or co1 != co2
+            or ca1 != cb2
+            or ha[a1 : a1 + ca1] != hb[b2 : b2 + cb2]
+        ):
+            off = o1 - o2
+            ffo = off + co1 - co2
+            i0, i1, i2 = o1, a1, b2
+            if off > 0:
+                i0 -= off
+                i1 -= off
+            else:
+                i2 += off
+            chg0 = o1 + co1 - i0
+            chg1 = a1 + ca1 - i1
+            chg2 = b2 + cb2 - i2
+            if ffo < 0:
+                chg0 -= ffo
+                chg1 -= ffo
+            else:
+                chg2 += ffo
+            append(_CONFLICT, i0, chg0, i1, chg1, i2, chg2)
+        end1, end2 = o1 + co1, o2 + co2
+        if end1 >= end2:
+            y += 1
+        if end2 >= end1:
+            x += 1
+    for o1, a1, co1, ca1 in ours[x:]:
+        append(_OURS, o1, co1, a1, ca1, o1 + n2 - n0, co1)
+    for o2, b2, co2, cb2 in theirs[y:]:
+        append(_THEIRS, o2, co2, o2 + n1 - n0, co2, b2, cb2)
+    return regions
+
+
+def _refine_conflicts(
+    regions: list[_Region], ha: Sequence[int], hb: Sequence[int], algorithm: Algorithm
+) -> list[_Region]:
+    """Diff the two sides of each conflict and keep only where they differ."""
+    refined = []
+    for r in regions:
+        if r.mode != _CONFLICT or not r.chg1 or not r.chg2:
+            refined.append(r)
+            continue
+        hunks = diff(ha[r.i1 : r.i1 + r.chg1], hb[r.i2 : r.i2 + r.chg2], algorithm)
+        if not hunks:
+            r.mode = _IDENTICAL
+            refined.append(r)
+            continue
+        # Only the sides are narrowed; the base range is never shown at
+        # this level, so every part keeps that of the whole conflict.
+        i1, i2 = r.i1, r.i2
+        for k, (s1, s2, c1, c2) in enumerate(hunks):
+            part = r if k == 0 else _Region(_CONFLICT, r.i0, r.chg0, 0, 0, 0, 0)
+            part.i1, part.chg1 = i1 + s1, c1
+            part.i2, part.chg2 = i2 + s2, c2
+            refined.append(part)
+    return refined
+
+
+def _join_conflicts(
+    regions: list[_Region], a: Sequence[str], *, join_without_alnum: bool
+) -> None:
+    """Merge conflicts separated by at most three (or only non-alnum) lines."""
+    k = 0
+    while k + 1 < len(regions):
+        m, nxt = regions[k], regions[k + 1]
+        begin, end = m.i1 + m.chg1, nxt.i1
+        if (
+            m.mode != _CONFLICT
+            or nxt.mode != _CONFLICT
+            or (
+                end - begin > 3
+                and (
+                    not join_without_alnum
+                    or any(_ALNUM.search(line) for line in a[begin:end])
+                )
+            )
+        ):
+            k += 1
+            continue
+        m.chg0 = nxt.i0 + nxt.chg0 - m.i0
+        m.chg1 = nxt.i1 + nxt.chg1 - m.i1
+        m.chg2 = nxt.i2 + nxt.chg2 - m.i2
+        del regions[k + 1]
+
+
+def _trim_conflicts(
+    regions: list[_Region], ha: Sequence[int], hb: Sequence[int]
+) -> None:
+    """zdiff3: move lines both sides share out of each conflict's ends."""
+    for r in regions:
+        if r.mode != _CONFLICT:
+            continue
+        while r.chg1 and r.chg2 and ha[r.i1] == hb[r.i2]:
+            r.i1 += 1
+            r.i2 += 1
+            r.chg1 -= 1
+            r.chg2 -= 1
+        while r.chg1 and r.chg2 and ha[r.i1 + r.chg1 - 1] == hb[r.i2 + r.chg2 - 1]:
+            r.chg1 -= 1
+            r.chg2 -= 1
+
+
+def _eol_is_crlf(lines: Sequence[str], i: int) -> int:
+    """1 / 0 for CRLF / LF at line ``i``; -1 if it cannot be told."""
+    if i < len(lines) - 1:
+        return int(lines[i].endswith("\r\n"))
+    if not lines:
+        return -1
+    if lines[i].endswith("\n"):
+        return int(lines[i].endswith("\r\n"))
+    if i == 0:
+        return -1
+    return int(lines[i - 1].endswith("\r\n"))
+
+
+def _needs_cr(r: _Region, o, a, b) -> bool:
+    """Whether markers end in CRLF, judged from the lines around them."""
+    crlf = _eol_is_crlf(a, r.i1 - 1 if r.i1 else 0)
+    if crlf:
+        crlf = _eol_is_crlf(b, r.i2 - 1 if r.i2 else 0)
+    if crlf:
+        crlf = _eol_is_crlf(o, 0)
+    return crlf > 0
+
+
+def _copy(lines: Sequence[str], start: int, count: int, add_nl=False, cr=False) -> str:
+    if count < 1:
+        return ""
+    text = "".join(lines[start : start + count])
+    if add_nl and not text.endswith("\n"):
+        text += "\r\n" if cr else "\n"
+    return text
+
+
+def _render(
+    regions: list[_Region],
+    o: Sequence[str],
+    a: Sequence[str],
+    b: Sequence[str],
+    style: str,
+    labels: tuple[Optional[str], Optional[str], Optional[str]],
+    marker_size: int,
+) -> str:
+    if marker_size <= 0:
+        marker_size = 7
+    out = []
+    i = 0
+    for r in regions:
+        if r.mode == _IDENTICAL:
+            continue
+        out.append(_copy(a, i, r.i1 - i))
+        if r.mode == _CONFLICT:
+            cr = _needs_cr(r, o, a, b)
+            eol = "\r\n" if cr else "\n"
+
+            def marker(char: str, label: Optional[str]) -> str:
+                return char * marker_size + (f" {label}" if label else "") + eol
+
+            out.append(marker("<", labels[0]))
+            out.append(_copy(a, r.i1, r.chg1, True, cr))
+            if style != "merge":
+                out.append(marker("|", labels[1]))
+                out.append(_copy(o, r.i0, r.chg0, True, cr))
+            out.append(marker("=", None))
+            out.append(_copy(b, r.i2, r.chg2, True, cr))
+            out.append(marker(">", labels[2]))
+        elif r.mode == _OURS:
+            out.append(_copy(a, r.i1, r.chg1))
+        else:
+            out.append(_copy(b, r.i2, r.chg2))
+        i = r.i1 + r.chg1
+    out.append(_copy(a, i, len(a) - i))
+    return "".join(out)
+
+
+__all__ = [
+    "ConflictStyle",
+    "MergeLevel",
+    "MergedText",
+    "merge3",
+]
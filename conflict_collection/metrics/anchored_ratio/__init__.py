@@ -1,3 +1,19 @@
 from conflict_collection.metrics.anchored_ratio.anchored_ratio import anchored_ratio
+from conflict_collection.metrics.anchored_ratio.opcode_cache import (
+    CacheInfo,
+    OpcodeCache,
+)
+from conflict_collection.metrics.anchored_ratio.prepared import (
+    PreparedText,
+    TextLike,
+    prepare,
+)
 
-__all__ = ["anchored_ratio"]
+__all__ = [
+    "anchored_ratio",
+    "CacheInfo",
+    "OpcodeCache",
+    "PreparedText",
+    "TextLike",
+    "prepare",
+]
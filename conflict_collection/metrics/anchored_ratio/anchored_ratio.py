@@ -15,10 +15,13 @@ Design goals:
 """
 
 from difflib import SequenceMatcher
-from typing import Dict, Literal, Tuple
+from typing import Dict, Literal, Optional, Sequence, Tuple
 
 from Levenshtein import ratio as levenshtein_ratio
 
+from conflict_collection.metrics.anchored_ratio.opcode_cache import OpcodeCache
+from conflict_collection.metrics.anchored_ratio.prepared import PreparedText, TextLike
+
 Tag = Literal["replace", "delete", "insert", "equal"]
 
 
@@ -32,7 +35,14 @@ def _remove_empty_lines(text: str) -> list[str]:
     return [line for line in text.splitlines() if line.strip() != ""]
 
 
-def _opcodes(base_lines: list[str], target_lines: list[str]):
+def _as_prepared(text: TextLike) -> PreparedText:
+    """Reuse a :class:`PreparedText` as-is; tokenize a raw string (digest stays lazy)."""
+    if isinstance(text, PreparedText):
+        return text
+    return PreparedText(_remove_empty_lines(text))
+
+
+def _opcodes(base_lines: Sequence[str], target_lines: Sequence[str]):
     """Return difflib opcodes between a base and a target (no autojunk)."""
     return SequenceMatcher(a=base_lines, b=target_lines, autojunk=False).get_opcodes()
 
@@ -84,8 +94,8 @@ def _aligned_block_score(
 
 
 def _merged_union_change_intervals(
-    O_vs_R: list[Tuple[Tag, int, int, int, int]],
-    O_vs_R_hat: list[Tuple[Tag, int, int, int, int]],
+    O_vs_R: Sequence[Tuple[Tag, int, int, int, int]],
+    O_vs_R_hat: Sequence[Tuple[Tag, int, int, int, int]],
 ) -> list[Tuple[int, int]]:
     """
     Merge base-index intervals [start, end) where either R or R_hat has a change (tag != 'equal').
@@ -115,8 +125,8 @@ def _merged_union_change_intervals(
 
 
 def _project_base_subrange_to_target(
-    O_vs_target: list[Tuple[Tag, int, int, int, int]],
-    target_lines: list[str],
+    O_vs_target: Sequence[Tuple[Tag, int, int, int, int]],
+    target_lines: Sequence[str],
     base_slice_start: int,
     base_slice_end: int,
 ) -> list[str]:
@@ -164,8 +174,8 @@ def _project_base_subrange_to_target(
 
 
 def _build_insertions_map(
-    O_vs_target: list[Tuple[Tag, int, int, int, int]],
-    target_lines: list[str],
+    O_vs_target: Sequence[Tuple[Tag, int, int, int, int]],
+    target_lines: Sequence[str],
 ) -> Dict[int, list[str]]:
     """
     Build a map of base-slot-index -> list of inserted lines.
@@ -180,13 +190,37 @@ def _build_insertions_map(
     return insertions_by_slot
 
 
+def _opcodes_and_insertions(
+    base: PreparedText,
+    target: PreparedText,
+    cache: Optional[OpcodeCache],
+):
+    """Opcodes of base vs target plus their insertion map, via ``cache`` if given."""
+    if cache is None:
+        opcodes = _opcodes(base.lines, target.lines)
+        return opcodes, _build_insertions_map(opcodes, target.lines)
+
+    key = (base.digest, target.digest)
+    entry = cache.get(key)
+    if entry is None:
+        opcodes = tuple(_opcodes(base.lines, target.lines))
+        entry = (opcodes, _build_insertions_map(opcodes, target.lines))
+        cache.put(key, entry)
+    return entry
+
+
 # ----------------------------
 # Public API
 # ----------------------------
 
 
 def anchored_ratio(
-    O: str, R: str, R_hat: str, *, use_line_levenshtein: bool = True
+    O: TextLike,
+    R: TextLike,
+    R_hat: TextLike,
+    *,
+    use_line_levenshtein: bool = True,
+    cache: Optional[OpcodeCache] = None,
 ) -> float:
     """
     3-way anchored line similarity ratio in [0,1] for two edited versions (R, R_hat) against a base O.
@@ -209,17 +243,31 @@ def anchored_ratio(
       - Numerator   += aligned score between inserted lines
 
     If total denominator == 0, returns 1.0.
+
+    Pass an :class:`OpcodeCache` as ``cache`` to reuse base-vs-target opcodes
+    (and insertion maps) across calls that share (O, R) or (O, R_hat) pairs.
+    The result is identical with or without a cache.
+
+    Each text may be a ``str`` or a :class:`PreparedText`; prepared inputs
+    skip tokenization and reuse their precomputed digest as cache key.
     """
     if R == R_hat:
         return 1.0
 
-    base_lines: list[str] = _remove_empty_lines(O)
-    R_lines: list[str] = _remove_empty_lines(R)
-    R_hat_lines: list[str] = _remove_empty_lines(R_hat)
+    base = _as_prepared(O)
+    R_prepared = _as_prepared(R)
+    R_hat_prepared = _as_prepared(R_hat)
+    R_lines = R_prepared.lines
+    R_hat_lines = R_hat_prepared.lines
+    if R_lines == R_hat_lines:
+        # Identical after blank-line filtering -> every projection agrees.
+        return 1.0
 
-    # Opcodes
-    O_vs_R = _opcodes(base_lines, R_lines)
-    O_vs_R_hat = _opcodes(base_lines, R_hat_lines)
+    # Opcodes (and insertion maps, which derive from them)
+    O_vs_R, R_insertions_by_slot = _opcodes_and_insertions(base, R_prepared, cache)
+    O_vs_R_hat, R_hat_insertions_by_slot = _opcodes_and_insertions(
+        base, R_hat_prepared, cache
+    )
 
     # Union of changed base intervals
     merged_union_intervals = _merged_union_change_intervals(O_vs_R, O_vs_R_hat)
@@ -254,9 +302,6 @@ def anchored_ratio(
         )
 
     # Insertions (slot union)
-    R_insertions_by_slot = _build_insertions_map(O_vs_R, R_lines)
-    R_hat_insertions_by_slot = _build_insertions_map(O_vs_R_hat, R_hat_lines)
-
     denominator_insertions: int = 0
     numerator_insertions: float = 0.0
     for slot in set(R_insertions_by_slot) | set(R_hat_insertions_by_slot):
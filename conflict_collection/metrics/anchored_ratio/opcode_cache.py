@@ -0,0 +1,120 @@
+"""Opt-in LRU cache for base-vs-target opcodes used by :func:`anchored_ratio`.
+
+The same (O, R) / (O, R_hat) pairs tend to recur across metrics, epochs and
+ablations. Computing ``SequenceMatcher`` opcodes dominates the cost of a call,
+so an :class:`OpcodeCache` keeps the opcodes (and the derived insertion map)
+keyed by content digests of the two line sequences.
+
+Typical usage::
+
+    cache = OpcodeCache(maxsize=4096)
+    for O, R, R_hat in triples:
+        anchored_ratio(O, R, R_hat, cache=cache)
+    print(cache.info().hit_rate)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+Opcode = Tuple[str, int, int, int, int]
+CacheKey = Tuple[bytes, bytes]
+CacheEntry = Tuple[Tuple[Opcode, ...], Dict[int, list[str]]]
+
+
+def lines_digest(lines: Sequence[str]) -> bytes:
+    """Content digest of a (blank-line filtered) line sequence.
+
+    Lines never contain line separators after ``splitlines``, so joining on
+    ``"\\n"`` is unambiguous.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(len(lines).to_bytes(8, "little"))
+    hasher.update("\n".join(lines).encode("utf-8", "surrogatepass"))
+    return hasher.digest()
+
+
+class CacheInfo(NamedTuple):
+    """Snapshot of cache statistics, mirroring ``functools.lru_cache``."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache (0.0 when unused)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class OpcodeCache:
+    """Bounded LRU mapping ``(digest(base), digest(target))`` to opcodes.
+
+    Entries hold the opcode tuple and the insertion map derived from it.
+    Both are treated as read-only by the metric, so they are shared between
+    callers without copying. All operations are guarded by a lock, so one
+    cache can be shared across threads.
+
+    Args:
+        maxsize: Maximum number of (base, target) pairs retained. Must be
+            positive; least recently used entries are evicted first.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(base_lines: Sequence[str], target_lines: Sequence[str]) -> CacheKey:
+        """Build the lookup key for a base/target line pair."""
+        return lines_digest(base_lines), lines_digest(target_lines)
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Return the cached entry for ``key`` (refreshing its recency) or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Insert ``entry`` under ``key``, evicting the least recently used if full."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self._maxsize,
+                currsize=len(self._entries),
+            )
+
+    def clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["CacheInfo", "OpcodeCache", "lines_digest"]
@@ -0,0 +1,76 @@
+"""Pre-tokenized texts for repeated anchored scoring.
+
+:func:`anchored_ratio` splits and filters every input on every call. When one
+text takes part in many comparisons (a base scored against many candidates,
+a resolution indexed for retrieval), build a :class:`PreparedText` once and
+pass it wherever a ``str`` is accepted.
+"""
+
+import sys
+from typing import Optional, Sequence, Union
+
+from conflict_collection.metrics.anchored_ratio.opcode_cache import lines_digest
+
+
+class PreparedText:
+    """Blank-line filtered, interned lines of a text plus their content digest.
+
+    Lines are interned with :func:`sys.intern`, so equal lines across prepared
+    texts share one object and compare by identity first. The digest is the
+    same one :class:`OpcodeCache` keys on, so cached lookups never rehash.
+
+    Instances are immutable by convention and compare equal when their lines
+    are equal.
+
+    Args:
+        lines: Already filtered lines (no blank/whitespace-only entries).
+        digest: Precomputed :func:`lines_digest` of ``lines``; computed on
+            first access when omitted.
+    """
+
+    __slots__ = ("lines", "_digest")
+
+    def __init__(self, lines: Sequence[str], digest: Optional[bytes] = None) -> None:
+        self.lines: tuple[str, ...] = tuple(lines)
+        self._digest = digest
+
+    @classmethod
+    def from_text(cls, text: str) -> "PreparedText":
+        """Tokenize ``text`` the way :func:`anchored_ratio` does and hash it."""
+        lines = tuple(sys.intern(line) for line in text.splitlines() if line.strip())
+        return cls(lines, lines_digest(lines))
+
+    @property
+    def digest(self) -> bytes:
+        """Content digest of :attr:`lines`."""
+        if self._digest is None:
+            self._digest = lines_digest(self.lines)
+        return self._digest
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PreparedText):
+            return NotImplemented
+        return self is other or self.lines == other.lines
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __repr__(self) -> str:
+        return f"PreparedText(lines={len(self.lines)}, digest={self.digest.hex()[:12]})"
+
+
+TextLike = Union[str, PreparedText]
+"""Anything the anchored scoring APIs accept as a text."""
+
+
+def prepare(text: TextLike) -> PreparedText:
+    """Return ``text`` as a :class:`PreparedText`, reusing it if already prepared."""
+    if isinstance(text, PreparedText):
+        return text
+    return PreparedText.from_text(text)
+
+
+__all__ = ["PreparedText", "TextLike", "prepare"]
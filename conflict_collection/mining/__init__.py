@@ -0,0 +1,57 @@
+from conflict_collection.mining._git_ops import MergeCommit, list_merges
+from conflict_collection.mining.builder import (
+    BuildStats,
+    CorpusOutput,
+    MergeResult,
+    MiningPlan,
+    build_corpus,
+    mine_merge,
+    plan_merges,
+)
+from conflict_collection.mining.checkpoint import CheckpointManifest
+from conflict_collection.mining.distributed import (
+    Lease,
+    NodeStats,
+    ShardManifest,
+    ShardPlan,
+    combine_shards,
+    mine_shards,
+    shard_of,
+)
+from conflict_collection.mining.pool import WorktreePool
+from conflict_collection.mining.replay import ScratchWorktree
+from conflict_collection.mining.sampler import (
+    SampleStats,
+    classify_merge,
+    sample_corpus,
+)
+from conflict_collection.mining.scheduler import MiningScheduler, RepoProgress
+from conflict_collection.mining.watermark import Watermark
+
+__all__ = [
+    "BuildStats",
+    "CheckpointManifest",
+    "CorpusOutput",
+    "Lease",
+    "MergeCommit",
+    "MergeResult",
+    "MiningPlan",
+    "MiningScheduler",
+    "NodeStats",
+    "RepoProgress",
+    "SampleStats",
+    "ScratchWorktree",
+    "ShardManifest",
+    "ShardPlan",
+    "Watermark",
+    "WorktreePool",
+    "build_corpus",
+    "classify_merge",
+    "combine_shards",
+    "list_merges",
+    "mine_merge",
+    "mine_shards",
+    "plan_merges",
+    "sample_corpus",
+    "shard_of",
+]
@@ -0,0 +1,114 @@
+"""Git plumbing used to enumerate and replay merges."""
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Sequence, Union
+
+from git import GitCommandError, Repo
+
+Revisions = Union[str, Sequence[str]]
+"""A revision range as one string (``"v1..main"``) or rev-list arguments."""
+
+
+@dataclass(frozen=True, slots=True)
+class MergeCommit:
+    """A two-parent merge commit."""
+
+    sha: str
+    parents: tuple[str, str]
+    """``(ours, theirs)``: first and second parent."""
+
+
+def rev_list_args(revs: Revisions) -> list[str]:
+    return revs.split() if isinstance(revs, str) else list(revs)
+
+
+def list_merges(
+    repo: Repo, revs: Revisions, exclude: Iterable[str] = ()
+) -> list[MergeCommit]:
+    """Two-parent merges reachable from ``revs``, oldest first.
+
+    Equivalent git invocation:
+        git rev-list --merges --parents --reverse <revs> ^<exclude>...
+
+    Octopus merges (more than two parents) cannot be replayed as a single
+    three-way merge and are skipped with a warning.
+
+    Args:
+        repo: Repository handle.
+        revs: Revision range.
+        exclude: Commits whose ancestry is left out (e.g. previous tips).
+    """
+    out = repo.git.rev_list(
+        "--merges",
+        "--parents",
+        "--reverse",
+        *rev_list_args(revs),
+        *(f"^{sha}" for sha in exclude),
+    )
+    merges: list[MergeCommit] = []
+    for line in out.splitlines():
+        sha, *parents = line.split()
+        if len(parents) != 2:
+            logging.warning(f"Skipping octopus merge {sha} ({len(parents)} parents).")
+            continue
+        merges.append(MergeCommit(sha=sha, parents=(parents[0], parents[1])))
+    return merges
+
+
+def unmerged_paths(repo: Repo) -> list[str]:
+    """Paths with unmerged index entries (``git ls-files -u``)."""
+    out = repo.git.ls_files("-u", "-z")
+    return sorted({entry.split("\t", 1)[1] for entry in out.split("\0") if entry})
+
+
+def merge_tree_stages(repo: Repo, ours: str, theirs: str) -> list[tuple[int, str, str]]:
+    """Unmerged ``(stage, blob sha, path)`` entries of merging two commits.
+
+    Runs the merge in memory; no worktree, index or blob content is touched.
+    An empty list means the merge is clean.
+
+    Equivalent git invocation:
+        git merge-tree --write-tree -z --no-messages <ours> <theirs>
+    """
+    status, out, err = repo.git.merge_tree(
+        "--write-tree",
+        "-z",
+        "--no-messages",
+        ours,
+        theirs,
+        with_extended_output=True,
+        with_exceptions=False,
+        strip_newline_in_stdout=False,
+    )
+    if status not in (0, 1):  # 1 means conflicts; anything else is an error
+        raise GitCommandError(["git", "merge-tree", ours, theirs], status, err)
+    # "<tree>\0" then "<mode> <sha> <stage>\t<path>\0" per entry, ending at an
+    # empty entry (messages are suppressed).
+    entries: list[tuple[int, str, str]] = []
+    for entry in out.split("\0")[1:]:
+        if not entry:
+            break
+        info, path = entry.split("\t", 1)
+        _mode, sha, stage = info.split(" ")
+        entries.append((int(stage), sha, path))
+    return entries
+
+
+def resolve_revs(repo: Repo, revs: Revisions) -> list[str]:
+    """``revs`` pinned to shas: positive tips and ``^``-prefixed exclusions.
+
+    Equivalent git invocation:
+        git rev-parse --revs-only <revs>
+    """
+    out = repo.git.rev_parse("--revs-only", *rev_list_args(revs))
+    return [line for line in out.splitlines() if line]
+
+
+def commit_exists(repo: Repo, sha: str) -> bool:
+    """Whether ``sha`` names a commit in the object database."""
+    try:
+        repo.git.cat_file("-e", f"{sha}^{{commit}}")
+    except GitCommandError:
+        return False
+    return True
@@ -0,0 +1,355 @@
+"""Resumable corpus builder: replay every merge in a range and collect it.
+
+Output layout under ``output_dir``::
+
+    cases/part-*.jsonl[.gz|.zst]    ConflictCase records (+ "merge_sha")
+    social/part-*.jsonl[.gz|.zst]   SocialSignalsRecord records (+ "merge_sha")
+    checkpoint.jsonl                one line per finished merge (with its
+                                    case count, total and per type, and
+                                    its social record count)
+    watermark.json                  tips of fully mined ranges (incremental)
+
+A merge's records are flushed before its checkpoint line is written, and a
+rerun skips every merge the checkpoint has as clean or conflicted; failed
+merges are retried. If the process dies
+between those two steps, the records of that single merge are written again;
+consumers that need exactly-once can keep the last records of each
+``merge_sha``, as many as its checkpoint line counts.
+
+With ``incremental=True`` only merges added since the range was last fully
+mined are enumerated (see :mod:`conflict_collection.mining.watermark`).
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Union
+
+from git import GitCommandError, Repo
+
+from conflict_collection.collectors.conflict_type.collector import (
+    collect as collect_conflict_types,
+)
+from conflict_collection.collectors.societal.collector import (
+    collect as collect_societal_signals,
+)
+from conflict_collection.index.fingerprints import FingerprintStore
+from conflict_collection.io.jsonl import (
+    Compression,
+    ConflictCaseWriter,
+    SocialSignalsWriter,
+)
+from conflict_collection.io.spill import CaseSpool
+from conflict_collection.mining._git_ops import (
+    MergeCommit,
+    Revisions,
+    commit_exists,
+    list_merges,
+    resolve_revs,
+)
+from conflict_collection.mining.checkpoint import CheckpointManifest
+from conflict_collection.mining.replay import ScratchWorktree
+from conflict_collection.mining.watermark import Watermark
+from conflict_collection.schema.social_signals import SocialSignalsRecord
+from conflict_collection.schema.typed_five_tuple import ConflictCase
+
+CASES_DIR = "cases"
+SOCIAL_DIR = "social"
+CHECKPOINT_FILE = "checkpoint.jsonl"
+WATERMARK_FILE = "watermark.json"
+
+
+@dataclass(slots=True)
+class BuildStats:
+    """Counters for one :func:`build_corpus` run."""
+
+    merges: int = 0
+    """Merges enumerated: the whole range, or only new ones when incremental."""
+    skipped: int = 0
+    """Merges the checkpoint already has as done."""
+    clean: int = 0
+    conflicted: int = 0
+    failed: int = 0
+    cases: int = 0
+    social_records: int = 0
+    seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class MergeResult:
+    """What mining one merge produced."""
+
+    merge: MergeCommit
+    status: str
+    """``"clean"``, ``"conflicted"`` or ``"failed"``."""
+    cases: Sequence[ConflictCase] = field(default_factory=list)
+    social: list[SocialSignalsRecord] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def mine_merge(
+    worktree: ScratchWorktree,
+    merge: MergeCommit,
+    *,
+    societal: bool = True,
+    memory_budget: Optional[int] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+    file_timeout: Optional[float] = None,
+) -> MergeResult:
+    """Replay ``merge`` in ``worktree`` and run the collectors on it.
+
+    Collector and git errors are caught and reported as ``"failed"`` so one
+    bad merge does not abort a long build. ``memory_budget`` is passed to the
+    conflict type collector; ``fingerprints`` to both collectors (conflicts
+    already seen are skipped, social records are reused); ``file_timeout``
+    bounds the societal git work per conflicted file. A spooled result is
+    closed by :meth:`CorpusOutput.commit` once written.
+    """
+    cases: Sequence[ConflictCase] = []
+    try:
+        if not worktree.replay(merge):
+            return MergeResult(merge, "clean")
+        cases = collect_conflict_types(
+            worktree.repo, merge.sha, memory_budget=memory_budget, seen=fingerprints
+        )
+        social = (
+            collect_societal_signals(
+                worktree.repo, store=fingerprints, file_timeout=file_timeout
+            )
+            if societal
+            else {}
+        )
+        return MergeResult(merge, "conflicted", cases, list(social.values()))
+    except (GitCommandError, ValueError, UnicodeError) as e:
+        _close_cases(cases)
+        logging.error(f"Failed to mine merge {merge.sha}: {e}")
+        return MergeResult(merge, "failed", error=str(e))
+
+
+def _close_cases(cases: Sequence[ConflictCase]) -> None:
+    if isinstance(cases, CaseSpool):
+        cases.close()
+
+
+class CorpusOutput:
+    """Shard writers plus checkpoint for one output directory.
+
+    :meth:`commit` is the only write path and is guarded by a lock, so
+    several threads mining the same repository can share one output.
+    """
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path],
+        *,
+        compression: Compression = None,
+        max_shard_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest = CheckpointManifest(self.output_dir / CHECKPOINT_FILE)
+        self.watermark = Watermark(self.output_dir / WATERMARK_FILE)
+        self._cases = ConflictCaseWriter(
+            self.output_dir / CASES_DIR,
+            compression=compression,
+            max_shard_bytes=max_shard_bytes,
+        )
+        self._social = SocialSignalsWriter(
+            self.output_dir / SOCIAL_DIR,
+            compression=compression,
+            max_shard_bytes=max_shard_bytes,
+        )
+        self._lock = threading.Lock()
+
+    def commit(self, result: MergeResult) -> None:
+        """Write a merge's records, flush them, then checkpoint the merge.
+
+        A :class:`CaseSpool` in ``result.cases`` is closed afterwards; its
+        length stays available.
+        """
+        sha = result.merge.sha
+        fields: dict = {}
+        try:
+            with self._lock:
+                if result.status == "conflicted":
+                    extra = {"merge_sha": sha}
+                    types: Counter[str] = Counter()
+                    for case in result.cases:
+                        self._cases.write(case, extra=extra)
+                        types[case.conflict_type] += 1
+                    for record in result.social:
+                        self._social.write(record, extra=extra)
+                    self._cases.flush()
+                    self._social.flush()
+                    fields["cases"] = len(result.cases)
+                    fields["social"] = len(result.social)
+                    fields["types"] = dict(types)
+                elif result.status == "failed":
+                    fields["error"] = result.error
+                self.manifest.record(sha, result.status, **fields)
+        finally:
+            _close_cases(result.cases)
+
+    def close(self) -> None:
+        with self._lock:
+            self._cases.close()
+            self._social.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass(slots=True)
+class MiningPlan:
+    """Merges to mine for one repository and output."""
+
+    revs: Revisions
+    tips: list[str]
+    """Commits the range resolved to when the plan was made."""
+    merges: list[MergeCommit]
+    """Enumerated merges (only new ones for incremental plans)."""
+    pending: list[MergeCommit]
+    """``merges`` minus those the checkpoint has as done; failed merges stay
+    pending so they are retried."""
+
+
+def plan_merges(
+    repo_path: Union[str, Path],
+    revs: Revisions,
+    output: CorpusOutput,
+    *,
+    incremental: bool = False,
+) -> MiningPlan:
+    """Enumerate the merges of ``revs`` that ``output`` still lacks.
+
+    Incremental plans exclude the ancestry of the tips saved in the output's
+    watermark. Saved tips that no longer exist (e.g. garbage-collected after
+    a force-push) are dropped with a warning, widening the enumeration; the
+    checkpoint still prevents repeats.
+    """
+    repo = Repo(repo_path)
+    try:
+        # Pin refs once so enumeration and the saved tips agree.
+        resolved = resolve_revs(repo, revs)
+        tips = [sha for sha in resolved if not sha.startswith("^")]
+        exclude: list[str] = []
+        if incremental:
+            saved = output.watermark.tips(revs)
+            exclude = [sha for sha in saved if commit_exists(repo, sha)]
+            if len(exclude) < len(saved):
+                logging.warning(
+                    f"Watermark of {repo_path} names missing commits; "
+                    "enumerating without them."
+                )
+        merges = list_merges(repo, resolved, exclude)
+    finally:
+        repo.close()
+    pending = [m for m in merges if not output.manifest.is_done(m.sha)]
+    return MiningPlan(revs=revs, tips=tips, merges=merges, pending=pending)
+
+
+def _count(stats: BuildStats, result: MergeResult) -> None:
+    if result.status == "clean":
+        stats.clean += 1
+    elif result.status == "conflicted":
+        stats.conflicted += 1
+        stats.cases += len(result.cases)
+        stats.social_records += len(result.social)
+    else:
+        stats.failed += 1
+
+
+def build_corpus(
+    repo_path: Union[str, Path],
+    revs: Revisions,
+    output_dir: Union[str, Path],
+    *,
+    societal: bool = True,
+    compression: Compression = None,
+    max_shard_bytes: int = 256 * 1024 * 1024,
+    limit: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+    incremental: bool = False,
+    file_timeout: Optional[float] = None,
+    on_merge: Optional[Callable[[MergeCommit, str], None]] = None,
+) -> BuildStats:
+    """Mine every conflicting merge in ``revs`` into sharded JSONL.
+
+    Args:
+        repo_path: Repository to mine. Its checkout is not touched; merges
+            are replayed in a scratch worktree.
+        revs: Revision range, e.g. ``"main"`` or ``"v1.0..main"``.
+        output_dir: Output directory (see module docs for the layout).
+        societal: Also collect social signals per conflicted file.
+        compression: Shard compression (``None``, ``"gzip"``, ``"zstd"``).
+            Plain shards are safest for builds that may be killed: an
+            unclosed compressed shard lacks its end-of-stream marker.
+        max_shard_bytes: Shard rotation size.
+        limit: Process at most this many not-yet-finished merges.
+        memory_budget: Per-merge cap on resident case bodies, in bytes;
+            larger merges spill to a temporary file while being written.
+        fingerprints: Store shared with other builds (e.g. of forks) to skip
+            conflicts and reuse social records already collected.
+        incremental: Enumerate only merges added since ``revs`` was last
+            fully mined into ``output_dir``; a run that finishes every merge
+            without failures moves the watermark forward.
+        file_timeout: Seconds of societal git work allowed per conflicted
+            file; files over it get partially collected records.
+        on_merge: Progress callback, called with each merge and its status
+            (``"clean"``, ``"conflicted"`` or ``"failed"``).
+
+    Returns:
+        :class:`BuildStats` for this run.
+    """
+    started = time.perf_counter()
+
+    stats = BuildStats()
+    with (
+        CorpusOutput(
+            output_dir, compression=compression, max_shard_bytes=max_shard_bytes
+        ) as output,
+        ScratchWorktree(repo_path) as worktree,
+    ):
+        plan = plan_merges(repo_path, revs, output, incremental=incremental)
+        stats.merges = len(plan.merges)
+        stats.skipped = len(plan.merges) - len(plan.pending)
+        pending = plan.pending if limit is None else plan.pending[:limit]
+
+        for merge in pending:
+            result = mine_merge(
+                worktree,
+                merge,
+                societal=societal,
+                memory_budget=memory_budget,
+                fingerprints=fingerprints,
+                file_timeout=file_timeout,
+            )
+            output.commit(result)
+            _count(stats, result)
+            if on_merge is not None:
+                on_merge(merge, result.status)
+
+        # Failed merges must be retried, so the range is not fully mined yet.
+        if len(pending) == len(plan.pending) and not stats.failed:
+            output.watermark.update(revs, plan.tips)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+__all__ = [
+    "BuildStats",
+    "CorpusOutput",
+    "MergeResult",
+    "MiningPlan",
+    "build_corpus",
+    "mine_merge",
+    "plan_merges",
+]
@@ -0,0 +1,66 @@
+"""Append-only manifest of merges a build has finished."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Union
+
+
+class CheckpointManifest:
+    """JSONL manifest mapping merge sha -> outcome.
+
+    Each finished merge appends one line (``{"merge": sha, "status": ...}``)
+    that is flushed and fsynced before the next merge starts, so an
+    interrupted build loses at most the merge in flight. A torn final line
+    from a crash is ignored on load.
+
+    Args:
+        path: Manifest file (created on first :meth:`record`).
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._needs_newline = False
+        if self.path.exists():
+            with open(self.path, "rb") as raw:
+                raw.seek(0, os.SEEK_END)
+                if raw.tell():
+                    raw.seek(-1, os.SEEK_END)
+                    self._needs_newline = raw.read(1) != b"\n"
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.entries[entry["merge"]] = entry
+
+    def __contains__(self, sha: object) -> bool:
+        return sha in self.entries
+
+    def is_done(self, sha: str) -> bool:
+        """Whether ``sha`` finished without failing.
+
+        A failed merge is retried by the next run; its latest line wins.
+        """
+        entry = self.entries.get(sha)
+        return entry is not None and entry["status"] != "failed"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record(self, sha: str, status: str, **fields: Any) -> None:
+        """Durably mark ``sha`` as finished with ``status``."""
+        entry = {"merge": sha, "status": status, **fields}
+        with open(self.path, "a", encoding="utf-8") as fh:
+            if self._needs_newline:  # terminate a torn line before appending
+                fh.write("\n")
+                self._needs_newline = False
+            fh.write(json.dumps(entry) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.entries[sha] = entry
+
+
+__all__ = ["CheckpointManifest"]
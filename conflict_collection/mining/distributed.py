@@ -0,0 +1,586 @@
+"""Mine one revision range on several machines sharing a filesystem.
+
+Merges are assigned to a fixed number of shards by hashing their sha, so
+every node agrees on the assignment without talking to the others. Nodes
+coordinate only through files under the shared output directory::
+
+    plan.json              pinned revision range and shard count
+    leases/<shard>.lease   held by the node mining the shard
+    done/<shard>.json      written once the shard is fully mined
+    shards/<shard>/        the shard's output, in the build layout
+
+A node repeatedly claims a shard that is neither done nor leased, mines its
+merges, marks it done and moves on. The lease file is created exclusively
+and its mtime is refreshed by a heartbeat thread; a lease not refreshed for
+``lease_seconds`` belongs to a crashed node and is taken over. Each shard has
+its own checkpoint, so the new holder resumes at the first unfinished merge.
+A holder re-checks its lease right before committing each merge and stops,
+discarding that merge, once the lease was taken over.
+
+A merge can still end up written twice: by a holder that crashed after
+writing its records but before checkpointing them, or by an old holder that
+lost its lease during the commit itself. :func:`combine_shards` keeps only
+as many of a merge's records as its checkpoint line counts, the last ones.
+
+Once every shard is done, :func:`combine_shards` concatenates the shard
+outputs into one corpus with the :mod:`~conflict_collection.mining.builder`
+layout, including a watermark, so later incremental builds can continue it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Collection, Iterator, Optional, Union
+
+from git import Repo
+
+from conflict_collection.index.fingerprints import FingerprintStore
+from conflict_collection.io.jsonl import (
+    Compression,
+    JSONLShardWriter,
+    iter_jsonl,
+    shard_paths,
+)
+from conflict_collection.mining._git_ops import (
+    MergeCommit,
+    Revisions,
+    list_merges,
+    resolve_revs,
+    rev_list_args,
+)
+from conflict_collection.mining.builder import (
+    CASES_DIR,
+    CHECKPOINT_FILE,
+    SOCIAL_DIR,
+    WATERMARK_FILE,
+    BuildStats,
+    CorpusOutput,
+    _close_cases,
+    _count,
+    mine_merge,
+)
+from conflict_collection.mining.checkpoint import CheckpointManifest
+from conflict_collection.mining.replay import ScratchWorktree
+from conflict_collection.mining.watermark import Watermark
+
+PLAN_FILE = "plan.json"
+LEASES_DIR = "leases"
+DONE_DIR = "done"
+SHARDS_DIR = "shards"
+
+
+def shard_of(sha: str, shards: int) -> int:
+    """Shard of a merge: a stable hash of its sha, modulo ``shards``."""
+    digest = hashlib.blake2b(sha.encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def _shard_name(shard: int) -> str:
+    return f"{shard:05d}"
+
+
+def _write_atomic(path: Path, data: Any) -> None:
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+@dataclass(frozen=True, slots=True)
+class ShardPlan:
+    """The pinned range every node mines: same merges, same shards."""
+
+    revs: list[str]
+    resolved: list[str]
+    """``revs`` resolved to shas (``^``-prefixed for exclusions)."""
+    shards: int
+
+    @classmethod
+    def load_or_create(
+        cls, output_dir: Path, repo_path: Union[str, Path], revs: Revisions, shards: int
+    ) -> "ShardPlan":
+        """Read ``plan.json``, or pin ``revs`` and create it.
+
+        The first node to get here pins the range; the others adopt its
+        plan, so refs moving while nodes start up cannot split the corpus.
+
+        Raises:
+            ValueError: If an existing plan has another range or shard count.
+        """
+        if shards < 1:
+            raise ValueError(f"shards must be positive, got {shards}")
+        path = output_dir / PLAN_FILE
+        if not path.exists():
+            repo = Repo(repo_path)
+            try:
+                resolved = resolve_revs(repo, revs)
+            finally:
+                repo.close()
+            plan = cls(rev_list_args(revs), resolved, shards)
+            tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp.write_text(
+                json.dumps(
+                    {"revs": plan.revs, "resolved": resolved, "shards": shards},
+                    indent=2,
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            try:
+                os.link(tmp, path)  # exclusive: fails if another node won
+            except FileExistsError:
+                pass
+            finally:
+                tmp.unlink()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        plan = cls(data["revs"], data["resolved"], data["shards"])
+        if plan.revs != rev_list_args(revs) or plan.shards != shards:
+            raise ValueError(
+                f"{path} was planned for {' '.join(plan.revs)!r} in "
+                f"{plan.shards} shards, not {' '.join(rev_list_args(revs))!r} "
+                f"in {shards}"
+            )
+        return plan
+
+    @classmethod
+    def load(cls, output_dir: Path) -> "ShardPlan":
+        data = json.loads((output_dir / PLAN_FILE).read_text(encoding="utf-8"))
+        return cls(data["revs"], data["resolved"], data["shards"])
+
+    @property
+    def tips(self) -> list[str]:
+        return [sha for sha in self.resolved if not sha.startswith("^")]
+
+
+class Lease:
+    """Exclusive claim on one shard, kept alive by a heartbeat thread.
+
+    Use as a context manager: entering starts the heartbeat, leaving stops
+    it and deletes the lease file (unless it was taken over).
+    """
+
+    def __init__(self, path: Path, token: str, seconds: float) -> None:
+        self.path = path
+        self.token = token
+        self.seconds = seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lost = False
+
+    @property
+    def lost(self) -> bool:
+        """Whether another node has taken the shard over."""
+        return self._lost
+
+    def renew(self) -> bool:
+        """Refresh the lease; ``False`` (and :attr:`lost`) if no longer ours."""
+        if self._lost:
+            return False
+        try:
+            ours = self.path.read_text(encoding="utf-8") == self.token
+            if ours:
+                os.utime(self.path)
+        except FileNotFoundError:
+            ours = False
+        if not ours:
+            logging.warning(f"Lease {self.path} was taken over.")
+            self._lost = True
+        return ours
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.seconds / 3) and self.renew():
+            pass
+
+    def release(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if not self._lost:
+            try:
+                if self.path.read_text(encoding="utf-8") == self.token:
+                    self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "Lease":
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class ShardManifest:
+    """Shard completion and leases under a shared output directory.
+
+    Args:
+        output_dir: Shared output directory.
+        shards: Number of shards.
+        node: Name recorded in leases and completion files (default: host
+            name).
+        lease_seconds: Age after which an unrefreshed lease is stale.
+    """
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path],
+        shards: int,
+        *,
+        node: Optional[str] = None,
+        lease_seconds: float = 300.0,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.shards = shards
+        self.node = node or socket.gethostname()
+        self.lease_seconds = lease_seconds
+        for name in (LEASES_DIR, DONE_DIR):
+            (self.output_dir / name).mkdir(parents=True, exist_ok=True)
+
+    def _lease_path(self, shard: int) -> Path:
+        return self.output_dir / LEASES_DIR / f"{_shard_name(shard)}.lease"
+
+    def _done_path(self, shard: int) -> Path:
+        return self.output_dir / DONE_DIR / f"{_shard_name(shard)}.json"
+
+    def shard_dir(self, shard: int) -> Path:
+        return self.output_dir / SHARDS_DIR / _shard_name(shard)
+
+    def is_done(self, shard: int) -> bool:
+        return self._done_path(shard).exists()
+
+    def done(self) -> dict[int, dict[str, Any]]:
+        """Completion records of the finished shards."""
+        records = {}
+        for shard in range(self.shards):
+            path = self._done_path(shard)
+            if path.exists():
+                records[shard] = json.loads(path.read_text(encoding="utf-8"))
+        return records
+
+    def claim(self, shard: int) -> Optional[Lease]:
+        """Lease ``shard``, taking over a stale lease; ``None`` if held."""
+        path = self._lease_path(shard)
+        token = f"{self.node} {os.getpid()} {uuid.uuid4().hex}"
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._take_over(path):
+                    return None
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(token)
+            if self.is_done(shard):  # finished while we were looking
+                path.unlink()
+                return None
+            return Lease(path, token, self.lease_seconds)
+        return None
+
+    def _take_over(self, path: Path) -> bool:
+        """Remove ``path`` if stale. Only one of several racing nodes wins."""
+        try:
+            if time.time() - path.stat().st_mtime <= self.lease_seconds:
+                return False
+            grave = path.with_name(f"{path.name}.{uuid.uuid4().hex}.stale")
+            os.rename(path, grave)
+        except FileNotFoundError:
+            return True  # released meanwhile; try to create it
+        if time.time() - grave.stat().st_mtime <= self.lease_seconds:
+            # Renewed, or re-created by a faster node, between stat and
+            # rename: put it back unless yet another lease appeared.
+            try:
+                os.link(grave, path)
+            except FileExistsError:
+                pass
+            grave.unlink()
+            return False
+        logging.warning(f"Taking over stale lease {path}.")
+        grave.unlink()
+        return True
+
+    def claim_next(self, exclude: Collection[int] = ()) -> Optional[tuple[int, Lease]]:
+        """Lease some shard that is neither done, held nor in ``exclude``.
+
+        Each node scans from its own starting shard so nodes starting
+        together rarely contend for the same lease.
+        """
+        start = shard_of(f"{self.node} {os.getpid()}", self.shards)
+        for offset in range(self.shards):
+            shard = (start + offset) % self.shards
+            if shard in exclude or self.is_done(shard):
+                continue
+            lease = self.claim(shard)
+            if lease is not None:
+                return shard, lease
+        return None
+
+    def complete(self, shard: int, **fields: Any) -> None:
+        """Atomically mark ``shard`` done."""
+        _write_atomic(
+            self._done_path(shard),
+            {"shard": shard, "node": self.node, "finished": time.time(), **fields},
+        )
+
+
+@dataclass(slots=True)
+class NodeStats(BuildStats):
+    """Counters for one node's :func:`mine_shards` run."""
+
+    node: str = ""
+    shards: list[int] = field(default_factory=list)
+    """Shards this node completed."""
+    unfinished: list[int] = field(default_factory=list)
+    """Shards this node mined but left unfinished because merges failed."""
+
+
+def mine_shards(
+    repo_path: Union[str, Path],
+    revs: Revisions,
+    output_dir: Union[str, Path],
+    shards: int,
+    *,
+    node: Optional[str] = None,
+    lease_seconds: float = 300.0,
+    max_shards: Optional[int] = None,
+    societal: bool = True,
+    compression: Compression = None,
+    max_shard_bytes: int = 256 * 1024 * 1024,
+    memory_budget: Optional[int] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+    file_timeout: Optional[float] = None,
+    on_merge: Optional[Callable[[MergeCommit, str], None]] = None,
+) -> NodeStats:
+    """Mine shards of ``revs`` into a shared ``output_dir`` until none is left.
+
+    Run it on every node (or in several processes) with the same ``revs``,
+    ``output_dir`` and ``shards``. It returns when every shard is done,
+    leased by a live node or already tried by this run; run
+    :func:`combine_shards` once all are done. A shard with failed merges is
+    left unfinished (see ``NodeStats.unfinished``), so the next run retries
+    them, as the checkpoint does for :func:`~conflict_collection.mining.builder.build_corpus`.
+
+    Args:
+        repo_path: This node's clone of the repository.
+        revs: Revision range, pinned by the first node in ``plan.json``.
+        output_dir: Shared output directory (see module docs).
+        shards: Number of shards the merges are split into. More shards than
+            nodes balance load better and lose less work to a crash.
+        node: Name of this node in leases and completion files.
+        lease_seconds: Age after which a lease is considered abandoned.
+        max_shards: Complete at most this many shards, then return.
+        societal, compression, max_shard_bytes, memory_budget, fingerprints,
+        file_timeout, on_merge: As for
+            :func:`~conflict_collection.mining.builder.build_corpus`.
+
+    Raises:
+        ValueError: If ``output_dir`` was planned with another range or
+            shard count.
+    """
+    started = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    plan = ShardPlan.load_or_create(output_dir, repo_path, revs, shards)
+    manifest = ShardManifest(output_dir, shards, node=node, lease_seconds=lease_seconds)
+    stats = NodeStats(node=manifest.node)
+
+    repo = Repo(repo_path)
+    try:
+        merges = list_merges(repo, plan.resolved)
+    finally:
+        repo.close()
+    by_shard: dict[int, list[MergeCommit]] = {}
+    for merge in merges:
+        by_shard.setdefault(shard_of(merge.sha, shards), []).append(merge)
+
+    attempted: set[int] = set()
+    with ScratchWorktree(repo_path) as worktree:
+        while max_shards is None or len(stats.shards) < max_shards:
+            claimed = manifest.claim_next(exclude=attempted)
+            if claimed is None:
+                break
+            shard, lease = claimed
+            attempted.add(shard)
+            with (
+                lease,
+                CorpusOutput(
+                    manifest.shard_dir(shard),
+                    compression=compression,
+                    max_shard_bytes=max_shard_bytes,
+                ) as output,
+            ):
+                shard_merges = by_shard.get(shard, [])
+                stats.merges += len(shard_merges)
+                for merge in shard_merges:
+                    if output.manifest.is_done(merge.sha):
+                        stats.skipped += 1
+                        continue
+                    if lease.lost:
+                        break
+                    result = mine_merge(
+                        worktree,
+                        merge,
+                        societal=societal,
+                        memory_budget=memory_budget,
+                        fingerprints=fingerprints,
+                        file_timeout=file_timeout,
+                    )
+                    # Mining can outlast a heartbeat; check ownership afresh.
+                    if not lease.renew():
+                        _close_cases(result.cases)
+                        break
+                    output.commit(result)
+                    _count(stats, result)
+                    if on_merge is not None:
+                        on_merge(merge, result.status)
+                if not lease.renew():
+                    continue
+                if not all(output.manifest.is_done(m.sha) for m in shard_merges):
+                    # Failed merges keep the shard open for the next run.
+                    stats.unfinished.append(shard)
+                    continue
+                manifest.complete(
+                    shard,
+                    merges=len(shard_merges),
+                    cases=sum(
+                        entry.get("cases", 0)
+                        for entry in output.manifest.entries.values()
+                    ),
+                )
+                stats.shards.append(shard)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def _copy_records(
+    sources: Iterator[Path],
+    directory: Path,
+    kept: dict[str, Optional[int]],
+    compression: Compression,
+    max_shard_bytes: int,
+) -> int:
+    """Copy the last ``kept[sha]`` records of each merge in ``kept``.
+
+    Records of a merge written more than once precede those of the commit
+    its checkpoint line counts. ``None`` keeps all of a merge's records.
+    """
+    paths = [
+        path for source in sources if source.is_dir() for path in shard_paths(source)
+    ]
+    totals = Counter(record.get("merge_sha") for record in iter_jsonl(paths))
+    seen: Counter[str] = Counter()
+    with JSONLShardWriter(
+        directory, compression=compression, max_shard_bytes=max_shard_bytes
+    ) as writer:
+        for record in iter_jsonl(paths):
+            sha = record.get("merge_sha")
+            if sha not in kept:
+                continue
+            seen[sha] += 1
+            count = kept[sha]
+            if count is None or seen[sha] > totals[sha] - count:
+                writer.write_dict(record)
+        return writer.records_written
+
+
+def combine_shards(
+    output_dir: Union[str, Path],
+    dest: Union[str, Path],
+    *,
+    compression: Compression = None,
+    max_shard_bytes: int = 256 * 1024 * 1024,
+) -> BuildStats:
+    """Concatenate the finished shards of ``output_dir`` into one corpus.
+
+    ``dest`` gets the :mod:`~conflict_collection.mining.builder` layout:
+    records of shard 0 first, then shard 1 and so on; one checkpoint line
+    per merge; and a watermark for the planned range, so an incremental
+    build into ``dest`` mines only merges added later. As in a build, the
+    watermark is not written if a combined merge failed, so that build
+    retries it. Records of merges
+    written more than once (see module docs) are kept once, and records of
+    merges not checkpointed as conflicted are dropped.
+
+    Returns:
+        :class:`BuildStats` of the combined corpus (``seconds`` is the time
+        spent combining).
+
+    Raises:
+        ValueError: If some shard is not done.
+        FileExistsError: If ``dest`` already has a checkpoint.
+    """
+    started = time.perf_counter()
+    output_dir, dest = Path(output_dir), Path(dest)
+    plan = ShardPlan.load(output_dir)
+    manifest = ShardManifest(output_dir, plan.shards)
+    missing = sorted(set(range(plan.shards)) - set(manifest.done()))
+    if missing:
+        raise ValueError(f"shards not done yet: {missing}")
+    dest.mkdir(parents=True, exist_ok=True)
+    if (dest / CHECKPOINT_FILE).exists():
+        raise FileExistsError(dest / CHECKPOINT_FILE)
+
+    shard_dirs = [manifest.shard_dir(shard) for shard in range(plan.shards)]
+    entries = [
+        entry
+        for d in shard_dirs
+        for entry in CheckpointManifest(d / CHECKPOINT_FILE).entries.values()
+    ]
+    conflicted = [e for e in entries if e["status"] == "conflicted"]
+    stats = BuildStats()
+    stats.cases = _copy_records(
+        (d / CASES_DIR for d in shard_dirs),
+        dest / CASES_DIR,
+        {e["merge"]: e.get("cases") for e in conflicted},
+        compression,
+        max_shard_bytes,
+    )
+    stats.social_records = _copy_records(
+        (d / SOCIAL_DIR for d in shard_dirs),
+        dest / SOCIAL_DIR,
+        {e["merge"]: e.get("social") for e in conflicted},
+        compression,
+        max_shard_bytes,
+    )
+
+    # Written in one go and renamed into place: the checkpoint marks the
+    # combined corpus as complete.
+    tmp = dest / f"{CHECKPOINT_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        for entry in entries:
+            fh.write(json.dumps(entry) + "\n")
+            stats.merges += 1
+            if entry["status"] == "clean":
+                stats.clean += 1
+            elif entry["status"] == "conflicted":
+                stats.conflicted += 1
+            else:
+                stats.failed += 1
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, dest / CHECKPOINT_FILE)
+    if not stats.failed:
+        Watermark(dest / WATERMARK_FILE).update(plan.revs, plan.tips)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+__all__ = [
+    "Lease",
+    "NodeStats",
+    "ShardManifest",
+    "ShardPlan",
+    "combine_shards",
+    "mine_shards",
+    "shard_of",
+]
@@ -0,0 +1,122 @@
+"""A bounded pool of reusable scratch worktrees for one repository.
+
+Adding a worktree costs a full checkout, so replaying thousands of merges
+with a fresh worktree each time is dominated by I/O. The pool creates at
+most ``size`` worktrees on demand, all sharing the repository's object
+database, and hands them out through leases. A returned worktree is reset
+(``reset --hard`` + ``clean``) and reused by the next lease. If the reset
+fails, the worktree is discarded and a new one is created when needed.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from git import GitCommandError
+
+from conflict_collection.mining.replay import ScratchWorktree
+
+
+class WorktreePool:
+    """Lease out up to ``size`` reusable :class:`ScratchWorktree`\\ s.
+
+    Thread-safe. :meth:`lease` blocks while every worktree is in use.
+
+    Args:
+        repo_path: Repository the worktrees belong to.
+        size: Maximum number of worktrees.
+        directory: Parent directory for the worktrees (default: system temp).
+    """
+
+    def __init__(
+        self,
+        repo_path: Union[str, Path],
+        size: int,
+        *,
+        directory: Optional[Union[str, Path]] = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"size must be >= 1, got {size}")
+        self.repo_path = Path(repo_path)
+        self.size = size
+        self.directory = directory
+        self.created = 0
+        """Worktrees created over the pool's lifetime."""
+        self.discarded = 0
+        """Worktrees dropped because their reset failed."""
+        self._idle: list[ScratchWorktree] = []
+        self._leased = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> ScratchWorktree:
+        """Take a worktree, creating one if below ``size``.
+
+        Raises:
+            TimeoutError: If none became free within ``timeout`` seconds.
+            RuntimeError: If the pool is closed.
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._closed
+                or self._idle
+                or self._leased + len(self._idle) < self.size,
+                timeout,
+            )
+            if self._closed:
+                raise RuntimeError("WorktreePool is closed")
+            if not ready:
+                raise TimeoutError(f"No worktree free within {timeout}s")
+            self._leased += 1
+            if self._idle:
+                return self._idle.pop()
+            self.created += 1
+        return ScratchWorktree(self.repo_path, directory=self.directory)
+
+    def release(self, worktree: ScratchWorktree) -> None:
+        """Reset ``worktree`` and return it to the pool (or discard it)."""
+        try:
+            worktree.reset()
+            keep = True
+        except GitCommandError as e:
+            logging.warning(f"Discarding worktree {worktree.path}: {e}")
+            keep = False
+        with self._cond:
+            self._leased -= 1
+            reuse = keep and not self._closed
+            if reuse:
+                self._idle.append(worktree)
+            if not keep:
+                self.discarded += 1
+            self._cond.notify()
+        if not reuse:
+            worktree.close()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[ScratchWorktree]:
+        """``with pool.lease() as worktree: ...``"""
+        worktree = self.acquire(timeout)
+        try:
+            yield worktree
+        finally:
+            self.release(worktree)
+
+    def close(self) -> None:
+        """Remove idle worktrees; leased ones are removed when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worktree in idle:
+            worktree.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ["WorktreePool"]
@@ -0,0 +1,150 @@
+"""Re-create a merge's conflicted state in a scratch worktree.
+
+The collectors read an *in-progress* merge (unmerged index, ``MERGE_HEAD``,
+marker-laden files), so mining history means checking out each merge's first
+parent and re-running ``git merge --no-commit`` with the second. Doing that in
+a detached ``git worktree`` leaves the user's checkout untouched and shares
+the object database, so no clone is needed.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from git import GitCommandError, Repo
+
+from conflict_collection.mining._git_ops import MergeCommit, unmerged_paths
+
+_ADD_LOCKS: dict[Path, threading.Lock] = {}
+_ADD_LOCKS_GUARD = threading.Lock()
+_ADD_ATTEMPTS = 3
+
+
+def _add_lock(repo_path: Path) -> threading.Lock:
+    with _ADD_LOCKS_GUARD:
+        return _ADD_LOCKS.setdefault(repo_path.resolve(), threading.Lock())
+
+
+class ScratchWorktree:
+    """A detached worktree of ``repo_path`` used to replay merges.
+
+    Use as a context manager; the worktree is removed (and pruned from the
+    main repository) on exit.
+
+    Args:
+        repo_path: Repository whose history is mined.
+        path: Where to create the worktree. Defaults to a fresh temp dir.
+        directory: Parent of that temp dir (e.g. a fast local disk);
+            ignored when ``path`` is given.
+    """
+
+    def __init__(
+        self,
+        repo_path: Union[str, Path],
+        path: Optional[Union[str, Path]] = None,
+        *,
+        directory: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.repo_path = Path(repo_path)
+        self._main = Repo(self.repo_path)
+        self._tmpdir: Optional[str] = None
+        if path is None:
+            self._tmpdir = tempfile.mkdtemp(
+                prefix="conflict-collection-", dir=directory
+            )
+            # A unique basename keeps git's worktree admin names from
+            # colliding when several worktrees are added concurrently.
+            path = Path(self._tmpdir) / Path(self._tmpdir).name
+        self.path = Path(path)
+        self._repo: Optional[Repo] = None
+        self._dirty = False
+
+    @property
+    def repo(self) -> Repo:
+        if self._repo is None:
+            # `git worktree add` reads every other worktree's admin files and
+            # fails on one that is half written, so adds to one repository
+            # are serialised here and retried for adds from other processes.
+            with _add_lock(self.repo_path):
+                for attempt in range(_ADD_ATTEMPTS):
+                    try:
+                        # --no-checkout: the first replay's checkout populates
+                        # the files.
+                        self._main.git.worktree(
+                            "add", "--detach", "--no-checkout", str(self.path), "HEAD"
+                        )
+                        break
+                    except GitCommandError:
+                        if attempt == _ADD_ATTEMPTS - 1:
+                            raise
+                        time.sleep(0.05 * (attempt + 1))
+            self._repo = Repo(self.path)
+        return self._repo
+
+    def reset(self) -> None:
+        """Drop any in-progress merge and untracked files.
+
+        A no-op unless a merge was replayed since the last reset.
+        """
+        if not self._dirty:
+            return
+        self.repo.git.reset("--hard", "-q")
+        self.repo.git.clean("-fdxq")
+        self._dirty = False
+
+    def replay(self, merge: MergeCommit) -> bool:
+        """Check out ``merge``'s first parent and merge its second, without committing.
+
+        Returns:
+            ``True`` if the merge stopped with conflicts (the worktree is then
+            ready for the collectors), ``False`` if it merged cleanly.
+        """
+        self.reset()
+        repo = self.repo
+        self._dirty = True
+        repo.git.checkout("--detach", "--force", "-q", merge.parents[0])
+        try:
+            # rerere would silently replay recorded resolutions and hide conflicts.
+            repo.git.execute(
+                [
+                    "git",
+                    "-c",
+                    "rerere.enabled=false",
+                    "merge",
+                    "--no-commit",
+                    "--no-ff",
+                    "-q",
+                    merge.parents[1],
+                ]
+            )
+        except GitCommandError:
+            if not unmerged_paths(repo):
+                raise
+            return True
+        return bool(unmerged_paths(repo))
+
+    def close(self) -> None:
+        """Remove the worktree and its temp dir."""
+        if self._repo is not None:
+            self._repo.close()
+            self._repo = None
+            try:
+                self._main.git.worktree("remove", "--force", str(self.path))
+            except GitCommandError:
+                self._main.git.worktree("prune")
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+        self._main.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ["ScratchWorktree"]
@@ -0,0 +1,189 @@
+"""Stratified sampling of merges by conflict type under per-type quotas.
+
+Mining a whole history to get, say, a few hundred ``delete_modify`` cases
+wastes most of the work on the abundant ``modify_modify`` ones. The sampler
+classifies each merge first, from index stages alone: ``git merge-tree
+--write-tree`` runs the merge in memory and lists its unmerged entries, which
+are grouped into conflict families and typed by the stages present, with no
+worktree checkout and no blob reads. Only merges with a conflict of a type
+still under quota are replayed and collected, and sampling stops once every
+quota is met.
+
+The output directory has the :mod:`~conflict_collection.mining.builder`
+layout; each mined merge's checkpoint line also records its case count per
+type (``"types"``), from which a rerun resumes the quotas. Merges classified
+but not needed are not checkpointed, so a rerun with larger quotas
+reconsiders them.
+"""
+
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Mapping, Optional, Union
+
+from git import GitCommandError, Repo
+
+from conflict_collection.collectors.conflict_type._git_ops import (
+    CONFLICT_TYPE_BY_STAGES,
+    group_stage_rows,
+)
+from conflict_collection.index.fingerprints import FingerprintStore
+from conflict_collection.io.jsonl import Compression
+from conflict_collection.mining._git_ops import (
+    MergeCommit,
+    Revisions,
+    merge_tree_stages,
+)
+from conflict_collection.mining.builder import CorpusOutput, mine_merge, plan_merges
+from conflict_collection.mining.replay import ScratchWorktree
+from conflict_collection.schema.typed_five_tuple import ALL_CONFLICT_TYPES
+
+
+def classify_merge(repo: Repo, merge: MergeCommit) -> Counter[str]:
+    """Conflict type counts of ``merge``, from index stages only.
+
+    Empty for a merge that replays cleanly.
+    """
+    stages = merge_tree_stages(repo, *merge.parents)
+    families = group_stage_rows(
+        (stage, sha, Path(path), sha) for stage, sha, path in stages
+    )
+    return Counter(
+        CONFLICT_TYPE_BY_STAGES[frozenset(family)] for family in families.values()
+    )
+
+
+@dataclass(slots=True)
+class SampleStats:
+    """Counters for one :func:`sample_corpus` run."""
+
+    merges: int = 0
+    """Merges enumerated in the range."""
+    skipped: int = 0
+    """Merges the checkpoint already has as done."""
+    classified: int = 0
+    mined: int = 0
+    failed: int = 0
+    cases: dict[str, int] = field(default_factory=dict)
+    """Cases per conflict type in the output, including earlier runs."""
+    complete: bool = False
+    """Whether every quota is met."""
+    seconds: float = 0.0
+
+
+def sample_corpus(
+    repo_path: Union[str, Path],
+    revs: Revisions,
+    output_dir: Union[str, Path],
+    quotas: Mapping[str, int],
+    *,
+    seed: Optional[int] = None,
+    societal: bool = True,
+    compression: Compression = None,
+    max_shard_bytes: int = 256 * 1024 * 1024,
+    memory_budget: Optional[int] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+    file_timeout: Optional[float] = None,
+    on_merge: Optional[Callable[[MergeCommit, str], None]] = None,
+) -> SampleStats:
+    """Mine merges of ``revs`` until each conflict type has its quota of cases.
+
+    Merges are considered oldest first, or in a random order fixed by
+    ``seed``. Each is classified (see :func:`classify_merge`) and mined only
+    if it has a conflict of a type whose quota is not yet met; all its cases
+    are kept, so types can end up above quota.
+
+    Args:
+        repo_path: Repository to mine; merges are replayed in a scratch
+            worktree.
+        revs: Revision range, e.g. ``"main"`` or ``"v1.0..main"``.
+        output_dir: Output directory (see
+            :mod:`~conflict_collection.mining.builder`).
+        quotas: Minimum number of cases per conflict type. Types left out
+            are not sought, but kept when a mined merge has them.
+        seed: Shuffle the merges with this seed instead of taking them
+            oldest first.
+        societal, compression, max_shard_bytes, memory_budget, fingerprints,
+        file_timeout: As for :func:`~conflict_collection.mining.builder.build_corpus`.
+        on_merge: Progress callback, called with each considered merge and
+            ``"unneeded"`` or the status it was mined with.
+
+    Returns:
+        :class:`SampleStats` for this run.
+
+    Raises:
+        ValueError: If a quota names an unknown type or is negative.
+    """
+    for conflict_type, quota in quotas.items():
+        if conflict_type not in ALL_CONFLICT_TYPES:
+            raise ValueError(f"unknown conflict type {conflict_type!r}")
+        if quota < 0:
+            raise ValueError(f"negative quota for {conflict_type}: {quota}")
+    started = time.perf_counter()
+
+    stats = SampleStats()
+    with (
+        CorpusOutput(
+            output_dir, compression=compression, max_shard_bytes=max_shard_bytes
+        ) as output,
+        ScratchWorktree(repo_path) as worktree,
+    ):
+        plan = plan_merges(repo_path, revs, output)
+        stats.merges = len(plan.merges)
+        stats.skipped = len(plan.merges) - len(plan.pending)
+
+        counts: Counter[str] = Counter()
+        for entry in output.manifest.entries.values():
+            counts.update(entry.get("types", {}))
+
+        def missing() -> set[str]:
+            return {t for t, quota in quotas.items() if counts[t] < quota}
+
+        pending = list(plan.pending)
+        if seed is not None:
+            random.Random(seed).shuffle(pending)
+
+        repo = Repo(repo_path)
+        try:
+            for merge in pending:
+                wanted = missing()
+                if not wanted:
+                    break
+                try:
+                    types = classify_merge(repo, merge)
+                except GitCommandError:
+                    types = None  # let the replay decide and report it
+                stats.classified += 1
+                if types is not None and not wanted.intersection(types):
+                    if on_merge is not None:
+                        on_merge(merge, "unneeded")
+                    continue
+
+                result = mine_merge(
+                    worktree,
+                    merge,
+                    societal=societal,
+                    memory_budget=memory_budget,
+                    fingerprints=fingerprints,
+                    file_timeout=file_timeout,
+                )
+                output.commit(result)
+                stats.mined += 1
+                if result.status == "failed":
+                    stats.failed += 1
+                counts.update(output.manifest.entries[merge.sha].get("types", {}))
+                if on_merge is not None:
+                    on_merge(merge, result.status)
+        finally:
+            repo.close()
+
+        stats.cases = dict(counts)
+        stats.complete = not missing()
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+__all__ = ["SampleStats", "classify_merge", "sample_corpus"]
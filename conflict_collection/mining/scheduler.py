@@ -0,0 +1,304 @@
+"""Mine many repositories at once on a shared worker pool.
+
+Every (repository, merge) pair is a job. A single dispatcher thread hands
+jobs to a global :class:`~concurrent.futures.ThreadPoolExecutor`, taking
+repositories round-robin and never running more than ``per_repo_limit``
+jobs of one repository at a time, so one huge repository cannot monopolise
+the pool or thrash its packfile. Git work happens in subprocesses, so
+threads overlap well despite the GIL.
+
+Each in-flight job leases a scratch worktree from its repository's
+:class:`~conflict_collection.mining.pool.WorktreePool` (sized
+``per_repo_limit``) and passes the worktree's long-lived ``Repo`` handle
+straight to the collectors. Results are written by the dispatcher through
+:class:`~conflict_collection.mining.builder.CorpusOutput`, one output
+directory per repository, with the same checkpoint/resume behaviour as
+:func:`~conflict_collection.mining.builder.build_corpus`.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
+
+from git import GitCommandError, InvalidGitRepositoryError
+
+from conflict_collection.index.fingerprints import FingerprintStore
+from conflict_collection.io.jsonl import Compression
+from conflict_collection.mining._git_ops import MergeCommit, Revisions
+from conflict_collection.mining.builder import (
+    CorpusOutput,
+    MergeResult,
+    MiningPlan,
+    mine_merge,
+    plan_merges,
+)
+from conflict_collection.mining.pool import WorktreePool
+
+
+@dataclass(slots=True)
+class RepoProgress:
+    """Progress of one repository within a scheduler run."""
+
+    name: str
+    """Output directory name (the repository directory's name)."""
+    path: str
+    merges: int = 0
+    """Merges enumerated: the whole range, or only new ones when incremental."""
+    skipped: int = 0
+    """Merges the checkpoint already has as done."""
+    done: int = 0
+    """Merges mined in this run."""
+    clean: int = 0
+    conflicted: int = 0
+    failed: int = 0
+    cases: int = 0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    """Why the repository could not be mined at all (e.g. a bad revision
+    range); ``None`` otherwise."""
+
+    @property
+    def remaining(self) -> int:
+        return self.merges - self.skipped - self.done
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Merges mined per second so far."""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+
+class _RepoState:
+    def __init__(
+        self, progress: RepoProgress, output: CorpusOutput, pool: WorktreePool
+    ) -> None:
+        self.progress = progress
+        self.output = output
+        self.pool = pool
+        self.plan: Optional[MiningPlan] = None
+        self.pending: deque[MergeCommit] = deque()
+        self.in_flight = 0
+
+    def close(self, completed: bool = False) -> None:
+        """Release worktrees and output; advance the watermark if ``completed``
+        without failed merges."""
+        if completed and self.plan is not None and not self.progress.failed:
+            self.output.watermark.update(self.plan.revs, self.plan.tips)
+        self.pool.close()
+        self.output.close()
+        self.progress.finished = time.perf_counter()
+
+
+class MiningScheduler:
+    """Spread per-merge jobs of many repositories over one worker pool.
+
+    Args:
+        workers: Pool size. Defaults to ``os.cpu_count()``.
+        per_repo_limit: Maximum concurrent jobs (and worktrees) per repository.
+        max_active_repos: Repositories with open outputs at any time.
+            Defaults to ``workers``; further repositories start as earlier
+            ones finish.
+        societal: Also collect social signals.
+        compression: Shard compression for every repository's output.
+        max_shard_bytes: Shard rotation size.
+        memory_budget: Per-job cap on resident case bodies, in bytes.
+        fingerprints: Store shared by all repositories, so a conflict seen in
+            one fork is skipped in the others.
+        incremental: Per repository, enumerate only merges added since the
+            range was last fully mined (see :func:`build_corpus`).
+        file_timeout: Seconds of societal git work per conflicted file.
+        worktree_dir: Parent directory for scratch worktrees.
+        on_progress: Called on the dispatcher thread after each merge.
+
+    No ``Repo`` handle is shared between threads: each job uses the handle
+    of the worktree it leased, which only one job holds at a time.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: Optional[int] = None,
+        per_repo_limit: int = 2,
+        max_active_repos: Optional[int] = None,
+        societal: bool = True,
+        compression: Compression = None,
+        max_shard_bytes: int = 256 * 1024 * 1024,
+        memory_budget: Optional[int] = None,
+        fingerprints: Optional[FingerprintStore] = None,
+        incremental: bool = False,
+        file_timeout: Optional[float] = None,
+        worktree_dir: Optional[Union[str, Path]] = None,
+        on_progress: Optional[Callable[[RepoProgress], None]] = None,
+    ) -> None:
+        if per_repo_limit < 1:
+            raise ValueError(f"per_repo_limit must be >= 1, got {per_repo_limit}")
+        self.workers = workers or os.cpu_count() or 1
+        self.per_repo_limit = per_repo_limit
+        self.max_active_repos = max_active_repos or self.workers
+        self.societal = societal
+        self.compression = compression
+        self.max_shard_bytes = max_shard_bytes
+        self.memory_budget = memory_budget
+        self.fingerprints = fingerprints
+        self.incremental = incremental
+        self.file_timeout = file_timeout
+        self.worktree_dir = worktree_dir
+        self.on_progress = on_progress
+
+    def _activate(
+        self, progress: RepoProgress, output_dir: Path, revs: Revisions
+    ) -> Optional[_RepoState]:
+        """Open a repository's output and pool and plan its merges.
+
+        A repository that cannot be planned (bad range, corrupt repository)
+        gets ``progress.error`` set and ``None`` is returned, so the other
+        repositories carry on.
+        """
+        progress.started = time.perf_counter()
+        output: Optional[CorpusOutput] = None
+        pool: Optional[WorktreePool] = None
+        try:
+            output = CorpusOutput(
+                output_dir / progress.name,
+                compression=self.compression,
+                max_shard_bytes=self.max_shard_bytes,
+            )
+            pool = WorktreePool(
+                progress.path, self.per_repo_limit, directory=self.worktree_dir
+            )
+            plan = plan_merges(
+                progress.path, revs, output, incremental=self.incremental
+            )
+        except (GitCommandError, InvalidGitRepositoryError, OSError) as e:
+            logging.error(f"Failed to plan {progress.path}: {e}")
+            progress.error = str(e)
+            progress.finished = time.perf_counter()
+            if pool is not None:
+                pool.close()
+            if output is not None:
+                output.close()
+            return None
+        state = _RepoState(progress, output, pool)
+        state.plan = plan
+        state.pending.extend(plan.pending)
+        progress.merges = len(plan.merges)
+        progress.skipped = len(plan.merges) - len(plan.pending)
+        return state
+
+    def _job(self, pool: WorktreePool, merge: MergeCommit) -> MergeResult:
+        # Never blocks: the dispatcher keeps in-flight jobs <= pool size.
+        with pool.lease() as worktree:
+            return mine_merge(
+                worktree,
+                merge,
+                societal=self.societal,
+                memory_budget=self.memory_budget,
+                fingerprints=self.fingerprints,
+                file_timeout=self.file_timeout,
+            )
+
+    def _record(self, state: _RepoState, result: MergeResult) -> None:
+        state.output.commit(result)
+        progress = state.progress
+        progress.done += 1
+        if result.status == "clean":
+            progress.clean += 1
+        elif result.status == "conflicted":
+            progress.conflicted += 1
+            progress.cases += len(result.cases)
+        else:
+            progress.failed += 1
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+    def run(
+        self,
+        repos: Iterable[Union[str, Path]],
+        output_dir: Union[str, Path],
+        revs: Revisions = "HEAD",
+    ) -> dict[str, RepoProgress]:
+        """Mine ``revs`` of every repository into ``output_dir/<repo name>/``.
+
+        A repository that cannot be planned is logged and reported with
+        :attr:`RepoProgress.error` set; the others are still mined.
+
+        Raises:
+            ValueError: If two repositories share a directory name.
+
+        Returns:
+            Mapping of repository name to its final :class:`RepoProgress`.
+        """
+        paths = [Path(repo).resolve() for repo in repos]
+        names = [path.name for path in paths]
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise ValueError(f"Repository names must be unique: {duplicates}")
+
+        output_dir = Path(output_dir)
+        waiting = deque(paths)
+        active: list[_RepoState] = []
+        results: dict[str, RepoProgress] = {}
+        in_flight: dict[Future, _RepoState] = {}
+
+        def finish_idle_repos() -> None:
+            for state in list(active):
+                if not state.pending and not state.in_flight:
+                    state.close(completed=True)
+                    active.remove(state)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while True:
+                    while waiting and len(active) < self.max_active_repos:
+                        path = waiting.popleft()
+                        progress = RepoProgress(name=path.name, path=str(path))
+                        results[progress.name] = progress
+                        state = self._activate(progress, output_dir, revs)
+                        if state is not None:
+                            active.append(state)
+                    finish_idle_repos()
+
+                    # Round-robin: one job per repository per pass.
+                    submitted = True
+                    while submitted and len(in_flight) < self.workers:
+                        submitted = False
+                        for state in active:
+                            if len(in_flight) >= self.workers:
+                                break
+                            if state.pending and state.in_flight < self.per_repo_limit:
+                                future = pool.submit(
+                                    self._job, state.pool, state.pending.popleft()
+                                )
+                                in_flight[future] = state
+                                state.in_flight += 1
+                                submitted = True
+
+                    if not in_flight:
+                        if not waiting and not active:
+                            break
+                        continue
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        state = in_flight.pop(future)
+                        state.in_flight -= 1
+                        self._record(state, future.result())
+        finally:
+            for state in active:
+                state.close()
+        return results
+
+
+__all__ = ["MiningScheduler", "RepoProgress"]
@@ -0,0 +1,47 @@
+"""Per-output record of how far a revision range has been mined.
+
+After a build finishes every merge of a range, the tips it started from are
+saved. An incremental build then enumerates only merges reachable from the
+current tips but not from the saved ones, so its cost follows the number of
+new merges rather than the size of history. The per-merge checkpoint still
+guards against repeats, e.g. after an interrupted run.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Union
+
+from conflict_collection.mining._git_ops import Revisions, rev_list_args
+
+
+class Watermark:
+    """JSON file mapping a revision range to the tips last fully mined.
+
+    Args:
+        path: Watermark file (created on first :meth:`update`).
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._data: dict[str, list[str]] = {}
+        if self.path.exists():
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def _key(revs: Revisions) -> str:
+        return " ".join(rev_list_args(revs))
+
+    def tips(self, revs: Revisions) -> list[str]:
+        """Tips saved for ``revs`` (empty if never fully mined)."""
+        return list(self._data.get(self._key(revs), []))
+
+    def update(self, revs: Revisions, tips: list[str]) -> None:
+        """Atomically save ``tips`` as the watermark of ``revs``."""
+        self._data[self._key(revs)] = list(tips)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self._data, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+__all__ = ["Watermark"]
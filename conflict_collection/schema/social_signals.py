@@ -1,6 +1,8 @@
 """Data models for social signals captured from a Git repository."""
 
-from typing import List, Optional
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence
 
 from pydantic import BaseModel
 
@@ -14,7 +16,7 @@ class BlameEntry(BaseModel):
 
 
 class IntegratorPriors(BaseModel):
-    resolver_prev_commits: int
+    resolver_prev_commits: Optional[int]
     """Number of prior commits by the current integrator touching this file."""
 
 
@@ -28,10 +30,10 @@ class SocialSignalsRecord(BaseModel):
     theirs_author: Optional[str] = None
     """Author of the most recent commit touching this file on their side (MERGE_HEAD)."""
 
-    owner_commits_ours: int = 0
+    owner_commits_ours: Optional[int] = 0
     """Count of commits authored by `ours_author` in `merge-base..HEAD` for this file."""
 
-    owner_commits_theirs: int = 0
+    owner_commits_theirs: Optional[int] = 0
     """Count of commits authored by `theirs_author` in `merge-base..MERGE_HEAD` for this file."""
 
     age_days_ours: Optional[int] = None
@@ -43,12 +45,190 @@ class SocialSignalsRecord(BaseModel):
     integrator_priors: IntegratorPriors
     """Per-integrator priors capturing local resolver behavior."""
 
-    blame_table: List[BlameEntry]
+    blame_table: Optional[List[BlameEntry]]
     """Aggregated blame table at `HEAD`, grouped by author."""
 
+    partial: Optional[Dict[str, str]] = None
+    """For a partially collected file, field name -> why it is `None` (e.g.
+    a time budget ran out). `None` when every field was collected."""
+
+    @classmethod
+    def construct_trusted(
+        cls,
+        *,
+        file: str,
+        ours_author: Optional[str],
+        theirs_author: Optional[str],
+        owner_commits_ours: Optional[int],
+        owner_commits_theirs: Optional[int],
+        age_days_ours: Optional[int],
+        age_days_theirs: Optional[int],
+        resolver_prev_commits: Optional[int],
+        blame_pairs: Optional[Iterable[tuple[str, int]]],
+        partial: Optional[Dict[str, str]] = None,
+    ) -> "SocialSignalsRecord":
+        """Build a record (and its nested models) without pydantic validation.
+
+        For producers whose values are already well-typed, such as the
+        societal collector and :class:`SocialSignalsTable`. The result is
+        equal to the validated record. Untrusted input (JSON, user data)
+        must go through the normal constructor or ``model_validate``.
+        """
+        return cls.model_construct(
+            file=file,
+            ours_author=ours_author,
+            theirs_author=theirs_author,
+            owner_commits_ours=owner_commits_ours,
+            owner_commits_theirs=owner_commits_theirs,
+            age_days_ours=age_days_ours,
+            age_days_theirs=age_days_theirs,
+            integrator_priors=IntegratorPriors.model_construct(
+                resolver_prev_commits=resolver_prev_commits
+            ),
+            blame_table=(
+                None
+                if blame_pairs is None
+                else [
+                    BlameEntry.model_construct(author=author, lines=lines)
+                    for author, lines in blame_pairs
+                ]
+            ),
+            partial=partial,
+        )
+
+
+@dataclass
+class SocialSignalsTable:
+    """Many :class:`SocialSignalsRecord` as parallel columns.
+
+    Scalar fields are one column each. Blame tables are flattened into
+    ``blame_authors`` / ``blame_lines``, with record ``i`` owning the slice
+    ``blame_offsets[i]:blame_offsets[i + 1]``. The owner / resolver counts
+    are stored as ``array("q")``; where one of them (or the blame table) is
+    ``None`` it holds 0 / no blame rows, and ``nulls[i]`` names it so that it
+    reads back as ``None``.
+    """
+
+    file: List[str] = field(default_factory=list)
+    ours_author: List[Optional[str]] = field(default_factory=list)
+    theirs_author: List[Optional[str]] = field(default_factory=list)
+    owner_commits_ours: "array[int]" = field(default_factory=lambda: array("q"))
+    owner_commits_theirs: "array[int]" = field(default_factory=lambda: array("q"))
+    age_days_ours: List[Optional[int]] = field(default_factory=list)
+    age_days_theirs: List[Optional[int]] = field(default_factory=list)
+    resolver_prev_commits: "array[int]" = field(default_factory=lambda: array("q"))
+    blame_offsets: "array[int]" = field(default_factory=lambda: array("q", [0]))
+    blame_authors: List[str] = field(default_factory=list)
+    blame_lines: "array[int]" = field(default_factory=lambda: array("q"))
+    partial: List[Optional[Dict[str, str]]] = field(default_factory=list)
+    nulls: List[Optional[FrozenSet[str]]] = field(default_factory=list)
+    """Array-backed fields that are ``None`` in each record (``None`` if no
+    field is)."""
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[SocialSignalsRecord]
+    ) -> "SocialSignalsTable":
+        """Table of ``records``, in order."""
+        table = cls()
+        for record in records:
+            table.append(record)
+        return table
+
+    def append(self, record: SocialSignalsRecord) -> None:
+        """Add ``record`` as the last row.
+
+        Fields named in ``record.partial`` are stored as null even if they
+        hold a value, as a partial record's contract says they are ``None``.
+        """
+        resolver = record.integrator_priors.resolver_prev_commits
+        values = {
+            "owner_commits_ours": record.owner_commits_ours,
+            "owner_commits_theirs": record.owner_commits_theirs,
+            "resolver_prev_commits": resolver,
+            "blame_table": record.blame_table,
+        }
+        missing = record.partial or {}
+        nulls = frozenset(
+            name for name, value in values.items() if value is None or name in missing
+        )
+        self.nulls.append(nulls or None)
+        self.file.append(record.file)
+        self.ours_author.append(record.ours_author)
+        self.theirs_author.append(record.theirs_author)
+        self.owner_commits_ours.append(record.owner_commits_ours or 0)
+        self.owner_commits_theirs.append(record.owner_commits_theirs or 0)
+        self.age_days_ours.append(record.age_days_ours)
+        self.age_days_theirs.append(record.age_days_theirs)
+        self.resolver_prev_commits.append(resolver or 0)
+        for entry in record.blame_table or ():
+            self.blame_authors.append(entry.author)
+            self.blame_lines.append(entry.lines)
+        self.blame_offsets.append(len(self.blame_authors))
+        self.partial.append(record.partial)
+
+    def _nullable(self, name: str, i: int, value):
+        nulls = self.nulls[i]
+        return None if nulls and name in nulls else value
+
+    def __len__(self) -> int:
+        return len(self.file)
+
+    def blame_pairs(self, i: int) -> Optional[Sequence[tuple[str, int]]]:
+        """Blame ``(author, lines)`` pairs of record ``i``."""
+        start, stop = self.blame_offsets[i], self.blame_offsets[i + 1]
+        pairs = list(zip(self.blame_authors[start:stop], self.blame_lines[start:stop]))
+        return self._nullable("blame_table", i, pairs)
+
+    def record(self, i: int) -> SocialSignalsRecord:
+        """Rebuild record ``i`` (trusted, no validation)."""
+        return SocialSignalsRecord.construct_trusted(
+            file=self.file[i],
+            ours_author=self.ours_author[i],
+            theirs_author=self.theirs_author[i],
+            owner_commits_ours=self._nullable(
+                "owner_commits_ours", i, self.owner_commits_ours[i]
+            ),
+            owner_commits_theirs=self._nullable(
+                "owner_commits_theirs", i, self.owner_commits_theirs[i]
+            ),
+            age_days_ours=self.age_days_ours[i],
+            age_days_theirs=self.age_days_theirs[i],
+            resolver_prev_commits=self._nullable(
+                "resolver_prev_commits", i, self.resolver_prev_commits[i]
+            ),
+            blame_pairs=self.blame_pairs(i),
+            partial=self.partial[i],
+        )
+
+    def records(self) -> Iterator[SocialSignalsRecord]:
+        """Rebuild every record, in order."""
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def columns(self) -> dict[str, list]:
+        """Per-record scalar columns as lists, e.g. for ``pandas.DataFrame``."""
+        return {
+            "file": list(self.file),
+            "ours_author": list(self.ours_author),
+            "theirs_author": list(self.theirs_author),
+            "owner_commits_ours": self._nullable_column("owner_commits_ours"),
+            "owner_commits_theirs": self._nullable_column("owner_commits_theirs"),
+            "age_days_ours": list(self.age_days_ours),
+            "age_days_theirs": list(self.age_days_theirs),
+            "resolver_prev_commits": self._nullable_column("resolver_prev_commits"),
+        }
+
+    def _nullable_column(self, name: str) -> list[Optional[int]]:
+        column = getattr(self, name)
+        if not any(self.nulls):
+            return list(column)
+        return [self._nullable(name, i, v) for i, v in enumerate(column)]
+
 
 __all__ = [
     "BlameEntry",
     "IntegratorPriors",
     "SocialSignalsRecord",
+    "SocialSignalsTable",
 ]
@@ -0,0 +1,65 @@
+import json
+import random
+
+import pytest
+
+from conflict_collection.benchmarks.anchored_ratio import main, run_suite
+from conflict_collection.benchmarks.synthetic_text import (
+    PATTERNS,
+    long_line_edits,
+    make_triple,
+    scattered_replaces,
+)
+
+
+@pytest.mark.parametrize("pattern", sorted(PATTERNS))
+def test_make_triple_is_seeded(pattern):
+    assert make_triple(pattern, 200, seed=3) == make_triple(pattern, 200, seed=3)
+    assert make_triple(pattern, 200, seed=3) != make_triple(pattern, 200, seed=4)
+
+    O, R, R_hat = make_triple(pattern, 200)
+    assert len(O.splitlines()) == 200
+    assert O != R and R != R_hat
+
+
+@pytest.mark.parametrize("edit", [scattered_replaces, long_line_edits])
+def test_line_edits_handle_tiny_inputs(edit):
+    rng = random.Random(0)
+    assert edit(rng, []) == []
+    assert len(edit(rng, ["x = 1"])) == 1
+    assert len(edit(rng, ["", ""], fraction=1.0)) == 2
+
+
+def test_run_suite_covers_both_levenshtein_modes():
+    results = run_suite([50], ["scattered_replaces", "block_move"], repeat=1)
+    assert [(r.pattern, r.use_line_levenshtein) for r in results] == [
+        ("scattered_replaces", False),
+        ("scattered_replaces", True),
+        ("block_move", False),
+        ("block_move", True),
+    ]
+    assert all(r.seconds > 0 and r.peak_bytes > 0 for r in results)
+
+
+def test_main_writes_json_report(tmp_path):
+    output = tmp_path / "bench.json"
+    assert (
+        main(
+            [
+                "--sizes",
+                "20",
+                "--patterns",
+                "long_lines",
+                "--repeat",
+                "1",
+                "--output",
+                str(output),
+            ]
+        )
+        == 0
+    )
+
+    report = json.loads(output.read_text())
+    assert report["benchmark"] == "anchored_ratio"
+    assert {s["lines"] for s in report["scenarios"]} == {20}
+    assert len(report["scenarios"]) == 2
@@ -0,0 +1,86 @@
+import json
+from collections import Counter
+
+import pytest
+from git import Repo
+
+from conflict_collection.benchmarks.collectors import main, run_scenario
+from conflict_collection.benchmarks.git_calls import record_git_calls
+from conflict_collection.benchmarks.synthetic_repo import (
+    CONFLICT_KINDS,
+    RepoSpec,
+    generate_repo,
+)
+from conflict_collection.collectors.conflict_type import collect
+
+SMALL = RepoSpec(history_depth=10, authors=3, files=6, file_lines=20)
+
+
+def test_generate_repo_is_seeded(tmp_path):
+    first = generate_repo(tmp_path / "a", SMALL, seed=1)
+    again = generate_repo(tmp_path / "b", SMALL, seed=1)
+    other = generate_repo(tmp_path / "c", SMALL, seed=2)
+
+    assert first.resolution_sha == again.resolution_sha
+    assert first.resolution_sha != other.resolution_sha
+    assert first.conflicted_paths == again.conflicted_paths
+
+
+def test_generate_repo_produces_requested_conflicts(tmp_path):
+    spec = RepoSpec(
+        history_depth=5,
+        files=4,
+        file_lines=20,
+        conflicts={"modify_modify": 3, "modify_delete": 1, "rename_rename": 1},
+    )
+    repo = generate_repo(tmp_path / "repo", spec)
+
+    cases = collect(str(repo.path), repo.resolution_sha)
+
+    assert Counter(case.conflict_type for case in cases) == {
+        "modify_modify": 3,
+        "modify_delete": 1,
+        "delete_delete": 1,
+        "add_add": 1,
+    }
+    handle = Repo(repo.path)
+    assert handle.git.config("user.name") == repo.integrator
+    assert len(list(handle.iter_commits("main"))) == 1 + 5 + spec.side_commits
+
+
+def test_unknown_conflict_kind_is_rejected():
+    with pytest.raises(ValueError, match="Unknown conflict kinds"):
+        RepoSpec(conflicts={"modify_everything": 1})
+    assert "modify_modify" in CONFLICT_KINDS
+
+
+def test_record_git_calls_counts_subprocesses(tmp_path):
+    repo = generate_repo(tmp_path / "repo", SMALL)
+    with record_git_calls() as calls:
+        Repo(repo.path).git.rev_parse("HEAD")
+        Repo(repo.path).git.log("-1")
+
+    assert calls.by_subcommand() == {"rev-parse": 1, "log": 1}
+    assert "git log -1" in calls.format()
+
+
+def test_run_scenario_measures_both_collectors(tmp_path):
+    results = run_scenario(SMALL, repeat=1, directory=tmp_path)
+
+    assert [r.collector for r in results] == ["conflict_type", "societal"]
+    for result in results:
+        assert result.records > 0 and result.git_calls > 0 and result.peak_bytes > 0
+        assert sum(result.git_calls_by_subcommand.values()) == result.git_calls
+
+
+def test_main_writes_json_report(tmp_path):
+    output = tmp_path / "bench.json"
+    argv = ["--depths", "3", "--files", "2", "--file-lines", "10", "--repeat", "1"]
+    argv += ["--conflicts", "add_add=2", "--output", str(output)]
+    assert main(argv) == 0
+
+    report = json.loads(output.read_text())
+    assert report["benchmark"] == "collectors"
+    assert report["spec"]["conflicts"] == {"add_add": 2}
+    assert {s["history_depth"] for s in report["scenarios"]} == {3}
+    assert {s["records"] for s in report["scenarios"]} == {2}
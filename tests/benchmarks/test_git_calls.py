@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+from git import Repo
+from git.cmd import Git
+
+from conflict_collection.benchmarks.git_calls import (
+    GitBudget,
+    GitBudgetExceeded,
+    record_git_calls,
+)
+
+
+def _repo(path) -> Repo:
+    repo = Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Tester")
+        config.set_value("user", "email", "tester@example.com")
+    repo.git.commit("--allow-empty", "-qm", "init")
+    return repo
+
+
+def _log(repo: Repo, files: int):
+    with record_git_calls() as calls:
+        repo.git.rev_parse("HEAD")
+        for _ in range(files):
+            repo.git.log("-1", "--format=%H")
+            repo.git.rev_parse("HEAD")
+    return calls
+
+
+def test_budget_passes_within_limits(tmp_path):
+    repo = _repo(tmp_path)
+
+    GitBudget(fixed=1, per_file=2).check(
+        _log(repo, 4), files=4, baseline=(_log(repo, 1), 1)
+    )
+
+
+def test_budget_failure_shows_counts_and_call_log_diff(tmp_path):
+    repo = _repo(tmp_path)
+    budget = GitBudget(fixed=20, per_file=1)  # fixed slack hides the extra call
+
+    budget.check(_log(repo, 3), files=3)
+    with pytest.raises(GitBudgetExceeded) as excinfo:
+        budget.check(_log(repo, 3), files=3, baseline=(_log(repo, 1), 1))
+
+    message = str(excinfo.value)
+    assert "4 more git calls for 2 more files exceed 1 per file" in message
+    assert "log: 1 -> 3" in message
+    assert "+rev-parse HEAD" in message and "+log -1 --format=%H" in message
+
+
+def test_budget_failure_without_baseline_lists_calls(tmp_path):
+    repo = _repo(tmp_path)
+
+    with pytest.raises(GitBudgetExceeded, match="7 git calls for 3 files exceed"):
+        GitBudget(fixed=1, per_file=1).check(_log(repo, 3), files=3)
+
+
+def test_calls_are_logged_in_start_order(tmp_path, monkeypatch):
+    repo = _repo(tmp_path)
+    entered, release = threading.Event(), threading.Event()
+    execute = Git.execute
+
+    def held(self, command, *args, **kwargs):
+        if "--short" in command:
+            entered.set()
+            release.wait(timeout=10)
+        return execute(self, command, *args, **kwargs)
+
+    monkeypatch.setattr(Git, "execute", held)
+    with record_git_calls() as calls:
+        first = threading.Thread(target=repo.git.rev_parse, args=("--short", "HEAD"))
+        first.start()
+        assert entered.wait(timeout=10)
+        repo.git.rev_parse("HEAD")  # starts second, returns first
+        release.set()
+        first.join()
+
+    assert [call.argv[1:] for call in calls] == [
+        ("rev-parse", "--short", "HEAD"),
+        ("rev-parse", "HEAD"),
+    ]
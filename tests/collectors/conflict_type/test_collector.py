@@ -10,3 +10,23 @@ def test_no_exception_thrown_conflict_type_collection(conflict_repo_path: Path):
     repo_path = str(conflict_repo_path)
 
     _ = collect(repo_path, "ce515764e7627081831e36617e8851ae4b8cd734")
+
+
+def test_memory_budget_returns_equal_spilled_cases(conflict_repo_path: Path):
+    from conflict_collection.io.spill import CaseSpool
+
+    cases = collect(str(conflict_repo_path), "HEAD")
+    spooled = collect(str(conflict_repo_path), "HEAD", memory_budget=0)
+
+    assert isinstance(spooled, CaseSpool)
+    assert spooled.spilled == len(cases)
+    assert cases and list(spooled) == cases
+
+
+def test_seen_store_skips_already_collected_conflicts(conflict_repo_path: Path):
+    from conflict_collection.index.fingerprints import MemoryFingerprintStore
+
+    seen = MemoryFingerprintStore()
+    first = collect(str(conflict_repo_path), "HEAD", seen=seen)
+    assert first and len(seen) == len(first)
+    assert collect(str(conflict_repo_path), "HEAD", seen=seen) == []
@@ -1,6 +1,14 @@
+import time
 from pathlib import Path
 
-from conflict_collection.collectors.societal import collect
+import pytest
+from git import Repo
+
+from conflict_collection.benchmarks.git_calls import record_git_calls
+from conflict_collection.benchmarks.synthetic_repo import RepoSpec, generate_repo
+from conflict_collection.collectors.societal import collect, collector
+from conflict_collection.collectors.societal._git_ops import GitTimeout, _timed
+from conflict_collection.index.fingerprints import MemoryFingerprintStore
 
 
 def test_no_exception_thrown_societal_collection(conflict_repo_path: Path):
@@ -10,3 +18,74 @@ def test_no_exception_thrown_societal_collection(conflict_repo_path: Path):
     repo_path = str(conflict_repo_path)
 
     _ = collect(repo_path)
+
+
+def test_store_reuses_records_without_per_file_git_work(
+    conflict_repo_path: Path, monkeypatch
+):
+    store = MemoryFingerprintStore()
+    first = collect(str(conflict_repo_path), store=store)
+    assert first and len(store) == len(first)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("per-file git work on a store hit")
+
+    monkeypatch.setattr(collector, "last_commit_for_path", fail)
+    monkeypatch.setattr(collector, "merge_bases", fail)
+    assert collect(str(conflict_repo_path), store=store) == first
+
+
+def test_timed_out_call_leaves_partial_record(conflict_repo_path: Path, monkeypatch):
+    def slow_blame(repo, rev, path, *, timeout=None):
+        assert timeout == 5
+        raise GitTimeout("git blame exceeded 5s")
+
+    monkeypatch.setattr(collector, "blame_aggregate", slow_blame)
+    store = MemoryFingerprintStore()
+    records = collect(str(conflict_repo_path), store=store, call_timeout=5)
+
+    assert records and len(store) == 0
+    for record in records.values():
+        assert record.blame_table is None
+        assert record.partial == {"blame_table": "git blame exceeded 5s"}
+        assert record.ours_author is not None and record.age_days_ours is not None
+
+
+def test_exhausted_file_budget_skips_per_file_git_calls(conflict_repo_path: Path):
+    with record_git_calls() as calls:
+        records = collect(str(conflict_repo_path), file_timeout=0)
+
+    assert records
+    assert not {"log", "rev-list", "blame"} & set(calls.by_subcommand())
+    for record in records.values():
+        assert record.ours_author is None and record.owner_commits_theirs is None
+        assert set(record.partial.values()) == {"file time budget exhausted"}
+        assert "blame_table" in record.partial
+
+
+def test_timeout_kills_git_subprocess(tmp_path: Path):
+    repo = Repo.init(tmp_path / "slow")
+    repo.git.config("alias.slow", "!sleep 10")
+
+    started = time.monotonic()
+    with pytest.raises(GitTimeout, match="git slow exceeded 0.2s"):
+        _timed(repo.git.slow, timeout=0.2)
+    assert time.monotonic() - started < 5
+
+
+def test_workers_match_sequential_and_report_costs(tmp_path: Path):
+    spec = RepoSpec(
+        history_depth=8, files=6, file_lines=20, conflicts={"modify_modify": 5}
+    )
+    repo = generate_repo(tmp_path / "repo", spec)
+    sequential = collect(str(repo.path))
+
+    costs = []
+    parallel = collect(str(repo.path), workers=3, on_cost=costs.append)
+
+    assert parallel == sequential
+    assert list(parallel) == list(sequential)
+    assert sorted(c.path for c in costs) == sorted(sequential)
+    for cost in costs:
+        assert cost.blob_bytes > 0 and cost.commits > 0
+        assert cost.estimated > 0 and cost.actual > 0
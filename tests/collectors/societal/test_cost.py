@@ -0,0 +1,55 @@
+import pytest
+from git import Repo
+
+from conflict_collection.collectors.societal.cost import (
+    CostModel,
+    FileCost,
+    PathCommitIndex,
+    blob_size,
+    estimate_costs,
+)
+
+
+def test_fit_recovers_linear_coefficients():
+    truth = CostModel(fixed=0.05, per_kib=0.002, per_commit=0.01)
+    costs = [
+        FileCost(f"f{i}", size, commits, 0.0, truth.estimate(size, commits))
+        for i, (size, commits) in enumerate(
+            [(1024, 1), (4096, 30), (65536, 2), (2048, 200), (512, 50)]
+        )
+    ]
+
+    fitted = CostModel.fit(costs)
+
+    assert fitted.fixed == pytest.approx(truth.fixed, abs=1e-6)
+    assert fitted.per_kib == pytest.approx(truth.per_kib, abs=1e-6)
+    assert fitted.per_commit == pytest.approx(truth.per_commit, abs=1e-6)
+
+
+def test_fit_needs_three_observations():
+    with pytest.raises(ValueError, match="at least 3"):
+        CostModel.fit([FileCost("a", 1, 1, 0.0, 0.1)])
+
+
+def test_estimates_rank_large_long_lived_files_first(tmp_path):
+    repo = Repo.init(tmp_path)
+    for i in range(3):
+        (tmp_path / "small.txt").write_text(f"{i}\n")
+        repo.index.add(["small.txt"])
+        repo.index.commit(f"small {i}")
+    (tmp_path / "big.txt").write_text("x" * 200_000)
+    repo.index.add(["big.txt"])
+    head = repo.index.commit("big").hexsha
+
+    index = PathCommitIndex.build(repo)
+    assert len(index) == 2
+    assert index.get("small.txt") == 3 and index.get("big.txt") == 1
+    assert index.get("missing.txt") == 0
+    assert blob_size(repo, (head,), "big.txt") == 200_000
+    assert blob_size(repo, (head,), "missing.txt") == 0
+
+    estimates = estimate_costs(
+        repo, ["missing.txt", "big.txt"], head, head, model=CostModel(), index=index
+    )
+    assert estimates["big.txt"][:2] == (200_000, 1)
+    assert estimates["big.txt"][2] > estimates["missing.txt"][2]
@@ -0,0 +1,158 @@
+from pathlib import Path
+
+import pytest
+from git import GitCommandError, Repo
+
+from conflict_collection.collectors.societal import (
+    MergeQuery,
+    collect,
+    collect_history,
+    history,
+)
+
+
+def _commit(repo: Repo, files: dict[str, str], message: str, author: str) -> None:
+    for name, text in files.items():
+        (Path(repo.working_tree_dir) / name).write_text(text)
+    repo.git.add(*files)
+    repo.git.commit("-q", "-m", message, f"--author={author} <{author}@example.com>")
+
+
+def _merge(repo: Repo, branch: str, resolution: dict[str, str]) -> None:
+    try:
+        repo.git.merge("-q", "--no-ff", "--no-commit", branch)
+    except GitCommandError:
+        pass
+    _commit(repo, resolution, f"Merge {branch}", "Integrator")
+
+
+@pytest.fixture
+def team_repo(tmp_path: Path) -> Path:
+    """Three authors, overlapping edits, and a merge of a branch with a merge."""
+    repo = Repo.init(tmp_path / "team", initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Integrator")
+        config.set_value("user", "email", "integrator@example.com")
+
+    _commit(repo, {"a.txt": "0\n", "b.txt": "0\n"}, "init", "alice")
+    repo.git.checkout("-q", "-b", "topic")
+    _commit(repo, {"a.txt": "bob 1\n"}, "bob a", "bob")
+    _commit(repo, {"a.txt": "bob 2\n", "b.txt": "bob\n"}, "bob ab", "bob")
+    repo.git.checkout("-q", "-b", "sub", "main")
+    _commit(repo, {"b.txt": "carol\n"}, "carol b", "carol")
+    repo.git.checkout("-q", "topic")
+    _merge(repo, "sub", {"b.txt": "bob+carol\n"})
+    repo.git.checkout("-q", "main")
+    _commit(repo, {"a.txt": "alice 1\n"}, "alice a", "alice")
+    _commit(repo, {"a.txt": "alice 2\n"}, "integrator a", "Integrator")
+    _merge(repo, "topic", {"a.txt": "merged\n", "b.txt": "merged\n"})
+    repo.close()
+    return tmp_path / "team"
+
+
+def _merges(repo: Repo) -> list[tuple[str, str]]:
+    out = repo.git.log("--merges", "--format=%P", "main")
+    return [tuple(line.split()) for line in out.splitlines()]
+
+
+def _replayed(repo_path: Path, ours: str, theirs: str, files) -> dict:
+    """Per-merge :func:`collect` with ``ours`` / ``theirs`` mid-merge."""
+    repo = Repo(repo_path)
+    repo.git.checkout("-q", "--detach", ours)
+    try:
+        repo.git.merge("-q", "--no-ff", "--no-commit", theirs)
+    except GitCommandError:
+        pass
+    try:
+        return collect(repo, files=files)
+    finally:
+        repo.git.merge("--abort")
+        repo.git.checkout("-q", "main")
+        repo.close()
+
+
+def test_matches_per_merge_collect(team_repo: Path):
+    merges = _merges(Repo(team_repo))
+    assert len(merges) == 2
+    queries = [MergeQuery(ours, theirs, ("a.txt", "b.txt")) for ours, theirs in merges]
+
+    batched = collect_history(team_repo, queries)
+
+    for query, records in zip(queries, batched):
+        expected = _replayed(team_repo, query.ours, query.theirs, query.files)
+        assert records == expected
+    # The fixture exercises non-trivial counts.
+    outer = batched[0]["a.txt"]
+    assert outer.ours_author == "Integrator" and outer.theirs_author == "bob"
+    assert (
+        outer.owner_commits_theirs == 2
+        and outer.integrator_priors.resolver_prev_commits == 1
+    )
+
+
+def test_matches_collect_on_demo_conflict(conflict_repo_path: Path):
+    expected = collect(str(conflict_repo_path))
+    assert expected
+
+    [records] = collect_history(
+        conflict_repo_path, [MergeQuery("HEAD", "MERGE_HEAD", tuple(expected))]
+    )
+
+    assert records == expected
+
+
+def test_without_blame_skips_tables_and_missing_files(team_repo: Path, caplog):
+    [ours, theirs] = _merges(Repo(team_repo))[0]
+
+    [records] = collect_history(
+        team_repo,
+        [MergeQuery(ours, theirs, ("a.txt", "missing.txt"))],
+        blame=False,
+        integrator=None,
+    )
+
+    assert list(records) == ["a.txt"]
+    assert records["a.txt"].blame_table == []
+    assert records["a.txt"].integrator_priors.resolver_prev_commits == 0
+    assert "missing.txt" in caplog.text
+
+
+def test_integrator_pattern_matches_like_git_author(tmp_path: Path):
+    # "+", "(" and ")" are literals in git's basic regex, not in Python's.
+    name = "Dev (C++)"
+    repo = Repo.init(tmp_path / "meta", initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", name)
+        config.set_value("user", "email", "dev@example.com")
+    _commit(repo, {"a.txt": "0\n"}, "init", "alice")
+    repo.git.checkout("-q", "-b", "topic")
+    _commit(repo, {"a.txt": "bob\n"}, "bob a", "bob")
+    repo.git.checkout("-q", "main")
+    _commit(repo, {"a.txt": "dev\n"}, "dev a", name)
+    _commit(repo, {"a.txt": "dev 2\n"}, "dev a again", name)
+    ours, theirs = repo.head.commit.hexsha, repo.commit("topic").hexsha
+    repo.close()
+
+    [records] = collect_history(
+        tmp_path / "meta", [MergeQuery(ours, theirs, ("a.txt",))]
+    )
+
+    expected = _replayed(tmp_path / "meta", ours, theirs, ("a.txt",))
+    assert records == expected
+    assert records["a.txt"].integrator_priors.resolver_prev_commits == 2
+
+
+def test_annotated_tags_and_small_read_blocks(team_repo: Path, monkeypatch):
+    repo = Repo(team_repo)
+    [ours, theirs] = _merges(repo)[0]
+    repo.git.tag("-a", "ours-tag", "-m", "ours", ours)
+    repo.git.tag("-a", "theirs-tag", "-m", "theirs", theirs)
+    repo.close()
+    files = ("a.txt", "b.txt")
+
+    [by_sha] = collect_history(team_repo, [MergeQuery(ours, theirs, files)])
+    # Records straddle the read blocks.
+    monkeypatch.setattr(history, "_READ_SIZE", 7)
+    [by_tag] = collect_history(team_repo, [MergeQuery("ours-tag", "theirs-tag", files)])
+
+    assert by_tag == by_sha and by_sha
@@ -0,0 +1,57 @@
+"""Git subprocess budgets of the collectors: O(1) + a constant per file."""
+
+import pytest
+
+from conflict_collection.benchmarks.git_calls import GitBudget, record_git_calls
+from conflict_collection.benchmarks.synthetic_repo import RepoSpec, generate_repo
+from conflict_collection.collectors.conflict_type import collect as conflict_types
+from conflict_collection.collectors.societal import collect as societal
+
+SOCIETAL_BUDGET = GitBudget(fixed=8, per_file=6)
+"""diff, 2x rev-parse, config, merge-base, cat-file helpers; then per file
+2x rev-list (last commits), 2x log (owners), log (integrator), blame."""
+CONFLICT_TYPE_BUDGET = GitBudget(fixed=2, per_file=1)
+"""cat-file helpers; one ``git show`` per resolved body."""
+
+
+@pytest.fixture(scope="module")
+def repos(tmp_path_factory):
+    root = tmp_path_factory.mktemp("budget")
+    return {
+        n: generate_repo(
+            root / str(n),
+            RepoSpec(
+                history_depth=20,
+                files=4,
+                file_lines=30,
+                conflicts={"modify_modify": n, "delete_modify": 1},
+            ),
+        )
+        for n in (2, 8)
+    }
+
+
+def _calls(run):
+    with record_git_calls() as calls:
+        result = run()
+    return calls, len(result)
+
+
+def test_societal_collect_budget(repos):
+    small, small_files = _calls(lambda: societal(str(repos[2].path)))
+    large, large_files = _calls(lambda: societal(str(repos[8].path)))
+    assert (small_files, large_files) == (3, 9)
+
+    SOCIETAL_BUDGET.check(small, small_files)
+    SOCIETAL_BUDGET.check(large, large_files, baseline=(small, small_files))
+
+
+def test_conflict_type_collect_budget(repos):
+    def run(n):
+        return lambda: conflict_types(str(repos[n].path), repos[n].resolution_sha)
+
+    small, small_files = _calls(run(2))
+    large, large_files = _calls(run(8))
+
+    CONFLICT_TYPE_BUDGET.check(small, small_files)
+    CONFLICT_TYPE_BUDGET.check(large, large_files, baseline=(small, small_files))
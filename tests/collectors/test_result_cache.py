@@ -0,0 +1,128 @@
+"""Whole-merge result cache of both collectors."""
+
+import pytest
+from conflict_parser import MergeMetadata
+
+from conflict_collection.benchmarks.git_calls import record_git_calls
+from conflict_collection.benchmarks.synthetic_repo import RepoSpec, generate_repo
+from conflict_collection.collectors.conflict_type import collect as conflict_types
+from conflict_collection.collectors.societal import collect as societal
+from conflict_collection.index.fingerprints import (
+    MemoryFingerprintStore,
+    SQLiteFingerprintStore,
+)
+
+
+@pytest.fixture(scope="module")
+def repo(tmp_path_factory):
+    spec = RepoSpec(
+        history_depth=6,
+        files=4,
+        file_lines=20,
+        conflicts={"modify_modify": 2, "add_add": 1, "modify_delete": 1},
+    )
+    return generate_repo(tmp_path_factory.mktemp("cache") / "repo", spec)
+
+
+def test_conflict_type_repeat_is_one_cache_read(repo, tmp_path):
+    with SQLiteFingerprintStore(tmp_path / "cache.db") as cache:
+        first = conflict_types(str(repo.path), repo.resolution_sha, cache=cache)
+    assert len(first) == 4
+
+    with SQLiteFingerprintStore(tmp_path / "cache.db") as cache:
+        with record_git_calls() as calls:
+            again = conflict_types(str(repo.path), "resolution", cache=cache)
+        spooled = conflict_types(
+            str(repo.path), repo.resolution_sha, memory_budget=0, cache=cache
+        )
+
+    assert again == first
+    assert list(spooled) == first
+    assert calls.by_subcommand() == {"rev-parse": 1}
+
+
+def test_conflict_type_cache_with_memory_budget_streams_cases(repo, tmp_path):
+    with SQLiteFingerprintStore(tmp_path / "cache.db") as cache:
+        first = conflict_types(
+            str(repo.path), repo.resolution_sha, memory_budget=0, cache=cache
+        )
+        # One entry per case plus the head, so hits can stream them back.
+        assert len(cache) == len(first) + 1
+
+        with record_git_calls() as calls:
+            again = conflict_types(
+                str(repo.path), repo.resolution_sha, memory_budget=0, cache=cache
+            )
+        unbudgeted = conflict_types(str(repo.path), repo.resolution_sha, cache=cache)
+
+    with first, again:
+        assert again.spilled == len(first) == 4
+        assert list(again) == list(first) == unbudgeted
+    assert calls.by_subcommand() == {"rev-parse": 1}
+
+
+def test_streamed_entry_with_a_missing_case_is_a_miss(repo):
+    cache = MemoryFingerprintStore()
+    first = list(
+        conflict_types(
+            str(repo.path), repo.resolution_sha, memory_budget=0, cache=cache
+        )
+    )
+    del cache._data[next(key for key in cache._data if key.endswith("/0"))]
+
+    again = conflict_types(
+        str(repo.path), repo.resolution_sha, memory_budget=0, cache=cache
+    )
+    assert list(again) == first
+    assert len(cache) == len(first) + 1
+
+
+def test_conflict_type_key_covers_resolution_and_options(repo):
+    cache = MemoryFingerprintStore()
+    conflict_types(str(repo.path), repo.resolution_sha, cache=cache)
+    conflict_types(str(repo.path), "HEAD", cache=cache)
+    conflict_types(
+        str(repo.path),
+        repo.resolution_sha,
+        merge_config=MergeMetadata(conflict_style="diff3"),
+        cache=cache,
+    )
+    assert len(cache) == 3
+
+    with pytest.raises(ValueError, match="seen and cache"):
+        conflict_types(
+            str(repo.path), "HEAD", seen=MemoryFingerprintStore(), cache=cache
+        )
+
+
+def test_foreign_payload_under_the_key_is_a_miss(repo):
+    cache = MemoryFingerprintStore()
+    first = conflict_types(str(repo.path), repo.resolution_sha, cache=cache)
+    (key,) = cache._data
+    cache.put(key, {"key": ["other"], "results": []})
+
+    assert conflict_types(str(repo.path), repo.resolution_sha, cache=cache) == first
+    assert cache.get(key)["results"]
+
+
+def test_societal_repeat_skips_all_per_file_work(repo):
+    cache = MemoryFingerprintStore()
+    first = societal(str(repo.path), cache=cache)
+    assert first
+
+    with record_git_calls() as calls:
+        again = societal(str(repo.path), cache=cache)
+    only = societal(str(repo.path), files=[next(iter(first))], cache=cache)
+
+    assert again == first and list(again) == list(first)
+    assert set(calls.by_subcommand()) == {"rev-parse", "config"}
+    assert list(only) == [next(iter(first))]
+    assert len(cache) == 2
+
+
+def test_partial_societal_results_are_not_cached(repo):
+    cache = MemoryFingerprintStore()
+    records = societal(str(repo.path), file_timeout=0, cache=cache)
+
+    assert any(r.partial for r in records.values())
+    assert len(cache) == 0
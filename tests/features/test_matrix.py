@@ -0,0 +1,171 @@
+from pathlib import Path
+
+import pytest
+from git import GitCommandError, Repo
+
+np = pytest.importorskip("numpy")
+
+from conflict_collection.collectors.societal import collect  # noqa: E402
+from conflict_collection.features import (  # noqa: E402
+    SOCIAL_COLUMNS,
+    AuthorVocabulary,
+    PathTimeline,
+    merge_features,
+    social_features,
+    time_feature_columns,
+)
+from conflict_collection.schema.social_signals import (  # noqa: E402
+    SocialSignalsRecord,
+    SocialSignalsTable,
+)
+
+DAY = 86400
+
+
+def _record(file, blame, **fields):
+    return SocialSignalsRecord.construct_trusted(
+        file=file,
+        ours_author=fields.get("ours_author", "a"),
+        theirs_author="b",
+        owner_commits_ours=fields.get("owner_commits_ours", 1),
+        owner_commits_theirs=2,
+        age_days_ours=fields.get("age_days_ours", 3),
+        age_days_theirs=None,
+        resolver_prev_commits=4,
+        blame_pairs=blame,
+        partial=fields.get("partial"),
+    )
+
+
+def test_timeline_features_match_a_per_path_loop():
+    rng = np.random.default_rng(0)
+    ref = 1_700_000_000
+    per_path = [
+        np.sort(ref - rng.integers(0, 400 * DAY, size=n)) for n in (0, 1, 2, 17, 250)
+    ]
+    offsets = np.concatenate(([0], np.cumsum([len(t) for t in per_path])))
+    timeline = PathTimeline(
+        [f"f{i}" for i in range(5)], offsets, np.concatenate(per_path)
+    )
+    windows = (7, 30, 365)
+
+    counts = timeline.window_counts(ref, windows)
+    for i, times in enumerate(per_path):
+        for j, w in enumerate(windows):
+            assert counts[i, j] == np.sum((times >= ref - w * DAY) & (times <= ref))
+        if len(times):
+            assert timeline.age_days(ref)[i] == (ref - times[-1]) // DAY
+        if len(times) > 1:
+            assert timeline.mean_gap_days()[i] == pytest.approx(
+                np.diff(times).mean() / DAY
+            )
+            assert timeline.last_gap_days()[i] == (times[-1] - times[-2]) / DAY
+    assert np.isnan(timeline.age_days(ref)[0])
+    assert np.isnan(timeline.mean_gap_days()[:2]).all()
+
+
+def _commit_at(repo, files, ts):
+    for name, text in files.items():
+        (Path(repo.working_tree_dir) / name).write_text(text, encoding="utf-8")
+    repo.git.add("-A")
+    date = f"{ts} +0000"
+    repo.git.commit(
+        "-qm", f"at {ts}", env={"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date}
+    )
+
+
+def test_timeline_counts_non_ascii_paths_and_merge_resolutions(tmp_path):
+    repo = Repo.init(tmp_path / "repo", initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "t")
+        config.set_value("user", "email", "t@example.com")
+    _commit_at(repo, {"é.txt": "0\n", "f.txt": "0\n"}, 1_000_000_000)
+    _commit_at(repo, {"é.txt": "1\n"}, 1_000_100_000)
+    repo.git.checkout("-q", "-b", "topic")
+    _commit_at(repo, {"f.txt": "topic\n"}, 1_000_200_000)
+    repo.git.checkout("-q", "main")
+    _commit_at(repo, {"f.txt": "main\n"}, 1_000_300_000)
+    try:
+        repo.git.merge("-q", "--no-commit", "topic")
+    except GitCommandError:  # the conflict is resolved below
+        pass
+    _commit_at(repo, {"f.txt": "resolved\n"}, 1_005_000_000)
+
+    timeline = PathTimeline.load(repo, "HEAD", ["é.txt", "f.txt"])
+
+    assert timeline.counts.tolist() == [2, 4]
+    newest = repo.git.log(
+        "-1", "--format=%ct", repo.git.rev_list("-1", "HEAD", "--", "f.txt")
+    )
+    assert timeline.path_times(1)[-1] == int(newest) == 1_005_000_000
+
+
+def test_social_features_and_blame_encoding():
+    records = [
+        _record("x", [("alice", 10), ("bob", 5)]),
+        _record("y", [("carol", 2)], owner_commits_ours=None, partial=None),
+        _record(
+            "z",
+            None,
+            owner_commits_ours=0,
+            partial={"blame_table": "timeout", "owner_commits_ours": "timeout"},
+        ),
+    ]
+    vocabulary = AuthorVocabulary(["bob", "alice"])
+    matrix = social_features(records, vocabulary=vocabulary)
+
+    assert matrix.columns == list(SOCIAL_COLUMNS) and matrix.files == ["x", "y", "z"]
+    assert matrix.blame[:2].tolist() == [[5, 10], [0, 0]]
+    assert np.isnan(matrix.blame[2]).all()
+    assert matrix.column("blame_total_lines")[:2].tolist() == [15, 2]
+    assert matrix.column("blame_other_lines")[:2].tolist() == [0, 2]
+    assert matrix.column("blame_top_share")[0] == pytest.approx(10 / 15)
+    assert np.isnan(matrix.column("owner_commits_ours")[2])
+    assert np.isnan(matrix.column("age_days_theirs")).all()
+
+    # Same values from a table; the fitted vocabulary ranks by lines.
+    table = SocialSignalsTable.from_records(records)
+    same = social_features(table, vocabulary=vocabulary)
+    np.testing.assert_array_equal(same.values, matrix.values)
+    assert social_features(table).authors == ["alice", "bob", "carol"]
+    assert AuthorVocabulary.fit(records, max_size=1).authors == ["alice"]
+
+
+def test_merge_features_of_in_progress_merge(conflict_repo_path: Path):
+    records = collect(str(conflict_repo_path))
+    matrix = merge_features(conflict_repo_path, records=records, windows=(30,))
+
+    files = list(records)
+    assert matrix.files == files
+    assert matrix.columns == time_feature_columns((30,)) + list(SOCIAL_COLUMNS)
+    assert matrix.values.shape == (len(files), len(matrix.columns))
+    # Ages agree with the societal collector's.
+    for side in ("ours", "theirs"):
+        np.testing.assert_array_equal(
+            matrix.column(f"commit_age_days_{side}"),
+            [getattr(records[f], f"age_days_{side}") for f in files],
+        )
+
+    repo = Repo(conflict_repo_path)
+    for i, f in enumerate(files):
+        log = repo.git.log("--format=%ct", "HEAD", "--", f).split()
+        assert matrix.column("commits_ours")[i] == len(log)
+
+
+def test_merge_features_leaves_files_missing_from_records_nan(
+    conflict_repo_path: Path,
+):
+    records = collect(str(conflict_repo_path))
+    tracked = Repo(conflict_repo_path).git.ls_files().splitlines()
+    extra = next(f for f in tracked if f not in records)
+    files = [*records, extra]
+
+    matrix = merge_features(conflict_repo_path, files, records=records)
+    only = merge_features(conflict_repo_path, list(records), records=records)
+
+    social = slice(len(time_feature_columns()), None)
+    assert np.isnan(matrix.values[-1, social]).all()
+    assert np.isnan(matrix.blame[-1]).all()
+    assert not np.isnan(matrix.column("commits_ours")[-1])
+    np.testing.assert_array_equal(matrix.values[:-1], only.values)
+    np.testing.assert_array_equal(matrix.blame[:-1], only.blame)
@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+from conflict_collection.index import (
+    MemoryFingerprintStore,
+    SQLiteFingerprintStore,
+    conflict_fingerprint,
+    social_fingerprint,
+)
+
+
+def test_fingerprints_distinguish_stages_and_kinds():
+    assert conflict_fingerprint("a", "b", None) == conflict_fingerprint("a", "b", None)
+    assert conflict_fingerprint("a", "b", None) != conflict_fingerprint("a", None, "b")
+    assert conflict_fingerprint("a", "b", "c") != social_fingerprint(
+        "a", "b", "c", None
+    )
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_store_round_trip_and_threads(kind, tmp_path):
+    store = (
+        MemoryFingerprintStore()
+        if kind == "memory"
+        else SQLiteFingerprintStore(tmp_path / "fp.db")
+    )
+    assert store.get("k") is None and "k" not in store
+    store.put("k", {"path": "a.txt"})
+    assert store.get("k") == {"path": "a.txt"} and "k" in store
+
+    threads = [
+        threading.Thread(target=store.put, args=(f"t{i}", {"i": i})) for i in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store) == 9
+
+
+def test_sqlite_store_persists(tmp_path):
+    with SQLiteFingerprintStore(tmp_path / "fp.db") as store:
+        store.put("k", {"v": 1})
+    with SQLiteFingerprintStore(tmp_path / "fp.db") as reopened:
+        assert reopened.get("k") == {"v": 1}
@@ -0,0 +1,121 @@
+import pytest
+
+from conflict_collection.index import (
+    LSHIndex,
+    MinHasher,
+    case_shingles,
+    case_similarity,
+    dedupe_cases,
+    estimated_jaccard,
+)
+from conflict_collection.schema.typed_five_tuple import (
+    AddAddConflictCase,
+    ModifyModifyConflictCase,
+)
+
+
+def _mm_case(base: str, ours: str, theirs: str, path: str = "f.txt"):
+    return ModifyModifyConflictCase(
+        base_path=path,
+        ours_path=path,
+        theirs_path=path,
+        base_content=base,
+        ours_content=ours,
+        theirs_content=theirs,
+        conflict_path=path,
+        conflict_body=f"<<<<<<< HEAD\n{ours}\n=======\n{theirs}\n>>>>>>> theirs\n",
+        resolved_path=path,
+        resolved_body=ours,
+    )
+
+
+def _numbered(n: int, prefix: str, edits: dict[int, str] | None = None) -> str:
+    lines = [f"{prefix} line {i}" for i in range(n)]
+    for i, text in (edits or {}).items():
+        lines[i] = text
+    return "\n".join(lines)
+
+
+BASE = _numbered(200, "base")
+CASE = _mm_case(
+    BASE,
+    _numbered(200, "base", {10: "ours edit"}),
+    _numbered(200, "base", {150: "theirs edit"}),
+)
+NEAR_DUP = _mm_case(
+    BASE,
+    _numbered(200, "base", {10: "ours edit"}),
+    _numbered(200, "base", {150: "theirs edit", 151: "extra theirs edit"}),
+    path="mirror/f.txt",
+)
+UNRELATED = _mm_case(
+    _numbered(200, "other"),
+    _numbered(200, "other", {3: "x"}),
+    _numbered(200, "other", {4: "y"}),
+)
+
+
+def test_signatures_are_deterministic_across_hashers():
+    shingles = case_shingles(CASE)
+    assert MinHasher(seed=7).signature(shingles) == MinHasher(seed=7).signature(
+        shingles
+    )
+    assert MinHasher(seed=7).signature(shingles) != MinHasher(seed=8).signature(
+        shingles
+    )
+
+
+def test_estimated_jaccard_tracks_similarity():
+    hasher = MinHasher()
+    sig = hasher.signature(case_shingles(CASE))
+    assert estimated_jaccard(sig, hasher.signature(case_shingles(NEAR_DUP))) > 0.8
+    assert estimated_jaccard(sig, hasher.signature(case_shingles(UNRELATED))) < 0.1
+
+
+def test_lsh_index_retrieves_near_duplicates_only():
+    hasher = MinHasher()
+    index = LSHIndex()
+    index.add("case", hasher.signature(case_shingles(CASE)))
+    index.add("unrelated", hasher.signature(case_shingles(UNRELATED)))
+
+    assert index.candidates(hasher.signature(case_shingles(NEAR_DUP))) == {"case"}
+
+    index.remove("case")
+    assert "case" not in index and len(index) == 1
+    assert index.candidates(hasher.signature(case_shingles(NEAR_DUP))) == set()
+
+
+def test_lsh_index_rejects_bad_banding():
+    with pytest.raises(ValueError):
+        LSHIndex(num_perm=128, bands=30)
+    with pytest.raises(ValueError):
+        LSHIndex(num_perm=8, bands=4).add("k", (1, 2, 3))
+
+
+def test_case_similarity_requires_matching_type():
+    add_add = AddAddConflictCase(
+        base_path=None,
+        ours_path="f.txt",
+        theirs_path="f.txt",
+        base_content=None,
+        ours_content=CASE.ours_content,
+        theirs_content=CASE.theirs_content,
+        conflict_path="f.txt",
+        conflict_body="",
+        resolved_path=None,
+        resolved_body=None,
+    )
+    assert case_similarity(CASE, CASE) == 1.0
+    assert case_similarity(CASE, add_add) == 0.0
+    assert 0.0 < case_similarity(CASE, NEAR_DUP) < 1.0
+
+
+def test_dedupe_cases_drops_duplicates_and_keeps_order():
+    stream = [CASE, UNRELATED, NEAR_DUP, CASE]
+    assert list(dedupe_cases(stream, threshold=0.5)) == [CASE, UNRELATED]
+    assert list(dedupe_cases(stream, threshold=1.0)) == [CASE, UNRELATED, NEAR_DUP]
+
+
+def test_dedupe_cases_bounded_memory_evicts_oldest():
+    stream = [CASE, UNRELATED, CASE]
+    assert list(dedupe_cases(stream, max_resident=1)) == stream
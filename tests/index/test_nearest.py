@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from conflict_collection.index import ResolutionIndex, brute_force_top_k
+from conflict_collection.metrics.anchored_ratio import anchored_ratio
+
+VOCAB = [f"tok{i}" for i in range(8)]
+
+
+def _mutate(rng: random.Random, lines: list[str]) -> list[str]:
+    out = list(lines)
+    for _ in range(rng.randint(0, 4)):
+        op = rng.choice(["replace", "delete", "insert", "dup"])
+        i = rng.randrange(len(out) + 1)
+        if op == "replace" and i < len(out):
+            out[i] = rng.choice(VOCAB)
+        elif op == "delete" and i < len(out):
+            del out[i]
+        elif op == "insert":
+            out[i:i] = rng.choices(VOCAB, k=rng.randint(1, 3))
+        elif op == "dup" and out:
+            out.insert(i, rng.choice(out))
+    return out
+
+
+def _corpus(seed: int, size: int):
+    rng = random.Random(seed)
+    base = rng.choices(VOCAB, k=rng.randint(0, 10))
+    resolutions = [(f"r{i}", "\n".join(_mutate(rng, base))) for i in range(size)]
+    candidate = "\n".join(_mutate(rng, base))
+    return "\n".join(base), resolutions, candidate
+
+
+@pytest.mark.parametrize("use_line_levenshtein", [False, True])
+def test_upper_bounds_dominate_exact_scores(use_line_levenshtein):
+    for seed in range(60):
+        base, resolutions, candidate = _corpus(seed, 20)
+        index = ResolutionIndex()
+        for key, text in resolutions:
+            index.add(key, text)
+        bounds = index.upper_bounds(
+            base, candidate, use_line_levenshtein=use_line_levenshtein
+        )
+        for (key, text), bound in zip(resolutions, bounds):
+            score = anchored_ratio(
+                base, text, candidate, use_line_levenshtein=use_line_levenshtein
+            )
+            assert score <= bound + 1e-9, (seed, key, score, bound)
+
+
+@pytest.mark.parametrize("use_line_levenshtein", [False, True])
+@pytest.mark.parametrize("k", [1, 3, 50])
+def test_top_k_matches_brute_force(k, use_line_levenshtein):
+    for seed in range(40):
+        base, resolutions, candidate = _corpus(seed, 30)
+        index = ResolutionIndex()
+        for key, text in resolutions:
+            index.add(key, text)
+        expected = brute_force_top_k(
+            base,
+            resolutions,
+            candidate,
+            k,
+            use_line_levenshtein=use_line_levenshtein,
+        )
+        got = index.top_k(base, candidate, k, use_line_levenshtein=use_line_levenshtein)
+        assert got == expected, seed
+
+
+def test_search_prunes_unrelated_resolutions():
+    base = "\n".join(f"line {i}" for i in range(50))
+    candidate = base.replace("line 7", "fixed 7")
+    index = ResolutionIndex()
+    index.add("match", candidate)
+    for i in range(100):
+        index.add(f"other{i}", "\n".join(f"noise {i} {j}" for j in range(50)))
+
+    result = index.search(base, candidate, 1, use_line_levenshtein=False)
+    assert [n.key for n in result.neighbors] == ["match"]
+    assert result.neighbors[0].score == 1.0
+    assert result.evaluated == 1 and result.pruned == 100
+
+
+def test_index_rejects_duplicate_keys_and_handles_empty_queries():
+    index = ResolutionIndex()
+    assert index.top_k("a", "b", 3) == []
+    index.add("k", "a")
+    with pytest.raises(ValueError):
+        index.add("k", "b")
+    assert index.top_k("a", "b", 0) == []
@@ -0,0 +1,82 @@
+import subprocess
+
+import pytest
+
+from conflict_collection.io import CorpusStore, blob_sha
+from conflict_collection.schema.typed_five_tuple import (
+    ModifyDeleteConflictCase,
+    ModifyModifyConflictCase,
+)
+
+BASE = "shared base line\n" * 200
+
+
+def _mm(ours: str, path: str = "a.txt") -> ModifyModifyConflictCase:
+    return ModifyModifyConflictCase(
+        base_path=path,
+        ours_path=path,
+        theirs_path=path,
+        base_content=BASE,
+        ours_content=ours,
+        theirs_content="theirs\n",
+        conflict_path=path,
+        conflict_body=f"<<<<<<< HEAD\n{ours}=======\ntheirs\n>>>>>>> theirs\n",
+        resolved_path=path,
+        resolved_body=ours,
+    )
+
+
+MODIFY_DELETE = ModifyDeleteConflictCase(
+    base_path="b.txt",
+    ours_path="b.txt",
+    theirs_path=None,
+    base_content=BASE,
+    ours_content="kept\n",
+    theirs_content=None,
+    conflict_path="b.txt",
+    conflict_body="kept\n",
+    resolved_path="b.txt",
+    resolved_body="kept\n",
+)
+
+
+def test_blob_sha_matches_git_hash_object(tmp_path):
+    sample = tmp_path / "sample.txt"
+    sample.write_text("hello ünïcode\n", encoding="utf-8")
+    expected = subprocess.run(
+        ["git", "hash-object", str(sample)], capture_output=True, text=True
+    ).stdout.strip()
+    assert blob_sha("hello ünïcode\n") == expected
+
+
+def test_round_trip_and_lazy_iteration(tmp_path):
+    cases = [_mm("one\n"), _mm("two\n", "c.txt"), MODIFY_DELETE]
+    with CorpusStore(tmp_path / "corpus.db") as store:
+        ids = store.add_many(cases, meta={"merge_sha": "abc"})
+        assert [store.get(i) for i in ids] == cases
+        assert store.meta(ids[0]) == {"merge_sha": "abc"}
+
+    with CorpusStore(tmp_path / "corpus.db") as reopened:
+        assert len(reopened) == 3
+        assert reopened.ids() == ids
+        assert list(reopened) == cases
+
+
+def test_contents_are_stored_once(tmp_path):
+    with CorpusStore(tmp_path / "corpus.db") as store:
+        store.add(_mm("one\n"))
+        store.add(_mm("one\n", "mirror.txt"))
+        store.add(MODIFY_DELETE)
+        stats = store.stats()
+
+    # BASE, "one\n", "theirs\n", conflict body, "kept\n"
+    assert stats.cases == 3
+    assert stats.blobs == 5
+    assert stats.stored_bytes < stats.content_bytes
+
+
+def test_missing_ids_raise_key_error(tmp_path):
+    with CorpusStore(tmp_path / "corpus.db") as store:
+        for getter in (store.get, store.meta):
+            with pytest.raises(KeyError):
+                getter(42)
@@ -0,0 +1,141 @@
+import gzip
+
+import pytest
+
+from conflict_collection.io import (
+    ConflictCaseWriter,
+    JSONLShardWriter,
+    SocialSignalsWriter,
+    conflict_case_from_dict,
+    conflict_case_to_dict,
+    iter_conflict_cases,
+    iter_jsonl,
+    iter_social_signals,
+    shard_paths,
+)
+from conflict_collection.schema.social_signals import (
+    BlameEntry,
+    IntegratorPriors,
+    SocialSignalsRecord,
+)
+from conflict_collection.schema.typed_five_tuple import (
+    DELETE_TOKEN,
+    DeleteDeleteConflictCase,
+    ModifyDeleteConflictCase,
+    ModifyModifyConflictCase,
+)
+
+CASES = [
+    ModifyModifyConflictCase(
+        base_path="a.txt",
+        ours_path="a.txt",
+        theirs_path="a.txt",
+        base_content="base\n",
+        ours_content="ours ünïcode\n",
+        theirs_content="theirs\n",
+        conflict_path="a.txt",
+        conflict_body="<<<<<<< HEAD\nours\n=======\ntheirs\n>>>>>>> theirs\n",
+        resolved_path="a.txt",
+        resolved_body="ours\n",
+    ),
+    ModifyDeleteConflictCase(
+        base_path="b.txt",
+        ours_path="b.txt",
+        theirs_path=None,
+        base_content="b\n",
+        ours_content="b2\n",
+        theirs_content=None,
+        conflict_path="b.txt",
+        conflict_body="b2\n",
+        resolved_path=None,
+        resolved_body=DELETE_TOKEN,
+    ),
+    DeleteDeleteConflictCase(
+        base_path="c.txt",
+        ours_path=None,
+        theirs_path=None,
+        base_content="c\n",
+        ours_content=None,
+        theirs_content=None,
+        conflict_path="c.txt",
+        conflict_body=None,
+        resolved_path=None,
+        resolved_body=None,
+    ),
+]
+
+RECORD = SocialSignalsRecord(
+    file="a.txt",
+    ours_author="alice",
+    theirs_author="bob",
+    owner_commits_ours=2,
+    owner_commits_theirs=1,
+    age_days_ours=3,
+    age_days_theirs=None,
+    integrator_priors=IntegratorPriors(resolver_prev_commits=4),
+    blame_table=[BlameEntry(author="alice", lines=10)],
+)
+
+
+def test_case_dict_round_trip_preserves_type():
+    for case in CASES:
+        data = conflict_case_to_dict(case)
+        assert data["conflict_type"] == case.conflict_type
+        assert conflict_case_from_dict({**data, "merge_sha": "x"}) == case
+
+
+def test_case_from_dict_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        conflict_case_from_dict({"conflict_type": "rename_rename"})
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_case_writer_round_trip(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    with ConflictCaseWriter(tmp_path, "cases", compression=compression) as writer:
+        for case in CASES:
+            writer.write(case, extra={"merge_sha": "abc"})
+
+    assert len(writer.paths) == 1
+    assert list(iter_conflict_cases(tmp_path, prefix="cases")) == CASES
+    assert {r["merge_sha"] for r in iter_jsonl(writer.paths)} == {"abc"}
+
+
+def test_writer_rotates_by_size_and_reads_in_order(tmp_path):
+    with ConflictCaseWriter(tmp_path, max_shard_bytes=1, compression="gzip") as w:
+        for case in CASES:
+            w.write(case)
+
+    paths = shard_paths(tmp_path)
+    assert [p.name for p in paths] == [
+        "part-00000.jsonl.gz",
+        "part-00001.jsonl.gz",
+        "part-00002.jsonl.gz",
+    ]
+    with gzip.open(paths[0], "rt", encoding="utf-8") as fh:
+        assert len(fh.readlines()) == 1
+    assert list(iter_conflict_cases(tmp_path)) == CASES
+
+
+def test_writer_appends_after_existing_shards(tmp_path):
+    with JSONLShardWriter(tmp_path) as writer:
+        writer.write_dict({"run": 1})
+    with JSONLShardWriter(tmp_path, compression="gzip") as writer:
+        writer.write_dict({"run": 2})
+
+    assert [p.name for p in shard_paths(tmp_path)] == [
+        "part-00000.jsonl",
+        "part-00001.jsonl.gz",
+    ]
+    assert [r["run"] for r in iter_jsonl(tmp_path)] == [1, 2]
+
+
+def test_social_signals_round_trip(tmp_path):
+    with SocialSignalsWriter(tmp_path, "social") as writer:
+        writer.write(RECORD, extra={"merge_sha": "abc"})
+        writer.write(RECORD.model_copy(update={"file": "b.txt"}))
+
+    records = list(iter_social_signals(tmp_path, prefix="social"))
+    assert records[0] == RECORD
+    assert [r.file for r in records] == ["a.txt", "b.txt"]
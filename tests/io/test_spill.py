@@ -0,0 +1,60 @@
+import pytest
+
+from conflict_collection.io import CaseSpool, case_body_bytes
+from conflict_collection.schema.typed_five_tuple import (
+    AddedByUsConflictCase,
+    DeleteDeleteConflictCase,
+)
+
+
+def _case(i: int) -> AddedByUsConflictCase:
+    body = f"line {i} ünïcode\n" * 10
+    return AddedByUsConflictCase(
+        base_path=None,
+        ours_path=f"f{i}.txt",
+        theirs_path=None,
+        base_content=None,
+        ours_content=body,
+        theirs_content=None,
+        conflict_path=f"f{i}.txt",
+        conflict_body=body,
+        resolved_path=None,
+        resolved_body=None,
+    )
+
+
+def test_spool_keeps_budget_and_reads_spilled_cases_back():
+    cases = [_case(i) for i in range(6)]
+    budget = 2 * case_body_bytes(cases[0])
+    with CaseSpool(budget) as spool:
+        for case in cases:
+            spool.append(case)
+
+        assert spool.spilled == 4
+        assert spool.resident_bytes <= budget
+        assert list(spool) == cases
+        assert spool[-1] == cases[-1]
+        assert spool[1:4] == cases[1:4]
+        with pytest.raises(IndexError):
+            spool[6]
+
+    with pytest.raises(ValueError):
+        spool[5]
+
+
+def test_zero_budget_spills_everything():
+    case = DeleteDeleteConflictCase(
+        base_path="gone.txt",
+        ours_path=None,
+        theirs_path=None,
+        base_content="x\n",
+        ours_content=None,
+        theirs_content=None,
+        conflict_path="gone.txt",
+        conflict_body=None,
+        resolved_path=None,
+        resolved_body=None,
+    )
+    spool = CaseSpool(0)
+    spool.append(case)
+    assert spool.spilled == 1 and spool[0] == case
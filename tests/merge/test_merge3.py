@@ -0,0 +1,140 @@
+import random
+import subprocess
+from pathlib import Path
+
+import pytest
+from conflict_parser import MergeMetadata
+
+from conflict_collection.benchmarks.synthetic_repo import RepoSpec, generate_repo
+from conflict_collection.collectors.conflict_type import collect
+from conflict_collection.merge import merge3
+
+BASE = "a\nb\nc\nd\ne\n"
+
+
+def test_clean_merge_takes_both_sides():
+    ours = "a\nB\nc\nd\ne\n"
+    theirs = "a\nb\nc\nd\nE\n"
+
+    assert merge3(BASE, ours, theirs).text == "a\nB\nc\nd\nE\n"
+    assert merge3(BASE, ours, theirs).conflicts == 0
+    assert merge3(BASE, ours, ours).text == ours
+
+
+def test_conflict_markup_per_style():
+    ours, theirs = "a\nX\nc\nd\ne\n", "a\nY\nc\nd\ne\n"
+    labels = ("HEAD", "base", "topic")
+
+    merged = merge3(BASE, ours, theirs, labels=labels)
+    assert merged.conflicts == 1
+    assert merged.text == "a\n<<<<<<< HEAD\nX\n=======\nY\n>>>>>>> topic\nc\nd\ne\n"
+
+    diff3 = merge3(BASE, ours, theirs, labels=labels, style="diff3").text
+    assert "X\n||||||| base\nb\n=======\nY\n" in diff3
+
+    short = merge3(BASE, ours, theirs, metadata=MergeMetadata(marker_size=3))
+    assert short.text.startswith("a\n<<< ours\nX\n===\nY\n>>> theirs\n")
+
+
+def test_zdiff3_moves_shared_lines_out_of_the_conflict():
+    ours, theirs = "a\nS\nX\nT\ne\n", "a\nS\nY\nT\ne\n"
+
+    zdiff3 = merge3(BASE, ours, theirs, style="zdiff3", labels=("o", None, "t"))
+
+    assert (
+        zdiff3.text
+        == "a\nS\n<<<<<<< o\nX\n|||||||\nb\nc\nd\n=======\nY\n>>>>>>> t\nT\ne\n"
+    )
+
+
+def test_missing_final_newline_and_crlf():
+    merged = merge3("a\r\nb\r\n", "a\r\nX", "a\r\nY", labels=(None, None, None))
+
+    assert merged.text == "a\r\n<<<<<<<\r\nX\r\n=======\r\nY\r\n>>>>>>>\r\n"
+
+
+def test_rejects_unknown_options():
+    with pytest.raises(ValueError, match="style"):
+        merge3(BASE, BASE, BASE, style="union")
+    with pytest.raises(ValueError, match="level"):
+        merge3(BASE, BASE, BASE, level="aggressive")
+
+
+_POOL = ["}\n", "{\n", "\n", "return x;\n", "end\n", "  pass\n", "x = 1\n"]
+
+
+def _lines(rng, n):
+    return [
+        rng.choice(_POOL) if rng.random() < 0.5 else f"line{rng.randrange(30)}\n"
+        for _ in range(n)
+    ]
+
+
+def _edit(rng, lines):
+    out = list(lines)
+    for _ in range(rng.randrange(6)):
+        at = rng.randrange(len(out) + 1)
+        op = rng.randrange(3)
+        if op == 0:
+            out[at:at] = _lines(rng, rng.randrange(1, 4))
+        elif op == 1:
+            del out[at : at + rng.randrange(1, 4)]
+        elif out:
+            out[min(at, len(out) - 1)] = _lines(rng, 1)[0]
+    return out
+
+
+@pytest.mark.parametrize("style", ["merge", "diff3", "zdiff3"])
+def test_matches_git_merge_file(tmp_path: Path, style: str):
+    for seed in range(60):
+        rng = random.Random(seed)
+        base = _lines(rng, rng.randrange(40))
+        texts = ["".join(_edit(rng, base)), "".join(base), "".join(_edit(rng, base))]
+        for name, text in zip("aob", texts):
+            (tmp_path / name).write_bytes(text.encode())
+        argv = ["git", "merge-file", "-p", "-L", "ours", "-L", "base", "-L", "theirs"]
+        if style != "merge":
+            argv.append(f"--{style}")
+        git = subprocess.run(
+            argv + [str(tmp_path / name) for name in "aob"], capture_output=True
+        )
+
+        merged = merge3(
+            texts[1],
+            texts[0],
+            texts[2],
+            style=style,
+            algorithm="myers",
+            level="zealous_alnum",
+        )
+
+        assert merged.text == git.stdout.decode(), f"seed {seed}"
+        assert merged.conflicts == git.returncode, f"seed {seed}"
+
+
+def test_matches_conflict_bodies_of_real_merges(tmp_path: Path, conflict_repo_path):
+    spec = RepoSpec(
+        history_depth=4,
+        files=6,
+        file_lines=40,
+        conflicts={"modify_modify": 4, "add_add": 2},
+    )
+    synthetic = generate_repo(tmp_path / "synthetic", spec)
+    cases = collect(str(conflict_repo_path), "HEAD")
+    cases += collect(str(synthetic.path), synthetic.resolution_sha)
+
+    checked = 0
+    for case in cases:
+        if case.conflict_type not in ("modify_modify", "add_add"):
+            continue
+        # The branch label depends on the ref the fixture merged.
+        theirs_label = case.conflict_body.split(">>>>>>> ", 1)[1].split("\n", 1)[0]
+        merged = merge3(
+            case.base_content or "",
+            case.ours_content,
+            case.theirs_content,
+            labels=("HEAD", None, theirs_label),
+        )
+        assert merged.text == case.conflict_body, case.conflict_path
+        checked += 1
+    assert checked >= 7
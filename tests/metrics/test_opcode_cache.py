@@ -0,0 +1,59 @@
+import pytest
+
+from conflict_collection.metrics.anchored_ratio import OpcodeCache, anchored_ratio
+
+O = "a\nb\nc\nd"
+R = "a\nB\nc\nX\nd"
+R_HAT = "a\nB2\nc\nd\nY"
+
+
+@pytest.mark.parametrize("use_line_levenshtein", [False, True])
+def test_cached_score_matches_uncached(use_line_levenshtein):
+    cache = OpcodeCache()
+    expected = anchored_ratio(O, R, R_HAT, use_line_levenshtein=use_line_levenshtein)
+    for _ in range(3):
+        score = anchored_ratio(
+            O, R, R_HAT, use_line_levenshtein=use_line_levenshtein, cache=cache
+        )
+        assert score == expected
+
+
+def test_cache_counts_hits_across_levenshtein_ablation():
+    cache = OpcodeCache()
+    anchored_ratio(O, R, R_HAT, use_line_levenshtein=False, cache=cache)
+    anchored_ratio(O, R, R_HAT, use_line_levenshtein=True, cache=cache)
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+    assert info.hit_rate == 0.5
+
+
+def test_cache_key_ignores_blank_lines():
+    cache = OpcodeCache()
+    anchored_ratio(O, R, R_HAT, cache=cache)
+    anchored_ratio(O + "\n\n", "\n" + R, R_HAT + "\n   \n", cache=cache)
+    assert cache.info().hits == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = OpcodeCache(maxsize=2)
+    anchored_ratio(O, R, R_HAT, cache=cache)  # (O,R), (O,R_HAT)
+    anchored_ratio(O, R, "z", cache=cache)  # hit (O,R); evicts (O,R_HAT)
+    assert len(cache) == 2
+
+    anchored_ratio(O, R_HAT, "z", cache=cache)
+    info = cache.info()
+    assert info.hits == 2  # (O,R) and (O,"z")
+    assert info.misses == 4
+
+
+def test_cache_clear_resets_entries_and_stats():
+    cache = OpcodeCache()
+    anchored_ratio(O, R, R_HAT, cache=cache)
+    cache.clear()
+    assert cache.info() == (0, 0, 1024, 0)
+
+
+def test_cache_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        OpcodeCache(maxsize=0)
@@ -0,0 +1,57 @@
+import pytest
+
+from conflict_collection.metrics.anchored_ratio import (
+    OpcodeCache,
+    PreparedText,
+    anchored_ratio,
+    prepare,
+)
+
+O = "a\n\nb\nc\nd"
+R = "a\nB\n  \nc\nX\nd"
+R_HAT = "a\nB2\nc\nd\nY"
+
+
+def test_prepared_text_filters_blank_lines_and_interns():
+    first = PreparedText.from_text("x\n\n  \ny")
+    second = PreparedText.from_text("y\nx")
+    assert first.lines == ("x", "y")
+    assert first.lines[0] is second.lines[1]
+
+
+def test_prepared_text_equality_and_digest():
+    assert PreparedText.from_text("a\n\nb") == PreparedText.from_text("a\nb\n")
+    assert (
+        PreparedText.from_text("a\nb").digest != PreparedText.from_text("b\na").digest
+    )
+    assert PreparedText(["a", "b"]).digest == PreparedText.from_text("a\nb").digest
+
+
+def test_prepare_reuses_prepared_instances():
+    prepared = PreparedText.from_text(O)
+    assert prepare(prepared) is prepared
+    assert prepare(O) == prepared
+
+
+@pytest.mark.parametrize("use_line_levenshtein", [False, True])
+@pytest.mark.parametrize(
+    "mask",
+    [(a, b, c) for a in (0, 1) for b in (0, 1) for c in (0, 1)],
+)
+def test_prepared_and_raw_inputs_score_identically(mask, use_line_levenshtein):
+    texts = [O, R, R_HAT]
+    mixed = [PreparedText.from_text(t) if m else t for t, m in zip(texts, mask)]
+    expected = anchored_ratio(*texts, use_line_levenshtein=use_line_levenshtein)
+    score = anchored_ratio(*mixed, use_line_levenshtein=use_line_levenshtein)
+    assert score == expected
+
+
+def test_prepared_inputs_share_cache_entries_with_raw_inputs():
+    cache = OpcodeCache()
+    anchored_ratio(O, R, R_HAT, cache=cache)
+    anchored_ratio(prepare(O), prepare(R), prepare(R_HAT), cache=cache)
+    assert cache.info().hits == 2
+
+
+def test_identical_after_filtering_returns_one():
+    assert anchored_ratio(O, "a\nZ\n", PreparedText.from_text("\na\n\nZ")) == 1.0
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+from git import GitCommandError, Repo
+
+
+def _commit(repo: Repo, files: dict[str, str], message: str) -> None:
+    for name, text in files.items():
+        (Path(repo.working_tree_dir) / name).write_text(text)
+    repo.git.add(*files)
+    repo.git.commit("-q", "-m", message)
+
+
+def _conflicting_merge(repo: Repo, name: str, branch: str) -> None:
+    """Edit ``name`` on ``branch`` and on main, then merge with a resolution."""
+    repo.git.checkout("-q", "-b", branch)
+    _commit(repo, {name: f"{branch} side\n"}, f"{branch}: edit {name}")
+    repo.git.checkout("-q", "main")
+    _commit(repo, {name: "main side\n"}, f"main: edit {name}")
+    try:
+        repo.git.merge("-q", "--no-ff", branch)
+    except GitCommandError:
+        pass
+    _commit(repo, {name: "resolved\n"}, f"Merge {branch}")
+
+
+@pytest.fixture
+def add_conflicting_merge():
+    """Append a conflicting, resolved merge of a new branch to ``main``."""
+
+    def add(repo_path: Path, name: str, branch: str) -> None:
+        repo = Repo(repo_path)
+        _commit(repo, {name: "base\n"}, f"add {name}")
+        _conflicting_merge(repo, name, branch)
+        repo.close()
+
+    return add
+
+
+@pytest.fixture
+def history_repo(tmp_path: Path) -> Path:
+    """A repo on ``main`` with two conflicting merges and one clean merge."""
+    repo = Repo.init(tmp_path / "history", initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Integrator")
+        config.set_value("user", "email", "integrator@example.com")
+        config.set_value("core", "autocrlf", "false")
+
+    _commit(repo, {"a.txt": "base\n", "b.txt": "base\n", "c.txt": "c\n"}, "init")
+    _conflicting_merge(repo, "a.txt", "feature-a")
+    _conflicting_merge(repo, "b.txt", "feature-b")
+
+    repo.git.checkout("-q", "-b", "feature-c")
+    _commit(repo, {"c.txt": "c changed\n"}, "feature-c: edit c.txt")
+    repo.git.checkout("-q", "main")
+    repo.git.merge("-q", "--no-ff", "-m", "Merge feature-c", "feature-c")
+
+    repo.close()
+    return tmp_path / "history"
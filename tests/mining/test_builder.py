@@ -0,0 +1,119 @@
+import json
+
+import pytest
+from git import Repo
+
+from conflict_collection.cli import main
+from conflict_collection.io.jsonl import iter_conflict_cases, iter_jsonl
+from conflict_collection.mining import (
+    CheckpointManifest,
+    CorpusOutput,
+    ScratchWorktree,
+    Watermark,
+    build_corpus,
+    list_merges,
+    mine_merge,
+)
+
+
+def test_list_merges_and_replay(history_repo):
+    merges = list_merges(Repo(history_repo), "main")
+    assert len(merges) == 3
+
+    with ScratchWorktree(history_repo) as worktree:
+        assert [worktree.replay(m) for m in merges] == [True, True, False]
+        path = worktree.path
+    assert not path.exists()
+    assert Repo(history_repo).git.status("--porcelain") == ""
+
+
+def test_build_resumes_from_checkpoint(history_repo, tmp_path):
+    out = tmp_path / "out"
+
+    first = build_corpus(history_repo, "main", out, limit=1)
+    assert (first.conflicted, first.cases, first.social_records) == (1, 1, 1)
+
+    second = build_corpus(history_repo, "main", out)
+    assert (second.skipped, second.conflicted, second.clean) == (1, 1, 1)
+
+    third = build_corpus(history_repo, "main", out)
+    assert (third.skipped, third.conflicted + third.clean) == (3, 0)
+
+    cases = list(iter_conflict_cases(out / "cases"))
+    assert sorted(c.conflict_path for c in cases) == ["a.txt", "b.txt"]
+    assert all(c.resolved_body.strip() == "resolved" for c in cases)
+    merge_shas = {r["merge_sha"] for r in iter_jsonl(out / "social")}
+    assert len(merge_shas) == 2
+    assert len(CheckpointManifest(out / "checkpoint.jsonl")) == 3
+
+
+def test_commit_closes_spooled_cases(history_repo, tmp_path):
+    merges = list_merges(Repo(history_repo), "main")
+    with (
+        ScratchWorktree(history_repo) as worktree,
+        CorpusOutput(tmp_path / "out") as output,
+    ):
+        result = mine_merge(worktree, merges[0], societal=False, memory_budget=0)
+        assert result.cases.spilled == 1
+        output.commit(result)
+    assert len(result.cases) == 1
+    with pytest.raises(ValueError, match="closed"):
+        result.cases[0]
+    assert len(list(iter_conflict_cases(tmp_path / "out" / "cases"))) == 1
+
+
+def test_checkpoint_ignores_torn_last_line(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text('{"merge": "a", "status": "clean"}\n{"merge": "b", "sta')
+
+    manifest = CheckpointManifest(path)
+    assert "a" in manifest and "b" not in manifest
+    manifest.record("b", "clean")
+    assert set(CheckpointManifest(path).entries) == {"a", "b"}
+
+
+def test_cli_build(history_repo, tmp_path, capsys):
+    argv = ["build", str(history_repo), "main", "-o", str(tmp_path / "o")]
+    code = main([*argv, "-q", "--memory-budget-mb", "0"])
+    assert code == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["conflicted"] == 2 and stats["cases"] == 2
+
+
+def test_cli_file_timeout_records_partial_social_signals(history_repo, tmp_path):
+    out = tmp_path / "o"
+    argv = ["build", str(history_repo), "main", "-o", str(out), "-q"]
+    assert main([*argv, "--file-timeout", "0"]) == 0
+
+    records = list(iter_jsonl(out / "social"))
+    assert len(records) == 2
+    assert all(r["partial"] and r["blame_table"] is None for r in records)
+
+
+def test_failed_merge_is_retried_and_holds_the_watermark(
+    history_repo, tmp_path, monkeypatch
+):
+    from conflict_collection.mining import builder
+
+    out = tmp_path / "out"
+    real = builder.collect_conflict_types
+    calls = []
+
+    def flaky(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError("transient")
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(builder, "collect_conflict_types", flaky)
+    first = build_corpus(history_repo, "main", out, incremental=True)
+    assert (first.failed, first.conflicted) == (1, 1)
+    assert Watermark(out / "watermark.json").tips("main") == []
+
+    second = build_corpus(history_repo, "main", out, incremental=True)
+    assert (second.skipped, second.failed, second.conflicted) == (2, 0, 1)
+    assert len(Watermark(out / "watermark.json").tips("main")) == 1
+    cases = list(iter_conflict_cases(out / "cases"))
+    assert sorted(c.conflict_path for c in cases) == ["a.txt", "b.txt"]
+    manifest = CheckpointManifest(out / "checkpoint.jsonl")
+    assert all(manifest.is_done(sha) for sha in manifest.entries)
@@ -0,0 +1,237 @@
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+from git import Repo
+
+from conflict_collection.cli import main
+from conflict_collection.io.jsonl import iter_conflict_cases, iter_jsonl
+from conflict_collection.mining import (
+    CheckpointManifest,
+    CorpusOutput,
+    MergeResult,
+    ScratchWorktree,
+    ShardManifest,
+    build_corpus,
+    combine_shards,
+    distributed,
+    list_merges,
+    mine_merge,
+    mine_shards,
+    shard_of,
+)
+
+
+def test_shard_of_is_stable_and_in_range():
+    shas = [f"{i:040x}" for i in range(200)]
+    assigned = [shard_of(sha, 4) for sha in shas]
+    assert assigned == [shard_of(sha, 4) for sha in shas]
+    assert set(assigned) == {0, 1, 2, 3}
+
+
+def _node(repo, shared, name):
+    mine_shards(repo, "main", shared, 4, node=name, societal=False)
+
+
+def test_processes_mine_shards_and_combine(history_repo, tmp_path):
+    shared = tmp_path / "shared"
+    context = multiprocessing.get_context("spawn")
+    nodes = [
+        context.Process(target=_node, args=(history_repo, shared, f"node-{i}"))
+        for i in range(3)
+    ]
+    for process in nodes:
+        process.start()
+    for process in nodes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    done = ShardManifest(shared, 4).done()
+    assert sorted(done) == [0, 1, 2, 3]
+    assert sum(record["merges"] for record in done.values()) == 3
+    assert not list((shared / "leases").iterdir())
+
+    stats = combine_shards(shared, tmp_path / "corpus")
+    assert (stats.merges, stats.conflicted, stats.clean, stats.cases) == (3, 2, 1, 2)
+
+    single = tmp_path / "single"
+    build_corpus(history_repo, "main", single, societal=False)
+    key = lambda c: (c.conflict_path, c.resolved_body)  # noqa: E731
+    assert sorted(map(key, iter_conflict_cases(tmp_path / "corpus" / "cases"))) == (
+        sorted(map(key, iter_conflict_cases(single / "cases")))
+    )
+    manifest = CheckpointManifest(tmp_path / "corpus" / "checkpoint.jsonl")
+    assert set(manifest.entries) == set(
+        CheckpointManifest(single / "checkpoint.jsonl").entries
+    )
+
+    # The combined corpus carries the watermark, so it continues incrementally.
+    again = build_corpus(history_repo, "main", tmp_path / "corpus", incremental=True)
+    assert again.merges == 0
+
+
+def test_live_lease_blocks_and_stale_lease_is_taken_over(tmp_path):
+    first = ShardManifest(tmp_path, 2, node="a", lease_seconds=60)
+    second = ShardManifest(tmp_path, 2, node="b", lease_seconds=60)
+
+    lease = first.claim(0)
+    assert lease is not None
+    assert second.claim(0) is None
+
+    # The holder crashes: its lease stops being refreshed.
+    old = time.time() - 120
+    os.utime(lease.path, (old, old))
+    taken = second.claim(0)
+    assert taken is not None
+    assert not lease.renew() and lease.lost
+    lease.release()
+    assert taken.path.exists()  # the loser leaves the new lease alone
+    taken.release()
+    assert not taken.path.exists()
+
+
+def test_crashed_node_shard_is_resumed(history_repo, tmp_path):
+    shared = tmp_path / "shared"
+    repo = Repo(history_repo)
+    first = list_merges(repo, "main")[0]
+    repo.close()
+    shard = shard_of(first.sha, 2)
+
+    # A node mined part of the shard, then died holding its lease.
+    mine_shards(history_repo, "main", shared, 2, societal=False, max_shards=0)
+    manifest = ShardManifest(shared, 2, node="crashed", lease_seconds=1)
+    lease = manifest.claim(shard)
+    with (
+        CorpusOutput(manifest.shard_dir(shard)) as output,
+        ScratchWorktree(history_repo) as worktree,
+    ):
+        output.commit(mine_merge(worktree, first, societal=False))
+    old = time.time() - 60
+    os.utime(lease.path, (old, old))
+
+    stats = mine_shards(
+        history_repo, "main", shared, 2, node="rescuer", lease_seconds=1, societal=False
+    )
+    assert sorted(stats.shards) == [0, 1]
+    assert (stats.merges, stats.skipped) == (3, 1)
+    combined = combine_shards(shared, tmp_path / "corpus")
+    assert combined.merges == 3
+
+
+def test_taken_over_holder_stops_and_duplicates_are_combined_once(
+    history_repo, tmp_path, monkeypatch
+):
+    shared = tmp_path / "shared"
+    mine_shards(history_repo, "main", shared, 2, societal=False, max_shards=0)
+    with ScratchWorktree(history_repo) as worktree:
+        results = {
+            m.sha: mine_merge(worktree, m, societal=False)
+            for m in list_merges(Repo(history_repo), "main")
+        }
+    conflicted = next(sha for sha, r in results.items() if r.status == "conflicted")
+    shard = shard_of(conflicted, 2)
+    manifest = ShardManifest(shared, 2, node="thief", lease_seconds=1)
+    shard_dir = manifest.shard_dir(shard)
+
+    # Another node takes the shard over while this one mines the merge.
+    mine = distributed.mine_merge
+
+    def stolen(worktree, merge, **kwargs):
+        result = mine(worktree, merge, **kwargs)
+        if merge.sha == conflicted:
+            lease_path = shared / "leases" / f"{shard_dir.name}.lease"
+            lease_path.write_text("thief", encoding="utf-8")
+        return result
+
+    monkeypatch.setattr(distributed, "mine_merge", stolen)
+    stats = mine_shards(history_repo, "main", shared, 2, node="a", societal=False)
+    monkeypatch.undo()
+    assert shard not in stats.shards
+    assert conflicted not in CheckpointManifest(shard_dir / "checkpoint.jsonl")
+
+    # The thief writes the merge's records but dies before checkpointing it.
+    with CorpusOutput(shard_dir) as output:
+        output.commit(results[conflicted])
+    (shard_dir / "checkpoint.jsonl").unlink()
+    old = time.time() - 60
+    os.utime(shared / "leases" / f"{shard_dir.name}.lease", (old, old))
+
+    rescued = mine_shards(
+        history_repo, "main", shared, 2, node="b", lease_seconds=1, societal=False
+    )
+    assert rescued.shards == [shard]
+    cases = [r["merge_sha"] for r in iter_jsonl(shard_dir / "cases")]
+    assert cases.count(conflicted) == 2
+
+    combined = combine_shards(shared, tmp_path / "corpus")
+    assert (combined.conflicted, combined.cases) == (2, 2)
+    merged = [r["merge_sha"] for r in iter_jsonl(tmp_path / "corpus" / "cases")]
+    assert sorted(merged) == sorted(
+        sha for sha, r in results.items() if r.status == "conflicted"
+    )
+
+
+def test_failed_merge_keeps_its_shard_open_until_retried(
+    history_repo, tmp_path, monkeypatch
+):
+    shared = tmp_path / "shared"
+    first = list_merges(Repo(history_repo), "main")[0]
+    shard = shard_of(first.sha, 2)
+    mine = distributed.mine_merge
+
+    def flaky(worktree, merge, **kwargs):
+        if merge.sha == first.sha:
+            return MergeResult(merge, "failed", error="transient")
+        return mine(worktree, merge, **kwargs)
+
+    monkeypatch.setattr(distributed, "mine_merge", flaky)
+    stats = mine_shards(history_repo, "main", shared, 2, societal=False)
+    assert (stats.failed, stats.unfinished) == (1, [shard])
+    assert shard not in stats.shards
+    with pytest.raises(ValueError, match="not done"):
+        combine_shards(shared, tmp_path / "corpus")
+
+    # A shard marked done despite the failure (as older runs did): the
+    # combined corpus holds back its watermark, so a build retries it.
+    ShardManifest(shared, 2).complete(shard)
+    combined = combine_shards(shared, tmp_path / "corpus")
+    assert combined.failed == 1
+    assert not (tmp_path / "corpus" / "watermark.json").exists()
+    monkeypatch.undo()
+    again = build_corpus(
+        history_repo, "main", tmp_path / "corpus", incremental=True, societal=False
+    )
+    assert (again.failed, again.skipped, again.merges - again.skipped) == (0, 2, 1)
+
+    # The shard itself is retried by the next run once it is open again.
+    (shared / "done" / f"{shard:05d}.json").unlink()
+    rerun = mine_shards(history_repo, "main", shared, 2, societal=False)
+    assert (rerun.failed, rerun.shards, rerun.unfinished) == (0, [shard], [])
+    assert combine_shards(shared, tmp_path / "fixed").failed == 0
+    assert (tmp_path / "fixed" / "watermark.json").exists()
+
+
+def test_combine_refuses_unfinished_shards(history_repo, tmp_path):
+    shared = tmp_path / "shared"
+    mine_shards(history_repo, "main", shared, 3, societal=False, max_shards=1)
+    with pytest.raises(ValueError, match="not done"):
+        combine_shards(shared, tmp_path / "corpus")
+
+
+def test_plan_mismatch_is_rejected(history_repo, tmp_path):
+    mine_shards(history_repo, "main", tmp_path, 2, societal=False, max_shards=0)
+    with pytest.raises(ValueError, match="planned"):
+        mine_shards(history_repo, "main", tmp_path, 3, societal=False)
+
+
+def test_cli_shard_and_combine(history_repo, tmp_path, capsys):
+    shared, out = str(tmp_path / "shared"), str(tmp_path / "out")
+    argv = ["shard", str(history_repo), "main", "-o", shared, "--shards", "2"]
+    assert main([*argv, "-q", "--no-societal"]) == 0
+    assert json.loads(capsys.readouterr().out)["conflicted"] == 2
+
+    assert main(["combine", shared, "-o", out]) == 0
+    assert json.loads(capsys.readouterr().out)["cases"] == 2
+    assert len(list(iter_jsonl(tmp_path / "out" / "cases"))) == 2
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+from git import GitCommandError, Repo
+
+from conflict_collection.mining import WorktreePool, list_merges
+
+
+def test_pool_bounds_and_reuses_worktrees(history_repo):
+    merges = list_merges(Repo(history_repo), "main")
+    lock = threading.Lock()
+    busy = peak = 0
+
+    def job(merge):
+        nonlocal busy, peak
+        with pool.lease(timeout=30) as worktree:
+            with lock:
+                busy += 1
+                peak = max(peak, busy)
+            worktree.replay(merge)
+            time.sleep(0.05)
+            with lock:
+                busy -= 1
+
+    with WorktreePool(history_repo, size=2) as pool:
+        threads = [threading.Thread(target=job, args=(m,)) for m in merges * 2]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert (peak, pool.created, pool.discarded) == (2, 2, 0)
+        with pool.lease() as worktree:
+            # Released worktrees come back reset: no merge in progress.
+            assert worktree.repo.git.status("--porcelain") == ""
+            assert not (worktree.path / ".git").is_dir()
+
+    assert Repo(history_repo).git.worktree("list").count("\n") == 0
+
+
+def test_failed_reset_discards_worktree(history_repo, monkeypatch):
+    with WorktreePool(history_repo, size=1) as pool:
+        with pool.lease() as worktree:
+            worktree.replay(list_merges(Repo(history_repo), "main")[0])
+
+            def broken_reset():
+                raise GitCommandError("reset", 128)
+
+            monkeypatch.setattr(worktree, "reset", broken_reset)
+
+        assert pool.discarded == 1 and not worktree.path.exists()
+        with pool.lease() as fresh:
+            assert fresh is not worktree
+
+
+def test_lease_times_out_when_exhausted(history_repo):
+    with WorktreePool(history_repo, size=1) as pool:
+        with pool.lease():
+            with pytest.raises(TimeoutError):
+                pool.acquire(timeout=0.01)
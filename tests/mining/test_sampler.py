@@ -0,0 +1,111 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from git import GitCommandError, Repo
+
+from conflict_collection.cli import main
+from conflict_collection.io.jsonl import iter_conflict_cases
+from conflict_collection.mining import classify_merge, list_merges, sample_corpus
+
+
+def _merge(repo: Repo, branch: str) -> None:
+    try:
+        repo.git.merge("-q", "--no-ff", branch)
+    except GitCommandError:
+        pass
+    repo.git.add("-A")
+    repo.git.commit("-q", "-m", f"Merge {branch}")
+
+
+@pytest.fixture
+def mixed_repo(history_repo: Path) -> Path:
+    """``history_repo`` plus a modify/delete and an add/add merge."""
+    repo = Repo(history_repo)
+    root = Path(repo.working_tree_dir)
+
+    repo.git.checkout("-q", "-b", "drop-c")
+    repo.git.rm("-q", "c.txt")
+    repo.git.commit("-q", "-m", "drop c.txt")
+    repo.git.checkout("-q", "main")
+    (root / "c.txt").write_text("c edited on main\n")
+    repo.git.commit("-q", "-am", "main: edit c.txt")
+    _merge(repo, "drop-c")
+
+    repo.git.checkout("-q", "-b", "add-d")
+    (root / "d.txt").write_text("theirs\n")
+    repo.git.add("d.txt")
+    repo.git.commit("-q", "-m", "add d.txt")
+    repo.git.checkout("-q", "main")
+    (root / "d.txt").write_text("ours\n")
+    repo.git.add("d.txt")
+    repo.git.commit("-q", "-m", "main: add d.txt")
+    _merge(repo, "add-d")
+
+    repo.close()
+    return history_repo
+
+
+def test_classify_merge_from_stages_only(mixed_repo):
+    repo = Repo(mixed_repo)
+    merges = list_merges(repo, "main")
+    assert [classify_merge(repo, m) for m in merges] == [
+        Counter(modify_modify=1),
+        Counter(modify_modify=1),
+        Counter(),
+        Counter(modify_delete=1),
+        Counter(add_add=1),
+    ]
+    # In memory: the checkout is untouched.
+    assert repo.git.status("--porcelain") == ""
+
+
+def test_sample_stops_once_quotas_are_met(mixed_repo, tmp_path):
+    out = tmp_path / "out"
+    seen = []
+    stats = sample_corpus(
+        mixed_repo,
+        "main",
+        out,
+        {"modify_modify": 1, "modify_delete": 1},
+        societal=False,
+        on_merge=lambda merge, status: seen.append(status),
+    )
+
+    assert stats.complete
+    assert (stats.merges, stats.classified, stats.mined) == (5, 4, 2)
+    assert stats.cases == {"modify_modify": 1, "modify_delete": 1}
+    # The second modify/modify and the clean merge were not replayed; the
+    # add/add merge was never classified.
+    assert seen == ["conflicted", "unneeded", "unneeded", "conflicted"]
+    cases = list(iter_conflict_cases(out / "cases"))
+    assert sorted(c.conflict_type for c in cases) == ["modify_delete", "modify_modify"]
+
+
+def test_sample_resumes_quotas_from_checkpoint(mixed_repo, tmp_path):
+    out = tmp_path / "out"
+    sample_corpus(mixed_repo, "main", out, {"modify_modify": 1}, societal=False)
+
+    stats = sample_corpus(
+        mixed_repo, "main", out, {"modify_modify": 2, "add_add": 5}, societal=False
+    )
+    assert (stats.skipped, stats.mined) == (1, 2)
+    assert stats.cases == {"modify_modify": 2, "add_add": 1}
+    assert not stats.complete
+    assert len(list(iter_conflict_cases(out / "cases"))) == 3
+
+
+def test_sample_rejects_bad_quotas(history_repo, tmp_path):
+    with pytest.raises(ValueError, match="unknown conflict type"):
+        sample_corpus(history_repo, "main", tmp_path, {"rename": 1})
+    with pytest.raises(ValueError, match="negative quota"):
+        sample_corpus(history_repo, "main", tmp_path, {"add_add": -1})
+
+
+def test_cli_sample(mixed_repo, tmp_path, capsys):
+    argv = ["sample", str(mixed_repo), "main", "-o", str(tmp_path / "o"), "-q"]
+    code = main([*argv, "--quota", "add_add=1", "--seed", "7", "--no-societal"])
+    assert code == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["complete"] and stats["cases"]["add_add"] == 1
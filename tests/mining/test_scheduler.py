@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+from git import Repo
+
+from conflict_collection.io.jsonl import iter_conflict_cases
+from conflict_collection.mining import MiningScheduler, mine_merge
+from conflict_collection.mining import scheduler as scheduler_module
+
+
+@pytest.fixture
+def two_repos(history_repo, tmp_path):
+    mirror = tmp_path / "mirror"
+    Repo.clone_from(str(history_repo), mirror).close()
+    return [history_repo, mirror]
+
+
+def test_scheduler_mines_every_repo_within_per_repo_limit(
+    two_repos, tmp_path, monkeypatch
+):
+    lock = threading.Lock()
+    running: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def tracked(worktree, merge, **kwargs):
+        name = worktree.repo_path.name
+        with lock:
+            running[name] = running.get(name, 0) + 1
+            peak[name] = max(peak.get(name, 0), running[name])
+        time.sleep(0.05)
+        try:
+            return mine_merge(worktree, merge, **kwargs)
+        finally:
+            with lock:
+                running[name] -= 1
+
+    monkeypatch.setattr(scheduler_module, "mine_merge", tracked)
+    seen = []
+    scheduler = MiningScheduler(
+        workers=4, per_repo_limit=2, on_progress=lambda p: seen.append(p.name)
+    )
+    progress = scheduler.run(two_repos, tmp_path / "out", revs="main")
+
+    assert set(progress) == {"history", "mirror"}
+    for name, p in progress.items():
+        assert (p.merges, p.done, p.conflicted, p.clean, p.failed) == (3, 3, 2, 1, 0)
+        assert p.throughput > 0 and p.remaining == 0
+        assert peak[name] == 2
+        cases = list(iter_conflict_cases(tmp_path / "out" / name / "cases"))
+        assert sorted(c.conflict_path for c in cases) == ["a.txt", "b.txt"]
+    assert sorted(seen) == ["history"] * 3 + ["mirror"] * 3
+
+    rerun = MiningScheduler(workers=2).run(two_repos, tmp_path / "out", revs="main")
+    assert all(p.skipped == 3 and p.done == 0 for p in rerun.values())
+
+
+def test_scheduler_rejects_duplicate_repo_names(history_repo, tmp_path):
+    with pytest.raises(ValueError):
+        MiningScheduler().run([history_repo, history_repo], tmp_path / "out")
+
+
+def test_shared_fingerprints_skip_conflicts_already_mined_in_a_fork(
+    two_repos, tmp_path
+):
+    from conflict_collection.index import MemoryFingerprintStore
+
+    progress = MiningScheduler(workers=1, fingerprints=MemoryFingerprintStore()).run(
+        two_repos, tmp_path / "out", revs="main"
+    )
+
+    assert progress["history"].cases + progress["mirror"].cases == 2
+    assert progress["mirror"].conflicted == 2
+
+
+def test_repo_with_bad_range_does_not_abort_the_run(history_repo, tmp_path):
+    trunk = Repo.init(tmp_path / "trunk", initial_branch="trunk")
+    trunk.git.commit("-q", "--allow-empty", "-m", "init")
+    trunk.close()
+
+    progress = MiningScheduler(workers=2).run(
+        [tmp_path / "trunk", history_repo], tmp_path / "out", revs="main"
+    )
+
+    assert progress["trunk"].error and progress["trunk"].done == 0
+    assert progress["trunk"].finished is not None
+    assert progress["history"].error is None
+    assert (progress["history"].done, progress["history"].conflicted) == (3, 2)
+    assert not Repo(tmp_path / "trunk").git.worktree("list").count("\n")
@@ -0,0 +1,56 @@
+import json
+
+from conflict_collection.mining import MiningScheduler, build_corpus
+
+
+def test_incremental_build_enumerates_only_new_merges(
+    history_repo, add_conflicting_merge, tmp_path
+):
+    out = tmp_path / "out"
+    first = build_corpus(history_repo, "main", out, incremental=True)
+    assert (first.merges, first.conflicted) == (3, 2)
+
+    again = build_corpus(history_repo, "main", out, incremental=True)
+    assert again.merges == 0
+
+    add_conflicting_merge(history_repo, "d.txt", "feature-d")
+    nightly = build_corpus(history_repo, "main", out, incremental=True)
+    assert (nightly.merges, nightly.skipped, nightly.conflicted) == (1, 0, 1)
+
+    full = build_corpus(history_repo, "main", out)
+    assert (full.merges, full.skipped) == (4, 4)
+
+
+def test_limited_run_does_not_advance_watermark(history_repo, tmp_path):
+    out = tmp_path / "out"
+    build_corpus(history_repo, "main", out, incremental=True, limit=1)
+    assert not (out / "watermark.json").exists()
+
+    rest = build_corpus(history_repo, "main", out, incremental=True)
+    assert (rest.merges, rest.skipped) == (3, 1)
+    assert (out / "watermark.json").exists()
+
+
+def test_missing_watermark_commit_falls_back_to_checkpoint(history_repo, tmp_path):
+    out = tmp_path / "out"
+    build_corpus(history_repo, "main", out, incremental=True)
+    (out / "watermark.json").write_text(json.dumps({"main": ["0" * 40]}))
+
+    stats = build_corpus(history_repo, "main", out, incremental=True)
+    assert (stats.merges, stats.skipped) == (3, 3)
+
+
+def test_scheduler_incremental(history_repo, add_conflicting_merge, tmp_path):
+    scheduler = MiningScheduler(workers=2, incremental=True)
+    scheduler.run([history_repo], tmp_path / "out", revs="main")
+
+    add_conflicting_merge(history_repo, "d.txt", "feature-d")
+    progress = scheduler.run([history_repo], tmp_path / "out", revs="main")
+    assert (progress["history"].merges, progress["history"].done) == (1, 1)
+
+
+def test_incremental_keeps_range_exclusions(history_repo, tmp_path):
+    stats = build_corpus(
+        history_repo, "main~1..main", tmp_path / "out", incremental=True
+    )
+    assert stats.merges == 1
@@ -0,0 +1,112 @@
+from conflict_collection.schema.social_signals import (
+    BlameEntry,
+    IntegratorPriors,
+    SocialSignalsRecord,
+    SocialSignalsTable,
+)
+
+VALIDATED = [
+    SocialSignalsRecord(
+        file="a.txt",
+        ours_author="Alice <a@x>",
+        theirs_author="Bob <b@x>",
+        owner_commits_ours=3,
+        owner_commits_theirs=1,
+        age_days_ours=2,
+        age_days_theirs=None,
+        integrator_priors=IntegratorPriors(resolver_prev_commits=5),
+        blame_table=[
+            BlameEntry(author="Alice <a@x>", lines=10),
+            BlameEntry(author="Bob <b@x>", lines=4),
+        ],
+    ),
+    SocialSignalsRecord(
+        file="empty.txt",
+        ours_author=None,
+        theirs_author=None,
+        owner_commits_ours=0,
+        owner_commits_theirs=0,
+        age_days_ours=None,
+        age_days_theirs=None,
+        integrator_priors=IntegratorPriors(resolver_prev_commits=0),
+        blame_table=[],
+    ),
+]
+
+
+def test_construct_trusted_equals_validated_record():
+    record = VALIDATED[0]
+    trusted = SocialSignalsRecord.construct_trusted(
+        file="a.txt",
+        ours_author="Alice <a@x>",
+        theirs_author="Bob <b@x>",
+        owner_commits_ours=3,
+        owner_commits_theirs=1,
+        age_days_ours=2,
+        age_days_theirs=None,
+        resolver_prev_commits=5,
+        blame_pairs=[("Alice <a@x>", 10), ("Bob <b@x>", 4)],
+    )
+    assert trusted == record
+    assert trusted.model_dump() == record.model_dump()
+    assert SocialSignalsRecord.model_validate(trusted.model_dump()) == record
+
+
+def test_table_round_trips_records():
+    table = SocialSignalsTable.from_records(VALIDATED)
+
+    assert len(table) == 2
+    assert list(table.blame_offsets) == [0, 2, 2]
+    assert table.blame_pairs(1) == []
+    assert table.columns()["resolver_prev_commits"] == [5, 0]
+    assert list(table.records()) == VALIDATED
+    assert table.record(0) == VALIDATED[0]
+
+
+def test_table_round_trips_partial_records():
+    partial = SocialSignalsRecord(
+        file="huge.txt",
+        ours_author="Alice <a@x>",
+        theirs_author="Bob <b@x>",
+        owner_commits_ours=None,
+        owner_commits_theirs=2,
+        age_days_ours=1,
+        age_days_theirs=3,
+        integrator_priors=IntegratorPriors(resolver_prev_commits=None),
+        blame_table=None,
+        partial={
+            "owner_commits_ours": "git log exceeded 5s",
+            "resolver_prev_commits": "file time budget exhausted",
+            "blame_table": "file time budget exhausted",
+        },
+    )
+    table = SocialSignalsTable.from_records([*VALIDATED, partial])
+
+    assert list(table.records()) == [*VALIDATED, partial]
+    assert table.blame_pairs(2) is None
+    columns = table.columns()
+    assert columns["owner_commits_ours"] == [3, 0, None]
+    assert columns["resolver_prev_commits"] == [5, 0, None]
+
+
+def test_table_keeps_none_counts_of_complete_records():
+    record = SocialSignalsRecord.construct_trusted(
+        file="b.txt",
+        ours_author=None,
+        theirs_author="Bob <b@x>",
+        owner_commits_ours=None,
+        owner_commits_theirs=0,
+        age_days_ours=None,
+        age_days_theirs=1,
+        resolver_prev_commits=None,
+        blame_pairs=None,
+    )
+    table = SocialSignalsTable.from_records([VALIDATED[1], record])
+
+    assert table.record(1) == record
+    assert table.record(0) == VALIDATED[1]
+    columns = table.columns()
+    assert columns["owner_commits_ours"] == [0, None]
+    assert columns["owner_commits_theirs"] == [0, 0]
+    assert columns["resolver_prev_commits"] == [0, None]
+    assert table.blame_pairs(1) is None and table.blame_pairs(0) == []
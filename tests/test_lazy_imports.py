@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import conflict_collection
+
+HEAVY = ("git", "pydantic", "conflict_parser", "Levenshtein")
+
+
+def _loaded_after(code: str) -> list[str]:
+    probe = (
+        f"{code}\n"
+        "import json, sys\n"
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out)
+
+
+def test_package_import_loads_no_heavy_dependencies():
+    assert _loaded_after("import conflict_collection") == []
+
+
+def test_metric_export_does_not_load_collectors():
+    loaded = _loaded_after("from conflict_collection import anchored_ratio")
+    assert "git" not in loaded and "pydantic" not in loaded
+
+
+def test_conflict_type_collector_does_not_load_the_index_stack():
+    loaded = _loaded_after(
+        "import conflict_collection.collectors.conflict_type\n"
+        "import conflict_collection.collectors.societal"
+    )
+    assert "Levenshtein" not in loaded
+    probe = _loaded_after(
+        "import sys\n"
+        "import conflict_collection.collectors.conflict_type\n"
+        "assert 'conflict_collection.index.minhash' not in sys.modules\n"
+        "assert 'conflict_collection.metrics' not in sys.modules"
+    )
+    assert "git" in probe
+
+
+def test_index_exports_resolve_lazily():
+    from conflict_collection import index
+    from conflict_collection.index.minhash import MinHasher
+
+    assert index.MinHasher is MinHasher
+    assert set(index.__all__) <= set(dir(index))
+
+
+def test_lazy_exports_resolve_to_the_real_objects():
+    from conflict_collection.collectors.conflict_type.collector import collect
+    from conflict_collection.metrics.anchored_ratio.anchored_ratio import (
+        anchored_ratio,
+    )
+
+    assert conflict_collection.collect_conflict_types is collect
+    assert conflict_collection.anchored_ratio is anchored_ratio
+    assert set(conflict_collection.__all__) <= set(dir(conflict_collection))
+    with pytest.raises(AttributeError):
+        conflict_collection.no_such_name